@@ -1,322 +1,668 @@
 #!/usr/bin/env python3
 """
 生成一个独立的HTML文件，用于浏览和对比六个模型的general_qa评测结果。
-JSON数据直接嵌入到HTML文件中。
+JSON数据直接嵌入到HTML文件中，样式和脚本写入同目录的静态文件。
 """
 
+import base64
+import hashlib
+import html
 import json
 import os
 import sys
 from pathlib import Path
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 样式表写入viewer.css，HTML只保留<link>引用，浏览器可跨次生成缓存
+CSS_TEXT = '''\
+/* 基础重置 */
+* {
+    box-sizing: border-box;
+    margin: 0;
+    padding: 0;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    background-color: #f8f9fa;
+    padding: 10px;
+    min-height: 100vh;
+}
+
+.app-header {
+    text-align: center;
+    margin-bottom: 20px;
+    padding-bottom: 15px;
+    border-bottom: 1px solid #dee2e6;
+}
+
+.app-header h1 {
+    font-size: 1.8rem;
+    color: #2c3e50;
+    margin-bottom: 5px;
+}
+
+.app-header .stats {
+    font-size: 0.9rem;
+    color: #7f8c8d;
+}
+
+/* 主容器 */
+.app-container {
+    display: flex;
+    flex-direction: column;
+    gap: 20px;
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+/* 样本列表 */
+.samples-panel {
+    background: white;
+    border-radius: 8px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
+    overflow: hidden;
+}
+
+.samples-header {
+    padding: 15px;
+    background: #f8f9fa;
+    border-bottom: 1px solid #dee2e6;
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+.samples-list {
+    position: relative;
+    max-height: 400px;
+    overflow-y: auto;
+}
+
+.sample-item {
+    position: absolute;
+    left: 0;
+    right: 0;
+    height: 62px;
+    padding: 12px 15px;
+    border-bottom: 1px solid #f1f1f1;
+    cursor: pointer;
+    transition: background-color 0.2s;
+    overflow: hidden;
+}
+
+.sample-item:hover {
+    background-color: #f8f9fa;
+}
+
+.sample-item.active {
+    background-color: #e3f2fd;
+    border-left: 4px solid #2196f3;
+}
+
+.sample-category {
+    font-weight: bold;
+    color: #2c3e50;
+    font-size: 0.9rem;
+}
+
+.sample-preview {
+    font-size: 0.85rem;
+    color: #666;
+    margin-top: 4px;
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+
+/* 详情面板 */
+.detail-panel {
+    background: white;
+    border-radius: 8px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
+    overflow: hidden;
+}
+
+.detail-header {
+    padding: 15px;
+    background: #f8f9fa;
+    border-bottom: 1px solid #dee2e6;
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+.detail-content {
+    padding: 20px;
+}
+
+.section {
+    margin-bottom: 30px;
+}
+
+.section-title {
+    font-size: 1.1rem;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+    padding-bottom: 5px;
+    border-bottom: 2px solid #e9ecef;
+}
+
+.content-box {
+    background: #f8f9fa;
+    padding: 15px;
+    border-radius: 6px;
+    border: 1px solid #e9ecef;
+    white-space: pre-wrap;
+    word-wrap: break-word;
+    font-size: 0.95rem;
+    line-height: 1.6;
+}
+
+.model-outputs {
+    display: grid;
+    grid-template-columns: 1fr;
+    gap: 20px;
+}
+
+.model-card {
+    background: white;
+    border: 1px solid #e9ecef;
+    border-radius: 6px;
+    padding: 15px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
+}
+
+.model-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-bottom: 10px;
+    padding-bottom: 8px;
+    border-bottom: 1px solid #e9ecef;
+}
+
+.model-name {
+    font-weight: bold;
+    color: #2c3e50;
+    font-size: 1rem;
+}
+
+.model-acc {
+    background: #e8f5e9;
+    color: #2e7d32;
+    padding: 3px 8px;
+    border-radius: 12px;
+    font-size: 0.85rem;
+    font-weight: bold;
+}
+
+.model-prediction {
+    margin-bottom: 10px;
+    font-size: 0.95rem;
+    line-height: 1.6;
+}
+
+.model-explanation {
+    font-size: 0.85rem;
+    color: #666;
+    background: #f8f9fa;
+    padding: 10px;
+    border-radius: 4px;
+    border-left: 3px solid #ff9800;
+}
+
+/* 移动端适配 */
+@media (min-width: 768px) {
+    .app-container {
+        flex-direction: row;
+        height: calc(100vh - 100px);
+    }
+
+    .samples-panel {
+        width: 300px;
+        height: 100%;
+        display: flex;
+        flex-direction: column;
+    }
+
+    .samples-list {
+        flex: 1;
+        max-height: none;
+    }
+
+    .detail-panel {
+        flex: 1;
+        height: 100%;
+        overflow-y: auto;
+    }
+
+    .model-outputs {
+        grid-template-columns: repeat(2, 1fr);
+    }
+}
+
+@media (min-width: 1200px) {
+    .model-outputs {
+        grid-template-columns: repeat(3, 1fr);
+    }
+}
+
+/* 滚动条样式 */
+::-webkit-scrollbar {
+    width: 8px;
+}
+
+::-webkit-scrollbar-track {
+    background: #f1f1f1;
+}
+
+::-webkit-scrollbar-thumb {
+    background: #c1c1c1;
+    border-radius: 4px;
+}
+
+::-webkit-scrollbar-thumb:hover {
+    background: #a8a8a8;
+}
+
+/* 工具提示 */
+.tooltip {
+    position: relative;
+    display: inline-block;
+}
+
+.tooltip .tooltiptext {
+    visibility: hidden;
+    width: 200px;
+    background-color: #555;
+    color: #fff;
+    text-align: center;
+    border-radius: 6px;
+    padding: 5px;
+    position: absolute;
+    z-index: 1;
+    bottom: 125%;
+    left: 50%;
+    margin-left: -100px;
+    opacity: 0;
+    transition: opacity 0.3s;
+    font-size: 0.8rem;
+}
+
+.tooltip:hover .tooltiptext {
+    visibility: visible;
+    opacity: 1;
+}
+
+/* 空状态 */
+.empty-state {
+    text-align: center;
+    padding: 40px 20px;
+    color: #7f8c8d;
+}
+'''
+
+# 页面脚本写入viewer.js，HTML内联的只有数据赋值
+VIEWER_JS = r'''// 还原字符串表：载荷中模型名/类别名以整数索引存储
+// 数据已在Python端按类别/索引排好序，这里只做还原，不再排序
+function hydrateData(payload) {
+    const strings = payload.s;
+    for (const group of payload.d) {
+        group.category = strings[group.category];
+        for (const sample of group.samples) {
+            const models = sample.models || {};
+            const named = {};
+            for (const modelId in models) {
+                named[strings[modelId]] = models[modelId];
+            }
+            sample.models = named;
+        }
+    }
+    return payload.d;
+}
+
+const evaluationData = hydrateData(rawEvalData);
+
+// (category, index) -> 样本对象 的查找表
+const sampleLookup = new Map();
+
+// 应用状态
+let currentSample = null;
+let currentCategory = null;
+let currentIndex = null;
+
+// 虚拟滚动状态：只渲染可视区域内的行
+const ROW_HEIGHT = 62;
+const OVERSCAN = 5;
+let sampleIndex = [];
+let listWindowEl = null;
+let lastRenderStart = -1;
+
+// DOM元素
+const samplesListEl = document.getElementById('samples-list');
+const detailContentEl = document.getElementById('detail-content');
+const detailTitleEl = document.getElementById('detail-title');
+const sampleCountEl = document.getElementById('sample-count');
+const inputBoxEl = document.getElementById('input-box');
+const targetBoxEl = document.getElementById('target-box');
+const modelsTitleEl = document.getElementById('models-title');
+const modelOutputsEl = document.getElementById('model-outputs');
+
+// 初始化（统计数字已在生成时写入HTML，无需遍历数据）
+function init() {
+    buildSampleIndex();
+    renderSamplesList();
+    // 默认选择第一个样本
+    if (sampleIndex.length > 0) {
+        selectSample(sampleIndex[0].category, sampleIndex[0].index);
+    }
+}
+
+// 构建扁平的样本索引，加载时只做一次（数据已排序）
+function buildSampleIndex() {
+    sampleIndex = [];
+
+    for (const group of evaluationData) {
+        for (const sample of group.samples) {
+            const inputText = sample.input || '';
+            // 移除**User**: 前缀
+            const previewText = inputText.replace(/^\*\*User\*\*:\s*\n/, '').substring(0, 80);
+            sampleIndex.push({ category: group.category, index: sample.index, previewText });
+            sampleLookup.set(`${group.category}#${sample.index}`, sample);
+        }
+    }
+}
+
+// 渲染样本列表（虚拟滚动：DOM中只保留可视窗口内的行）
+function renderSamplesList() {
+    samplesListEl.innerHTML = '';
+
+    if (sampleIndex.length === 0) {
+        samplesListEl.innerHTML = '<div class="empty-state">没有找到样本数据</div>';
+        sampleCountEl.textContent = `0 个样本`;
+        return;
+    }
+
+    // 占位元素撑起整个滚动高度，浮动容器承载可见行
+    const spacerEl = document.createElement('div');
+    spacerEl.style.height = `${sampleIndex.length * ROW_HEIGHT}px`;
+    listWindowEl = document.createElement('div');
+    samplesListEl.appendChild(spacerEl);
+    samplesListEl.appendChild(listWindowEl);
+
+    // 滚动回调用requestAnimationFrame合并，每帧最多重建一次
+    let scrollScheduled = false;
+    samplesListEl.addEventListener('scroll', () => {
+        if (scrollScheduled) return;
+        scrollScheduled = true;
+        requestAnimationFrame(() => {
+            scrollScheduled = false;
+            renderVisibleRows(false);
+        });
+    });
+    // 行会随滚动重建，点击事件委托到容器上
+    listWindowEl.addEventListener('click', (e) => {
+        const itemEl = e.target.closest('.sample-item');
+        if (itemEl) {
+            // 行上只存sampleIndex下标：data属性读回来会做一次实体
+            // 解码，解码后的category和查找表里的转义键对不上
+            const row = sampleIndex[parseInt(itemEl.dataset.i)];
+            selectSample(row.category, row.index);
+        }
+    });
+
+    sampleCountEl.textContent = `${sampleIndex.length} 个样本`;
+    renderVisibleRows(true);
+}
+
+// 预览文本在行真正进入可视区域时才填充
+const previewObserver = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+        if (entry.isIntersecting) {
+            const previewEl = entry.target.querySelector('.sample-preview');
+            // 文本直接取自sampleIndex的行对象：串在Python端已整体转义
+            // 成纯实体，不再经过data属性的实体解码往返，转义不会被
+            // 解开一层后复活成真标记
+            const row = sampleIndex[parseInt(entry.target.dataset.i)];
+            previewEl.innerHTML = row.previewText + '...';
+            previewObserver.unobserve(entry.target);
+        }
+    }
+}, { root: samplesListEl });
+
+// 只重建与可视区域相交的行
+function renderVisibleRows(force) {
+    const start = Math.max(0, Math.floor(samplesListEl.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    if (!force && start === lastRenderStart) return;
+    lastRenderStart = start;
+
+    const visibleCount = Math.ceil(samplesListEl.clientHeight / ROW_HEIGHT);
+    const end = Math.min(sampleIndex.length, start + visibleCount + OVERSCAN * 2);
+
+    let rowsHTML = '';
+    for (let i = start; i < end; i++) {
+        const row = sampleIndex[i];
+        const isActive = row.category === currentCategory && parseInt(row.index) === currentIndex;
+        rowsHTML += `
+            <div class="sample-item${isActive ? ' active' : ''}" style="top: ${i * ROW_HEIGHT}px" data-i="${i}">
+                <div class="sample-category">${row.category} #${row.index}</div>
+                <div class="sample-preview"></div>
+            </div>
+        `;
+    }
+    listWindowEl.innerHTML = rowsHTML;
+
+    for (const itemEl of listWindowEl.children) {
+        previewObserver.observe(itemEl);
+    }
+}
+
+// 选择样本
+function selectSample(category, index) {
+    // 更新当前选中状态
+    currentCategory = category;
+    currentIndex = index;
+    currentSample = sampleLookup.get(`${category}#${index}`);
+
+    // 更新列表项选中状态（可见行直接重建）
+    renderVisibleRows(true);
+
+    // 渲染详情
+    renderSampleDetail();
+}
+
+// 模型卡片DOM按模型名缓存，点击时只更新文本内容而不重建结构
+const modelCardEls = new Map();
+
+function getModelCard(modelName) {
+    let card = modelCardEls.get(modelName);
+    if (!card) {
+        card = document.createElement('div');
+        card.className = 'model-card';
+        card.innerHTML = `
+            <div class="model-header">
+                <div class="model-name"></div>
+                <div class="model-acc"></div>
+            </div>
+            <div class="model-prediction"></div>
+            <div class="model-explanation">
+                <strong>评判结果:</strong> <span class="explanation-text"></span>
+            </div>
+        `;
+        card._accEl = card.querySelector('.model-acc');
+        card._predictionEl = card.querySelector('.model-prediction');
+        card._explanationEl = card.querySelector('.explanation-text');
+        card.querySelector('.model-name').textContent = modelName;
+        modelCardEls.set(modelName, card);
+    }
+    return card;
+}
+
+// 渲染样本详情（区块容器是静态的，只更新内容）
+function renderSampleDetail() {
+    if (!currentSample) return;
+
+    const models = currentSample.models || {};
+    const modelEntries = Object.entries(models);
+
+    // 字符串字段已在Python端转义，可直接插入
+    inputBoxEl.innerHTML = currentSample.input || '';
+    targetBoxEl.innerHTML = currentSample.target || '';
+
+    // 复用缓存的卡片节点，appendChild对已在容器中的节点只调整顺序
+    for (const [modelName, modelData] of modelEntries) {
+        const card = getModelCard(modelName);
+        const acc = modelData.acc || 0.0;
+        card._accEl.textContent = `准确率: ${acc.toFixed(2)}`;
+        card._predictionEl.innerHTML = modelData.prediction || '';
+        card._explanationEl.innerHTML = modelData.explanation || '';
+        modelOutputsEl.appendChild(card);
+    }
+
+    // 兜底：移除本次样本中不存在的模型卡片
+    for (const [name, card] of modelCardEls) {
+        if (!(name in models) && card.parentNode) {
+            card.remove();
+        }
+    }
+
+    detailTitleEl.textContent = `${currentCategory} #${currentIndex}`;
+    modelsTitleEl.textContent = `模型输出 (${modelEntries.length} 个模型)`;
+}
+
+// 页面加载完成后初始化
+document.addEventListener('DOMContentLoaded', init);
+'''
+
+def hash_file(path):
+    """分块计算文件内容哈希，用于跳过无变化的重新生成"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
 def load_json_data(json_path):
     """加载JSON数据"""
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def generate_html(data):
-    """生成HTML内容"""
-    # 将数据转换为JSON字符串，用于JavaScript
-    json_str = json.dumps(data, ensure_ascii=False)
+def escape_embedded_strings(obj):
+    """递归转义数据中的所有字符串，浏览器端插入innerHTML时无需再转义"""
+    if isinstance(obj, str):
+        return html.escape(obj, quote=True)
+    if isinstance(obj, dict):
+        return {escape_embedded_strings(k): escape_embedded_strings(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [escape_embedded_strings(v) for v in obj]
+    return obj
+
+def write_static_asset(path, content):
+    """内容有变化时才写静态资源文件"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def order_samples(data):
+    """在Python端按类别/索引排好序，浏览器端不再做任何排序。
+
+    输出为有序数组：[{"category": ..., "samples": [{"index": int, ...}, ...]}, ...]
+    """
+    return [{"category": category,
+             "samples": [{"index": int(index), **data[category][index]}
+                         for index in sorted(data[category], key=int)]}
+            for category in sorted(data)]
+
+def intern_strings(ordered):
+    """把重复出现的模型名/类别名收进字符串表，载荷里只存整数索引。
+
+    六个模型名在每个样本里都重复一次，去重后载荷体积随冗余度下降，
+    解析整数也比解析长字符串快。返回 {"s": 字符串表, "d": 替换后的数据}。
+    """
+    strings = []
+    table = {}
+
+    def intern(s):
+        if s not in table:
+            table[s] = len(strings)
+            strings.append(s)
+        return table[s]
+
+    interned = []
+    for group in ordered:
+        samples = []
+        for sample in group['samples']:
+            entry = dict(sample)
+            entry['models'] = {intern(name): model
+                               for name, model in sample.get('models', {}).items()}
+            samples.append(entry)
+        interned.append({'category': intern(group['category']), 'samples': samples})
+    return {'s': strings, 'd': interned}
+
+def build_data_script(data):
+    """构建加载数据的脚本片段。
+
+    优先使用msgpack+base64嵌入：二进制格式比JSON文本小30%以上，
+    浏览器端解码也比解析JSON快；未安装msgpack时回退到JSON嵌入。
+    数据先排序再经过字符串表去重，浏览器端在viewer.js中还原。
+    """
+    payload = intern_strings(order_samples(data))
+    if msgpack is not None:
+        blob = msgpack.packb(payload, use_bin_type=True)
+        b64 = base64.b64encode(blob).decode('ascii')
+        return f'''<script src="https://cdn.jsdelivr.net/npm/@msgpack/msgpack@3/dist.umd.min.js"></script>
+    <script>
+        // 嵌入式msgpack数据（base64编码，含字符串表）
+        const evalDataB64 = "{b64}";
+        const rawEvalData = MessagePack.decode(Uint8Array.from(atob(evalDataB64), c => c.charCodeAt(0)));
+    </script>'''
+
+    json_str = json.dumps(payload, ensure_ascii=False)
+    return f'''<script>
+        // 嵌入式JSON数据（含字符串表）
+        const rawEvalData = {json_str};
+    </script>'''
 
-    # HTML模板
-    html = f'''<!DOCTYPE html>
+def generate_html(data):
+    """生成HTML内容，返回bytes分段列表，写盘时直接用二进制模式输出"""
+    # 在Python端一次性做HTML转义，避免浏览器每次点击都重新处理原始内容
+    data = escape_embedded_strings(data)
+
+    # 统计数字在生成时算好，直接写进HTML文本
+    n_categories = len(data)
+    n_samples = sum(len(samples) for samples in data.values())
+    first_category = next(iter(data.values()), {})
+    first_sample = next(iter(first_category.values()), {})
+    n_models = len(first_sample.get('models', {}))
+
+    # 数据载入脚本（msgpack或JSON嵌入）
+    data_script = build_data_script(data)
+
+    # HTML模板：样式和脚本通过静态文件引入，内联的只有数据
+    head = f'''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>General QA 评测结果对比</title>
-    <style>
-        /* 基础重置 */
-        * {{
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f8f9fa;
-            padding: 10px;
-            min-height: 100vh;
-        }}
-
-        .app-header {{
-            text-align: center;
-            margin-bottom: 20px;
-            padding-bottom: 15px;
-            border-bottom: 1px solid #dee2e6;
-        }}
-
-        .app-header h1 {{
-            font-size: 1.8rem;
-            color: #2c3e50;
-            margin-bottom: 5px;
-        }}
-
-        .app-header .stats {{
-            font-size: 0.9rem;
-            color: #7f8c8d;
-        }}
-
-        /* 主容器 */
-        .app-container {{
-            display: flex;
-            flex-direction: column;
-            gap: 20px;
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-
-        /* 样本列表 */
-        .samples-panel {{
-            background: white;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-            overflow: hidden;
-        }}
-
-        .samples-header {{
-            padding: 15px;
-            background: #f8f9fa;
-            border-bottom: 1px solid #dee2e6;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-
-        .samples-list {{
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-
-        .sample-item {{
-            padding: 12px 15px;
-            border-bottom: 1px solid #f1f1f1;
-            cursor: pointer;
-            transition: background-color 0.2s;
-        }}
-
-        .sample-item:hover {{
-            background-color: #f8f9fa;
-        }}
-
-        .sample-item.active {{
-            background-color: #e3f2fd;
-            border-left: 4px solid #2196f3;
-        }}
-
-        .sample-category {{
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 0.9rem;
-        }}
-
-        .sample-preview {{
-            font-size: 0.85rem;
-            color: #666;
-            margin-top: 4px;
-            white-space: nowrap;
-            overflow: hidden;
-            text-overflow: ellipsis;
-        }}
-
-        /* 详情面板 */
-        .detail-panel {{
-            background: white;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-            overflow: hidden;
-        }}
-
-        .detail-header {{
-            padding: 15px;
-            background: #f8f9fa;
-            border-bottom: 1px solid #dee2e6;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-
-        .detail-content {{
-            padding: 20px;
-        }}
-
-        .section {{
-            margin-bottom: 30px;
-        }}
-
-        .section-title {{
-            font-size: 1.1rem;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 10px;
-            padding-bottom: 5px;
-            border-bottom: 2px solid #e9ecef;
-        }}
-
-        .content-box {{
-            background: #f8f9fa;
-            padding: 15px;
-            border-radius: 6px;
-            border: 1px solid #e9ecef;
-            white-space: pre-wrap;
-            word-wrap: break-word;
-            font-size: 0.95rem;
-            line-height: 1.6;
-        }}
-
-        .model-outputs {{
-            display: grid;
-            grid-template-columns: 1fr;
-            gap: 20px;
-        }}
-
-        .model-card {{
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 6px;
-            padding: 15px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-        }}
-
-        .model-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-            padding-bottom: 8px;
-            border-bottom: 1px solid #e9ecef;
-        }}
-
-        .model-name {{
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 1rem;
-        }}
-
-        .model-acc {{
-            background: #e8f5e9;
-            color: #2e7d32;
-            padding: 3px 8px;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: bold;
-        }}
-
-        .model-prediction {{
-            margin-bottom: 10px;
-            font-size: 0.95rem;
-            line-height: 1.6;
-        }}
-
-        .model-explanation {{
-            font-size: 0.85rem;
-            color: #666;
-            background: #f8f9fa;
-            padding: 10px;
-            border-radius: 4px;
-            border-left: 3px solid #ff9800;
-        }}
-
-        /* 移动端适配 */
-        @media (min-width: 768px) {{
-            .app-container {{
-                flex-direction: row;
-                height: calc(100vh - 100px);
-            }}
-
-            .samples-panel {{
-                width: 300px;
-                height: 100%;
-                display: flex;
-                flex-direction: column;
-            }}
-
-            .samples-list {{
-                flex: 1;
-                max-height: none;
-            }}
-
-            .detail-panel {{
-                flex: 1;
-                height: 100%;
-                overflow-y: auto;
-            }}
-
-            .model-outputs {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
-
-        @media (min-width: 1200px) {{
-            .model-outputs {{
-                grid-template-columns: repeat(3, 1fr);
-            }}
-        }}
-
-        /* 滚动条样式 */
-        ::-webkit-scrollbar {{
-            width: 8px;
-        }}
-
-        ::-webkit-scrollbar-track {{
-            background: #f1f1f1;
-        }}
-
-        ::-webkit-scrollbar-thumb {{
-            background: #c1c1c1;
-            border-radius: 4px;
-        }}
-
-        ::-webkit-scrollbar-thumb:hover {{
-            background: #a8a8a8;
-        }}
-
-        /* 工具提示 */
-        .tooltip {{
-            position: relative;
-            display: inline-block;
-        }}
-
-        .tooltip .tooltiptext {{
-            visibility: hidden;
-            width: 200px;
-            background-color: #555;
-            color: #fff;
-            text-align: center;
-            border-radius: 6px;
-            padding: 5px;
-            position: absolute;
-            z-index: 1;
-            bottom: 125%;
-            left: 50%;
-            margin-left: -100px;
-            opacity: 0;
-            transition: opacity 0.3s;
-            font-size: 0.8rem;
-        }}
-
-        .tooltip:hover .tooltiptext {{
-            visibility: visible;
-            opacity: 1;
-        }}
-
-        /* 空状态 */
-        .empty-state {{
-            text-align: center;
-            padding: 40px 20px;
-            color: #7f8c8d;
-        }}
-    </style>
+    <link rel="stylesheet" href="viewer.css">
 </head>
 <body>
     <div class="app-header">
         <h1>General QA 评测结果对比</h1>
         <div class="stats">
-            <span id="stats-categories">7</span> 个类别 •
-            <span id="stats-samples">448</span> 个样本 •
-            <span id="stats-models">6</span> 个模型
+            <span id="stats-categories">{n_categories}</span> 个类别 •
+            <span id="stats-samples">{n_samples}</span> 个样本 •
+            <span id="stats-models">{n_models}</span> 个模型
         </div>
     </div>
 
@@ -340,184 +686,32 @@ def generate_html(data):
                 <span id="detail-title" style="float: right; font-weight: normal; font-size: 0.9rem;"></span>
             </div>
             <div class="detail-content" id="detail-content">
-                <div class="empty-state">
-                    请从左侧选择一个样本来查看详情
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // 嵌入式JSON数据
-        const evaluationData = {json_str};
-
-        // 应用状态
-        let currentSample = null;
-        let currentCategory = null;
-        let currentIndex = null;
-
-        // DOM元素
-        const samplesListEl = document.getElementById('samples-list');
-        const detailContentEl = document.getElementById('detail-content');
-        const detailTitleEl = document.getElementById('detail-title');
-        const sampleCountEl = document.getElementById('sample-count');
-
-        // 初始化
-        function init() {{
-            updateStats();
-            renderSamplesList();
-            // 默认选择第一个样本
-            if (Object.keys(evaluationData).length > 0) {{
-                const firstCategory = Object.keys(evaluationData)[0];
-                const firstIndex = Object.keys(evaluationData[firstCategory])[0];
-                selectSample(firstCategory, parseInt(firstIndex));
-            }}
-        }}
-
-        // 更新统计信息
-        function updateStats() {{
-            let totalCategories = Object.keys(evaluationData).length;
-            let totalSamples = 0;
-            let modelCount = 0;
-
-            for (const category in evaluationData) {{
-                totalSamples += Object.keys(evaluationData[category]).length;
-                // 获取第一个样本的模型数量
-                if (modelCount === 0) {{
-                    const firstIndex = Object.keys(evaluationData[category])[0];
-                    if (firstIndex) {{
-                        const sample = evaluationData[category][firstIndex];
-                        modelCount = Object.keys(sample.models || {{}}).length;
-                    }}
-                }}
-            }}
-
-            document.getElementById('stats-categories').textContent = totalCategories;
-            document.getElementById('stats-samples').textContent = totalSamples;
-            document.getElementById('stats-models').textContent = modelCount;
-        }}
-
-        // 渲染样本列表
-        function renderSamplesList() {{
-            samplesListEl.innerHTML = '';
-
-            let sampleCount = 0;
-
-            // 按类别和索引排序
-            const categories = Object.keys(evaluationData).sort();
-
-            for (const category of categories) {{
-                const indices = Object.keys(evaluationData[category]).sort((a, b) => parseInt(a) - parseInt(b));
-
-                for (const index of indices) {{
-                    const sample = evaluationData[category][index];
-                    const inputText = sample.input || '';
-                    // 移除**User**: 前缀
-                    const previewText = inputText.replace(/^\\*\\*User\\*\\*:\\\\s*\\\\n/, '').substring(0, 80);
-
-                    const itemEl = document.createElement('div');
-                    itemEl.className = 'sample-item';
-                    itemEl.dataset.category = category;
-                    itemEl.dataset.index = index;
-                    itemEl.innerHTML = `
-                        <div class="sample-category">${{category}} #${{index}}</div>
-                        <div class="sample-preview" title="${{inputText}}">${{previewText}}...</div>
-                    `;
-
-                    itemEl.addEventListener('click', () => {{
-                        selectSample(category, parseInt(index));
-                    }});
-
-                    samplesListEl.appendChild(itemEl);
-                    sampleCount++;
-                }}
-            }}
-
-            sampleCountEl.textContent = `${{sampleCount}} 个样本`;
-
-            if (sampleCount === 0) {{
-                samplesListEl.innerHTML = '<div class="empty-state">没有找到样本数据</div>';
-            }}
-        }}
-
-        // 选择样本
-        function selectSample(category, index) {{
-            // 更新当前选中状态
-            currentCategory = category;
-            currentIndex = index;
-            currentSample = evaluationData[category][index];
-
-            // 更新列表项选中状态
-            document.querySelectorAll('.sample-item').forEach(item => {{
-                item.classList.remove('active');
-                if (item.dataset.category === category && item.dataset.index === index.toString()) {{
-                    item.classList.add('active');
-                }}
-            }});
-
-            // 渲染详情
-            renderSampleDetail();
-        }}
-
-        // 渲染样本详情
-        function renderSampleDetail() {{
-            if (!currentSample) return;
-
-            const inputText = currentSample.input || '';
-            const targetText = currentSample.target || '';
-            const models = currentSample.models || {{}};
-
-            // 构建模型输出HTML
-            let modelsHTML = '';
-            const modelEntries = Object.entries(models);
-
-            for (const [modelName, modelData] of modelEntries) {{
-                const prediction = modelData.prediction || '';
-                const acc = modelData.acc || 0.0;
-                const explanation = modelData.explanation || '';
-
-                modelsHTML += `
-                    <div class="model-card">
-                        <div class="model-header">
-                            <div class="model-name">${{modelName}}</div>
-                            <div class="model-acc">准确率: ${{acc.toFixed(2)}}</div>
-                        </div>
-                        <div class="model-prediction">${{prediction}}</div>
-                        <div class="model-explanation">
-                            <strong>评判结果:</strong> ${{explanation}}
-                        </div>
-                    </div>
-                `;
-            }}
-
-            detailTitleEl.textContent = `${{currentCategory}} #${{currentIndex}}`;
-
-            detailContentEl.innerHTML = `
+                <!-- 静态区块只创建一次，选中样本时仅更新内容 -->
                 <div class="section">
                     <div class="section-title">用户输入</div>
-                    <div class="content-box">${{inputText}}</div>
+                    <div class="content-box" id="input-box"></div>
                 </div>
 
                 <div class="section">
                     <div class="section-title">参考答案</div>
-                    <div class="content-box">${{targetText}}</div>
+                    <div class="content-box" id="target-box"></div>
                 </div>
 
                 <div class="section">
-                    <div class="section-title">模型输出 (${{modelEntries.length}} 个模型)</div>
-                    <div class="model-outputs">
-                        ${{modelsHTML}}
-                    </div>
+                    <div class="section-title" id="models-title">模型输出</div>
+                    <div class="model-outputs" id="model-outputs"></div>
                 </div>
-            `;
-        }}
+            </div>
+        </div>
+    </div>
 
-        // 页面加载完成后初始化
-        document.addEventListener('DOMContentLoaded', init);
-    </script>
+    '''
+    tail = '''<script src="viewer.js"></script>
 </body>
 </html>'''
-    return html
+    # 各段只编码一次，避免写入时对整份HTML再跑一遍增量编码器
+    return [head.encode('utf-8'), data_script.encode('utf-8'),
+            b'\n    ', tail.encode('utf-8')]
 
 def main():
     json_path = "integrated_general_qa.json"
@@ -528,18 +722,35 @@ def main():
         print("请先运行 integrate_general_qa.py 生成整合数据", file=sys.stderr)
         sys.exit(1)
 
+    # 静态资源与HTML放在同一目录，内容不变时不重写
+    output_dir = os.path.dirname(output_path) or "."
+    write_static_asset(os.path.join(output_dir, "viewer.css"), CSS_TEXT)
+    write_static_asset(os.path.join(output_dir, "viewer.js"), VIEWER_JS)
+
+    # 输入未变化且HTML已存在时，整个生成流程都可以跳过
+    hash_path = output_path + '.hash'
+    input_hash = hash_file(json_path)
+    if os.path.exists(output_path) and os.path.exists(hash_path):
+        with open(hash_path, 'r', encoding='utf-8') as f:
+            if f.read().strip() == input_hash:
+                print(f"输入未变化，HTML已是最新: {output_path}")
+                return
+
     print("正在加载JSON数据...")
     data = load_json_data(json_path)
 
     print("正在生成HTML文件...")
-    html_content = generate_html(data)
+    html_parts = generate_html(data)
+
+    with open(output_path, 'wb') as f:
+        f.writelines(html_parts)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with open(hash_path, 'w', encoding='utf-8') as f:
+        f.write(input_hash)
 
     print(f"HTML文件已生成: {output_path}")
     print(f"文件大小: {os.path.getsize(output_path) // 1024} KB")
     print("请在浏览器中打开此文件查看结果。")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -7,25 +7,166 @@
 简化版本，避免复杂的嵌套字符串。
 """
 
+import base64
+import gzip
 import json
 import os
 import sys
 import html
+from functools import lru_cache
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        """orjson的Rust编码器比stdlib快数倍，输出总是UTF-8"""
+        return orjson.dumps(obj).decode('utf-8')
+
+    def _dumps_bytes(obj):
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _dumps_bytes(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
 
 def load_json_data(json_path):
-    """加载JSON数据"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def generate_html(data):
-    """生成HTML内容"""
-    # 将数据转换为JSON字符串，用于嵌入
-    json_str = json.dumps(data, ensure_ascii=False)
-    # HTML转义，然后还原双引号（因为JSON需要原始双引号）
-    json_str_escaped = html.escape(json_str)
-    json_str_escaped = json_str_escaped.replace('&quot;', '"')
-    # 额外安全措施：转义 </script> 序列
-    json_str_escaped = json_str_escaped.replace('</script>', '<\\/script>')
+    """加载JSON数据：二进制读入，orjson直接解析bytes，省掉文本解码一遍"""
+    with open(json_path, 'rb') as f:
+        return _loads(f.read())
+
+# 这些字段原本一定是字符串，值为数值时即代表字符串表索引
+_INTERN_SAMPLE_FIELDS = ('input', 'target', 'question_id', 'category',
+                         '_catShort', 'solution', '_preview', '_targetHtml')
+_INTERN_MODEL_FIELDS = ('prediction', 'extracted_prediction', 'explanation',
+                        '_extractedHtml')
+
+def intern_payload(data):
+    """重复字符串收进strings表，载荷中以整数索引引用。
+
+    模型名每个样本重复一次，类别名、重复的target等也一样；
+    去重后嵌入体积和浏览器解析后的内存占用都随冗余度下降。
+    返回 {"strings": 表, "data": 替换后的数据}，浏览器端还原。
+    """
+    counts = {}
+
+    def tally(v):
+        if isinstance(v, str):
+            counts[v] = counts.get(v, 0) + 1
+
+    for indices in data.values():
+        for sample in indices.values():
+            for field in _INTERN_SAMPLE_FIELDS:
+                tally(sample.get(field))
+            for model in sample.get('models', {}).values():
+                for field in _INTERN_MODEL_FIELDS:
+                    tally(model.get(field))
+
+    strings = []
+    table = {}
+
+    def intern(s):
+        idx = table.get(s)
+        if idx is None:
+            idx = table[s] = len(strings)
+            strings.append(s)
+        return idx
+
+    def maybe_intern(v):
+        # 只有重复出现的字符串才进表，一次性字符串原样保留
+        if isinstance(v, str) and counts.get(v, 0) >= 2:
+            return intern(v)
+        return v
+
+    out = {}
+    for category, indices in data.items():
+        new_indices = {}
+        for index, sample in indices.items():
+            new_sample = dict(sample)
+            for field in _INTERN_SAMPLE_FIELDS:
+                if field in new_sample:
+                    new_sample[field] = maybe_intern(new_sample[field])
+            new_models = {}
+            for name, model in sample.get('models', {}).items():
+                new_model = dict(model)
+                for field in _INTERN_MODEL_FIELDS:
+                    if field in new_model:
+                        new_model[field] = maybe_intern(new_model[field])
+                # 模型名全部进表，键用索引的字符串形式
+                new_models[str(intern(name))] = new_model
+            new_sample['models'] = new_models
+            new_indices[index] = new_sample
+        out[category] = new_indices
+    return {'strings': strings, 'data': out}
+
+def _escape_for_detail(s):
+    # 与浏览器端escapeHtml保持同样的换行/连续空格处理
+    return html.escape(s).replace('\n', '<br>').replace('  ', ' &nbsp;')
+
+@lru_cache(maxsize=8192)
+def esc_short(s):
+    """转义带缓存：target、提取答案这类短字符串跨样本大量重复"""
+    return _escape_for_detail(s)
+
+def _esc(s):
+    # 长文本不进缓存，避免缓存占用失控
+    return esc_short(s) if len(s) < 256 else _escape_for_detail(s)
+
+def precompute_sample_fields(data):
+    """生成阶段算好列表渲染用的派生字段，浏览器端过滤/渲染时不再重算。
+
+    每个样本附带：_preview（题目预览）、_correct/_total（模型正确数）、
+    _catShort（去掉math_500_前缀的类别名）。
+    """
+    for category, indices in data.items():
+        cat_short = category.replace('math_500_', '')
+        for sample in indices.values():
+            input_text = sample.get('input', '')
+            models = sample.get('models', {})
+            sample['_preview'] = ' '.join(input_text.split('\n')[:2])[:150]
+            sample['_correct'] = sum(1 for m in models.values() if m.get('acc') == 1.0)
+            sample['_total'] = len(models)
+            sample['_catShort'] = cat_short
+            # 详情页直接innerHTML用的预转义字段，浏览器端不再逐条escape
+            target = sample.get('target')
+            if target:
+                sample['_targetHtml'] = _esc(target)
+            for model in models.values():
+                extracted = model.get('extracted_prediction')
+                if extracted:
+                    model['_extractedHtml'] = _esc(extracted)
+
+# JSON作为JS源码内联时转义<，防止</script>提前闭合标签；
+# JSON输出中<只会出现在字符串字面量里，全局替换是安全的
+_SCRIPT_SAFE_TBL = str.maketrans({'<': '\\u003c'})
+
+def iter_html(data, inline_json=False):
+    """按块产出HTML内容，调用方可以直接流式写盘，整份字符串不驻留内存
+
+    inline_json=True时数据以JS对象字面量直接赋给window.__APP_DATA__，
+    浏览器在脚本解析阶段一次建好对象，省掉解压/解析步骤（文件更大）；
+    默认仍走gzip+base64嵌入，磁盘体积优先。
+    """
+    # 派生字段在Python端算一次，随数据一起嵌入
+    precompute_sample_fields(data)
+
+    if inline_json:
+        payload_chunk = ('<script>window.__APP_DATA__='
+                         + _dumps(intern_payload(data)).translate(_SCRIPT_SAFE_TBL)
+                         + ';</script>')
+    else:
+        # gzip压缩JSON后base64嵌入：file://场景没有HTTP压缩，磁盘上的HTML
+        # 可以小3-5倍；base64文本不含<和&，无需再做脚本安全转义
+        payload_chunk = ('<script type="text/plain" id="appData">\n'
+                         + base64.b64encode(
+                             gzip.compress(_dumps_bytes(intern_payload(data)),
+                                           compresslevel=6)).decode('ascii')
+                         + '\n    </script>')
 
     # 统计信息
     total_categories = len(data)
@@ -56,8 +197,24 @@ def generate_html(data):
         "qwen-plus": "Qwen-plus"
     }
 
-    # HTML模板 - 使用字符串拼接避免嵌套问题
-    html_template = '''<!DOCTYPE html>
+    # 模板段 + 动态值逐块产出，避免大字符串反复拼接复制
+    yield _HEAD
+    yield _STATS_TMPL.format_map({
+        'total_samples': total_samples,
+        'total_categories': total_categories,
+        'model_count': model_count,
+    })
+    yield _BODY
+    yield payload_chunk
+    # 冻结后JIT可将这两个小映射当常量对待，属性访问可内联
+    yield _JS_HEAD
+    yield 'Object.freeze(%s)' % _dumps(model_colors)
+    yield _JS_MID
+    yield 'Object.freeze(%s)' % _dumps(model_display_names)
+    yield _JS_TAIL
+
+# 静态HTML/CSS/JS模板段，模块加载时创建一次
+_HEAD = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -122,6 +279,7 @@ def generate_html(data):
         }
 
         .samples-list {
+            position: relative;
             flex: 1;
             overflow-y: auto;
             max-height: none;
@@ -203,10 +361,12 @@ def generate_html(data):
 
 
         .sample-item {
+            height: 92px; /* 固定行高，虚拟滚动按此计算窗口 */
             padding: 15px;
             border-bottom: 1px solid #f0f0f0;
             cursor: pointer;
             transition: background-color 0.2s;
+            overflow: hidden;
         }
 
         .sample-item:hover {
@@ -453,9 +613,14 @@ def generate_html(data):
     <div class="app-header">
         <h1>Math-500 评测结果对比</h1>
         <div class="stats">
-            共 <span id="total-samples">''' + str(total_samples) + '''</span> 个样本 •
-            <span id="total-categories">''' + str(total_categories) + '''</span> 个难度等级 •
-            <span id="total-models">''' + str(model_count) + '''</span> 个模型
+            '''
+
+# 统计片段单独format一次；大模板段保持纯静态，互不拼接
+_STATS_TMPL = '''共 <span id="total-samples">{total_samples}</span> 个样本 •
+            <span id="total-categories">{total_categories}</span> 个难度等级 •
+            <span id="total-models">{model_count}</span> 个模型'''
+
+_BODY = '''
         </div>
     </div>
 
@@ -494,21 +659,27 @@ def generate_html(data):
     </div>
 
     <!-- 嵌入数据 -->
-    <script type="application/json" id="appData">
-''' + json_str_escaped + '''
-    </script>
+    '''
+
+_JS_HEAD = '''
 
     <!-- 应用JavaScript -->
     <script>
-        // 应用数据
-        const appData = JSON.parse(document.getElementById('appData').textContent);
-        const modelColors = ''' + json.dumps(model_colors, ensure_ascii=False) + ''';
-        const modelDisplayNames = ''' + json.dumps(model_display_names, ensure_ascii=False) + ''';
+        // 应用数据：init时从gzip+base64的嵌入块解压得到
+        let appData = null;
+        const modelColors = '''
+
+_JS_MID = ''';
+        const modelDisplayNames = '''
+
+_JS_TAIL = ''';
 
         // 状态管理
         let currentCategory = '';
         let currentSampleIndex = null;
         let allSamples = [];
+        // 模型集合固定，排序一次，渲染详情时不再每次sort
+        const SORTED_MODEL_NAMES = Object.keys(modelDisplayNames).sort();
 
         // DOM元素
         const samplesListEl = document.getElementById('samplesList');
@@ -517,17 +688,68 @@ def generate_html(data):
         const detailContentEl = document.getElementById('detailContent');
         const emptyStateEl = document.getElementById('emptyState');
 
-        // HTML转义工具函数
+        // HTML转义工具函数（带缓存：重复字符串只转义一次）
+        const _escCache = new Map();
+        // 正则提升到函数体外，避免每次调用都重新创建
+        const _RE_NEWLINE = /\\n/g;
+        const _RE_DOUBLE_SPACE = /  /g;
+
         function escapeHtml(text) {
             if (!text) return '';
 
+            const hit = _escCache.get(text);
+            if (hit !== undefined) return hit;
+
             const div = document.createElement('div');
             div.textContent = text;
-            return div.innerHTML.replace(/\\n/g, '<br>').replace(/  /g, ' &nbsp;');
+            const out = div.innerHTML.replace(_RE_NEWLINE, '<br>').replace(_RE_DOUBLE_SPACE, ' &nbsp;');
+            // 超长字符串不进缓存，避免内存无限增长
+            if (text.length < 4096) {
+                _escCache.set(text, out);
+            }
+            return out;
+        }
+
+        // 解压嵌入数据：base64 -> bytes -> gzip解压 -> JSON
+        async function loadAppData() {
+            // 字面量内联模式：脚本解析阶段对象已建好，直接取用
+            if (window.__APP_DATA__) return window.__APP_DATA__;
+            const b64 = document.getElementById('appData').textContent.trim();
+            const bin = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+            const stream = new Blob([bin]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return await new Response(stream).json();
+        }
+
+        // 还原字符串表：这些字段出现数值即代表strings表索引
+        const _INTERN_SAMPLE_FIELDS = ['input', 'target', 'question_id', 'category',
+                                       '_catShort', 'solution', '_preview', '_targetHtml'];
+        const _INTERN_MODEL_FIELDS = ['prediction', 'extracted_prediction', 'explanation',
+                                      '_extractedHtml'];
+
+        function hydrateAppData(raw) {
+            const S = raw.strings;
+            for (const indices of Object.values(raw.data)) {
+                for (const sample of Object.values(indices)) {
+                    for (const f of _INTERN_SAMPLE_FIELDS) {
+                        if (typeof sample[f] === 'number') sample[f] = S[sample[f]];
+                    }
+                    const named = {};
+                    for (const [key, model] of Object.entries(sample.models || {})) {
+                        for (const f of _INTERN_MODEL_FIELDS) {
+                            if (typeof model[f] === 'number') model[f] = S[model[f]];
+                        }
+                        named[S[parseInt(key)]] = model;
+                    }
+                    sample.models = named;
+                }
+            }
+            return raw.data;
         }
 
         // 初始化
-        function init() {
+        async function init() {
+            appData = hydrateAppData(await loadAppData());
+
             // 构建所有样本的扁平化列表
             buildAllSamples();
 
@@ -551,7 +773,11 @@ def generate_html(data):
                         category,
                         index: parseInt(index),
                         sampleData,
-                        displayIndex: allSamples.length + 1
+                        displayIndex: allSamples.length + 1,
+                        // 小写检索串构建一次，搜索时不再对每个样本toLowerCase
+                        _search: ((sampleData.input || '') + '\\u0001' +
+                                  (sampleData.target || '') + '\\u0001' +
+                                  (sampleData.question_id || '')).toLowerCase()
                     });
                 }
             }
@@ -571,65 +797,90 @@ def generate_html(data):
             });
         }
 
-        // 渲染样本列表
+        // 虚拟滚动参数：固定行高92px，只渲染可视窗口内的行
+        const ROW_HEIGHT = 92;
+        const OVERSCAN = 5;
+        let currentList = [];
+        let listWindowEl = null;
+        let lastWindowStart = -1;
+
+        // 渲染样本列表（虚拟滚动：占位元素撑起滚动高度，窗口容器承载可见行）
         function renderSampleList(filteredSamples = null) {
-            const samplesToRender = filteredSamples || allSamples;
+            currentList = filteredSamples || allSamples;
 
-            if (samplesToRender.length === 0) {
+            if (currentList.length === 0) {
                 samplesListEl.innerHTML = '<div class="empty-state">没有找到匹配的题目</div>';
+                listWindowEl = null;
                 return;
             }
 
-            let html = '';
+            const spacerEl = document.createElement('div');
+            spacerEl.style.height = `${currentList.length * ROW_HEIGHT}px`;
+            listWindowEl = document.createElement('div');
+            listWindowEl.style.position = 'absolute';
+            listWindowEl.style.top = '0';
+            listWindowEl.style.left = '0';
+            listWindowEl.style.right = '0';
+            samplesListEl.replaceChildren(spacerEl, listWindowEl);
+            lastWindowStart = -1;
+            renderVisibleRows(true);
+        }
 
-            samplesToRender.forEach(sample => {
-                const category = sample.category;
-                const index = sample.index;
-                const sampleData = sample.sampleData;
-                const displayIndex = sample.displayIndex;
-
-                const input = sampleData.input || '';
-                const target = sampleData.target || '';
-                const questionId = sampleData.question_id || '';
-                const categoryDisplay = category.replace('math_500_', '');
-
-                // 提取题目前几行作为预览
-                const preview = input.split('\\n').slice(0, 2).join(' ').substring(0, 150);
-
-                // 检查模型评分
-                const models = sampleData.models || {};
-                let correctCount = 0;
-                for (const modelData of Object.values(models)) {
-                    if (modelData.acc === 1.0) {
-                        correctCount++;
-                    }
-                }
+        // 构建单个样本行；用户文本走textContent，不经过HTML解析
+        function buildSampleItem(sample) {
+            const sampleData = sample.sampleData;
+            const questionId = sampleData.question_id || '';
 
-                html += `
-                    <div class="sample-item" data-category="${category}" data-index="${index}">
-                        <div class="sample-title">
-                            #${displayIndex}: ${questionId || '题目 ' + index}
-                        </div>
-                        <div class="sample-meta">
-                            <span class="category">${categoryDisplay}</span>
-                            <span class="index">ID: ${index}</span>
-                            <span class="models">模型正确率: ${correctCount}/${Object.keys(models).length}</span>
-                        </div>
-                        <div class="sample-preview">${escapeHtml(preview)}...</div>
-                    </div>
-                `;
-            });
+            const itemEl = document.createElement('div');
+            itemEl.className = 'sample-item';
+            if (sample.category === currentCategory && sample.index === currentSampleIndex) {
+                itemEl.classList.add('selected');
+            }
+            itemEl.dataset.category = sample.category;
+            itemEl.dataset.index = sample.index;
+
+            const titleEl = document.createElement('div');
+            titleEl.className = 'sample-title';
+            titleEl.textContent = `#${sample.displayIndex}: ${questionId || '题目 ' + sample.index}`;
+
+            const metaEl = document.createElement('div');
+            metaEl.className = 'sample-meta';
+            const catEl = document.createElement('span');
+            catEl.className = 'category';
+            catEl.textContent = sampleData._catShort;
+            const idxEl = document.createElement('span');
+            idxEl.className = 'index';
+            idxEl.textContent = `ID: ${sample.index}`;
+            const modelsEl = document.createElement('span');
+            modelsEl.className = 'models';
+            modelsEl.textContent = `模型正确率: ${sampleData._correct}/${sampleData._total}`;
+            metaEl.append(catEl, idxEl, modelsEl);
+
+            const previewEl = document.createElement('div');
+            previewEl.className = 'sample-preview';
+            previewEl.textContent = sampleData._preview + '...';
+
+            itemEl.append(titleEl, metaEl, previewEl);
+            return itemEl;
+        }
 
-            samplesListEl.innerHTML = html;
+        // 只重建与可视区域相交的行
+        function renderVisibleRows(force) {
+            if (!listWindowEl) return;
 
-            // 绑定点击事件
-            document.querySelectorAll('.sample-item').forEach(item => {
-                item.addEventListener('click', function() {
-                    const category = this.dataset.category;
-                    const index = parseInt(this.dataset.index);
-                    selectSample(category, index);
-                });
-            });
+            const start = Math.max(0, Math.floor(samplesListEl.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            if (!force && start === lastWindowStart) return;
+            lastWindowStart = start;
+
+            const visibleCount = Math.ceil(samplesListEl.clientHeight / ROW_HEIGHT);
+            const end = Math.min(currentList.length, start + visibleCount + OVERSCAN * 2);
+
+            const frag = document.createDocumentFragment();
+            for (let i = start; i < end; i++) {
+                frag.appendChild(buildSampleItem(currentList[i]));
+            }
+            listWindowEl.style.transform = `translateY(${start * ROW_HEIGHT}px)`;
+            listWindowEl.replaceChildren(frag);
         }
 
         // 选择样本
@@ -637,25 +888,40 @@ def generate_html(data):
             currentCategory = category;
             currentSampleIndex = index;
 
-            // 更新选中状态
-            document.querySelectorAll('.sample-item').forEach(item => {
-                item.classList.remove('selected');
-                if (item.dataset.category === category && parseInt(item.dataset.index) === index) {
-                    item.classList.add('selected');
-                }
-            });
+            // 更新选中状态（可见行直接重建）
+            renderVisibleRows(true);
 
             // 显示详情
             renderDetail();
         }
 
+        // 详情HTML按(类别,索引)缓存，重复查看同一题时直接复用
+        const _detailCache = new Map();
+        const _DETAIL_CACHE_MAX = 50;
+
+        function showDetailHtml(html) {
+            detailContentEl.innerHTML = html;
+            emptyStateEl.classList.add('hidden');
+            detailContentEl.classList.remove('hidden');
+        }
+
         // 渲染详情
         function renderDetail() {
+            const cacheKey = currentCategory + '\\x00' + currentSampleIndex;
+            const cached = _detailCache.get(cacheKey);
+            if (cached !== undefined) {
+                // 重新插入，让Map的插入序充当LRU序
+                _detailCache.delete(cacheKey);
+                _detailCache.set(cacheKey, cached);
+                showDetailHtml(cached);
+                return;
+            }
+
             const sampleData = appData[currentCategory][currentSampleIndex];
             if (!sampleData) return;
 
-            const {input, target, category, question_id, solution, models} = sampleData;
-            const categoryDisplay = category.replace('math_500_', '');
+            const {input, category, question_id, solution, models} = sampleData;
+            const categoryDisplay = sampleData._catShort;
 
             // 构建HTML
             let html = '';
@@ -672,11 +938,11 @@ def generate_html(data):
             `;
 
             // 正确答案部分
-            if (target) {
+            if (sampleData._targetHtml) {
                 html += `
                     <div class="answer-section">
                         <div class="answer-label">正确答案</div>
-                        <div class="answer-content">${escapeHtml(target)}</div>
+                        <div class="answer-content">${sampleData._targetHtml}</div>
                     </div>
                 `;
             }
@@ -689,12 +955,12 @@ def generate_html(data):
                         <div class="models-grid">
                 `;
 
-                // 按模型名称排序
-                const sortedModelNames = Object.keys(models).sort();
+                // 全局排好序的模型名，只过滤出该样本有的
+                const sortedModelNames = SORTED_MODEL_NAMES.filter(n => n in models);
 
                 sortedModelNames.forEach(modelName => {
                     const modelData = models[modelName];
-                    const {prediction, extracted_prediction, acc, explanation} = modelData;
+                    const {prediction, acc, explanation} = modelData;
                     const isCorrect = acc === 1.0;
                     const scoreClass = isCorrect ? 'correct' : 'incorrect';
                     const scoreText = isCorrect ? '✓ 正确' : '✗ 错误';
@@ -711,11 +977,11 @@ def generate_html(data):
                     `;
 
                     // 提取的答案
-                    if (extracted_prediction) {
+                    if (modelData._extractedHtml) {
                         html += `
                             <div class="extracted-answer">
                                 <div class="extracted-label">提取的答案</div>
-                                <div class="extracted-content">${escapeHtml(extracted_prediction)}</div>
+                                <div class="extracted-content">${modelData._extractedHtml}</div>
                             </div>
                         `;
                     }
@@ -742,24 +1008,53 @@ def generate_html(data):
                 `;
             }
 
+            // 写入缓存并淘汰最久未用的条目
+            _detailCache.set(cacheKey, html);
+            if (_detailCache.size > _DETAIL_CACHE_MAX) {
+                _detailCache.delete(_detailCache.keys().next().value);
+            }
+
             // 更新DOM
-            detailContentEl.innerHTML = html;
-            emptyStateEl.classList.add('hidden');
-            detailContentEl.classList.remove('hidden');
+            showDetailHtml(html);
+        }
+
+        // 简单的尾沿防抖
+        function debounce(fn, ms) {
+            let timer;
+            return (...args) => {
+                clearTimeout(timer);
+                timer = setTimeout(() => fn(...args), ms);
+            };
         }
 
         // 设置事件监听器
         function setupEventListeners() {
-            // 分类过滤器
+            // 列表点击事件委托到容器，一次绑定对所有行生效
+            samplesListEl.addEventListener('click', (e) => {
+                const item = e.target.closest('.sample-item');
+                if (!item) return;
+                selectSample(item.dataset.category, parseInt(item.dataset.index));
+            });
+
+            // 滚动时按帧重建可见窗口
+            let scrollScheduled = false;
+            samplesListEl.addEventListener('scroll', () => {
+                if (scrollScheduled) return;
+                scrollScheduled = true;
+                requestAnimationFrame(() => {
+                    scrollScheduled = false;
+                    renderVisibleRows(false);
+                });
+            });
+
+            // 分类过滤器（切换立即生效）
             categoryFilterEl.addEventListener('change', function() {
                 currentCategory = this.value;
                 filterSamples();
             });
 
-            // 搜索框
-            searchBoxEl.addEventListener('input', function() {
-                filterSamples();
-            });
+            // 搜索框：防抖合并连续按键，避免每个字符都全量重渲染
+            searchBoxEl.addEventListener('input', debounce(filterSamples, 120));
         }
 
         // 筛选样本
@@ -774,17 +1069,9 @@ def generate_html(data):
                 filtered = filtered.filter(sample => sample.category === category);
             }
 
-            // 按搜索词筛选
+            // 按搜索词筛选（检索串已预先小写化）
             if (searchTerm) {
-                filtered = filtered.filter(sample => {
-                    const input = sample.sampleData.input || '';
-                    const target = sample.sampleData.target || '';
-                    const questionId = sample.sampleData.question_id || '';
-
-                    return input.toLowerCase().includes(searchTerm) ||
-                           target.toLowerCase().includes(searchTerm) ||
-                           questionId.toLowerCase().includes(searchTerm);
-                });
+                filtered = filtered.filter(sample => sample._search.includes(searchTerm));
             }
 
             renderSampleList(filtered);
@@ -796,12 +1083,16 @@ def generate_html(data):
 </body>
 </html>'''
 
-    return html_template
-
 def main():
     """主函数"""
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
+    args = sys.argv[1:]
+    # --inline-json：数据直接内联为JS字面量，打开更快但文件更大
+    inline_json = '--inline-json' in args
+    if inline_json:
+        args.remove('--inline-json')
+
+    if args:
+        input_file = args[0]
     else:
         input_file = "integrated_math_500.json"
 
@@ -813,14 +1104,28 @@ def main():
     data = load_json_data(input_file)
 
     print("生成HTML...")
-    html_content = generate_html(data)
-
     output_file = "math_500_comparison.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+
+    # 边产出边编码成UTF-8字节，跳过TextIOWrapper的逐块编码/缓冲
+    chunks = [chunk.encode('utf-8') for chunk in iter_html(data, inline_json=inline_json)]
+    total_bytes = sum(len(chunk) for chunk in chunks)
+    with open(output_file, 'wb') as f:
+        if hasattr(os, 'writev'):
+            # 一次gather write把所有块交给内核，省去多次write系统调用
+            fd = f.fileno()
+            pending = chunks
+            while pending:
+                n = os.writev(fd, pending)
+                # 短写极少见：丢弃已写完的块，截掉部分写入的前缀后继续
+                while pending and n >= len(pending[0]):
+                    n -= len(pending.pop(0))
+                if pending and n:
+                    pending[0] = pending[0][n:]
+        else:
+            f.writelines(chunks)
 
     print(f"HTML生成完成，保存到 {output_file}")
-    print(f"文件大小: {len(html_content) / 1024 / 1024:.2f} MB")
+    print(f"文件大小: {total_bytes / 1024 / 1024:.2f} MB")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,44 +1,83 @@
 #!/usr/bin/env python3
 """
 生成一个独立的HTML文件，用于浏览和对比六个模型的multi-if评测结果。
-使用安全的JSON嵌入方式：将JSON放在<script type="application/json">标签中。
+数据以gzip+base64形式嵌入，浏览器端用DecompressionStream解压。
 """
 
+import base64
+import gzip
 import json
 import os
 import sys
 from pathlib import Path
-import html
 
-def load_json_data(json_path):
-    """加载JSON数据"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def generate_html(data):
-    """生成HTML内容"""
-    # 将数据转换为JSON字符串，用于嵌入
-    json_str = json.dumps(data, ensure_ascii=False)
-    # HTML转义，然后还原双引号（因为JSON需要原始双引号）
-    # html.escape() 会将 " 转义为 &quot;，但JSON解析需要 "
-    json_str_escaped = html.escape(json_str)
-    # 将 &quot; 还原为 "
-    json_str_escaped = json_str_escaped.replace('&quot;', '"')
-    # 额外安全措施：转义 </script> 序列，防止意外结束标签
-    json_str_escaped = json_str_escaped.replace('</script>', '<\\/script>')
+try:
+    import orjson
 
-    # 统计信息
-    total_categories = len(data)
-    total_samples = sum(len(indices) for indices in data.values())
-    model_count = 0
-    if total_categories > 0:
-        first_cat = list(data.keys())[0]
-        if data[first_cat]:
-            first_idx = list(data[first_cat].keys())[0]
-            model_count = len(data[first_cat][first_idx].get('models', {}))
+    def _dumps_bytes(obj):
+        """orjson（Rust实现）序列化大数据集比stdlib快一个量级，输出总是UTF-8 bytes"""
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps_bytes(obj):
+        # 紧凑分隔符对齐orjson的输出形态，载荷少约10%
+        return json.dumps(obj, ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+
+    _loads = json.loads
+
+try:
+    import msgpack
 
-    # HTML模板
-    html_content = f'''<!DOCTYPE html>
+    def _pack_payload(obj):
+        """msgpack把浮点/整数打成定宽二进制，比JSON文本更小、浏览器解码更快"""
+        return msgpack.packb(obj, use_bin_type=True)
+
+    _PAYLOAD_FORMAT = 'msgpack'
+except ImportError:
+    # 未安装msgpack时载荷退回JSON，浏览器端按data-format分支解码
+    def _pack_payload(obj):
+        return _dumps_bytes(obj)
+
+    _PAYLOAD_FORMAT = 'json'
+
+# 浏览器端msgpack解码器（约5KB，UMD构建暴露MessagePack全局）
+_MSGPACK_JS_CDN = 'https://unpkg.com/@msgpack/msgpack@3/dist.umd/msgpack.min.js'
+
+def load_json_data(json_path):
+    """加载JSON数据"""
+    with open(json_path, 'rb') as f:
+        return _loads(f.read())
+
+def precompute_sample_fields(data):
+    """生成阶段算好列表渲染用的preview/language，浏览器端不再逐项重算。
+
+    先用一趟扁平推导式收集所有样本（推导式走LIST_APPEND快路径），
+    再在单层循环里写派生字段，省掉逐样本的双层循环分派开销。
+    """
+    flat = [sample
+            for indices in data.values()
+            for sample in indices.values()]
+    _empty = {}
+    for sample in flat:
+        # removeprefix是C层memcmp，替代浏览器端原来的正则
+        text = sample.get('input', '').removeprefix('**User**:').lstrip()
+        sample['preview'] = text[:80]
+        models = sample.get('models', _empty)
+        first_model = next(iter(models.values()), _empty)
+        sample['language'] = first_model.get('language', 'unknown')
+        # 评分在生成阶段格式化成字符串，浏览器端渲染时不再逐个toFixed；
+        # 也顺带消除null评分在运行时抛TypeError的可能
+        for model in models.values():
+            scores = model.get('all_scores')
+            if scores:
+                for name, value in scores.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        scores[name] = f'{value:.4f}'
+
+# 静态模板段拆成模块常量，生成时流式写盘，不再拼接整页字符串
+_HTML_PREFIX = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -46,92 +85,97 @@ def generate_html(data):
     <title>Multi-IF 评测结果对比</title>
     <style>
         /* 基础重置 */
-        * {{
+        * {
             box-sizing: border-box;
             margin: 0;
             padding: 0;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
             line-height: 1.6;
             color: #333;
             background-color: #f8f9fa;
             padding: 10px;
             min-height: 100vh;
-        }}
+        }
 
-        .app-header {{
+        .app-header {
             text-align: center;
             margin-bottom: 20px;
             padding-bottom: 15px;
             border-bottom: 1px solid #dee2e6;
-        }}
+        }
 
-        .app-header h1 {{
+        .app-header h1 {
             font-size: 1.8rem;
             color: #2c3e50;
             margin-bottom: 5px;
-        }}
+        }
 
-        .app-header .stats {{
+        .app-header .stats {
             font-size: 0.9rem;
             color: #7f8c8d;
-        }}
+        }
 
         /* 主容器 */
-        .app-container {{
+        .app-container {
             display: flex;
             flex-direction: column;
             gap: 20px;
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
 
         /* 样本列表 */
-        .samples-panel {{
+        .samples-panel {
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.05);
             overflow: hidden;
-        }}
+        }
 
-        .samples-header {{
+        .samples-header {
             padding: 15px;
             background: #f8f9fa;
             border-bottom: 1px solid #dee2e6;
             font-weight: bold;
             color: #2c3e50;
-        }}
+        }
 
-        .samples-list {{
+        .samples-list {
             max-height: 400px;
             overflow-y: auto;
-        }}
+            /* 虚拟滚动的定位基准 */
+            position: relative;
+        }
 
-        .sample-item {{
+        .sample-item {
             padding: 12px 15px;
             border-bottom: 1px solid #f1f1f1;
             cursor: pointer;
             transition: background-color 0.2s;
-        }}
+            /* 固定行高，虚拟滚动按它计算窗口 */
+            height: 72px;
+            overflow: hidden;
+        }
 
-        .sample-item:hover {{
+        .sample-item:hover {
             background-color: #f8f9fa;
-        }}
+        }
 
-        .sample-item.active {{
+        .sample-item.active {
             background-color: #e3f2fd;
             border-left: 4px solid #2196f3;
-        }}
+        }
 
-        .sample-category {{
+        .sample-category {
             font-weight: bold;
             color: #2c3e50;
             font-size: 0.9rem;
-        }}
+        }
 
-        .sample-language {{
+        .sample-language {
             font-size: 0.8rem;
             color: #666;
             background: #f0f0f0;
@@ -139,51 +183,51 @@ def generate_html(data):
             border-radius: 10px;
             display: inline-block;
             margin-left: 8px;
-        }}
+        }
 
-        .sample-preview {{
+        .sample-preview {
             font-size: 0.85rem;
             color: #666;
             margin-top: 4px;
             white-space: nowrap;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
 
         /* 详情面板 */
-        .detail-panel {{
+        .detail-panel {
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.05);
             overflow: hidden;
-        }}
+        }
 
-        .detail-header {{
+        .detail-header {
             padding: 15px;
             background: #f8f9fa;
             border-bottom: 1px solid #dee2e6;
             font-weight: bold;
             color: #2c3e50;
-        }}
+        }
 
-        .detail-content {{
+        .detail-content {
             padding: 20px;
-        }}
+        }
 
-        .section {{
+        .section {
             margin-bottom: 30px;
-        }}
+        }
 
-        .section-title {{
+        .section-title {
             font-size: 1.1rem;
             font-weight: bold;
             color: #2c3e50;
             margin-bottom: 10px;
             padding-bottom: 5px;
             border-bottom: 2px solid #e9ecef;
-        }}
+        }
 
-        .content-box {{
+        .content-box {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 6px;
@@ -192,67 +236,67 @@ def generate_html(data):
             word-wrap: break-word;
             font-size: 0.95rem;
             line-height: 1.6;
-        }}
+        }
 
-        .model-outputs {{
+        .model-outputs {
             display: grid;
             grid-template-columns: 1fr;
             gap: 20px;
-        }}
+        }
 
-        .model-card {{
+        .model-card {
             background: white;
             border: 1px solid #e9ecef;
             border-radius: 6px;
             padding: 15px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-        }}
+        }
 
-        .model-header {{
+        .model-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 10px;
             padding-bottom: 8px;
             border-bottom: 1px solid #e9ecef;
-        }}
+        }
 
-        .model-name {{
+        .model-name {
             font-weight: bold;
             color: #2c3e50;
             font-size: 1rem;
-        }}
+        }
 
-        .model-language {{
+        .model-language {
             font-size: 0.8rem;
             color: #666;
             background: #e8f4fd;
             padding: 2px 8px;
             border-radius: 12px;
             margin-left: 8px;
-        }}
+        }
 
-        .model-acc {{
+        .model-acc {
             background: #e8f5e9;
             color: #2e7d32;
             padding: 3px 8px;
             border-radius: 12px;
             font-size: 0.85rem;
             font-weight: bold;
-        }}
+        }
 
-        .model-acc.low {{
+        .model-acc.low {
             background: #ffebee;
             color: #c62828;
-        }}
+        }
 
-        .model-prediction {{
+        .model-prediction {
             margin-bottom: 10px;
             font-size: 0.95rem;
             line-height: 1.6;
-        }}
+        }
 
-        .model-scores {{
+        .model-scores {
             font-size: 0.85rem;
             color: #666;
             background: #f8f9fa;
@@ -260,94 +304,94 @@ def generate_html(data):
             border-radius: 4px;
             border-left: 3px solid #ff9800;
             margin-top: 10px;
-        }}
+        }
 
-        .score-group {{
+        .score-group {
             margin-bottom: 10px;
-        }}
+        }
 
-        .score-group-title {{
+        .score-group-title {
             font-weight: bold;
             margin-bottom: 5px;
             color: #555;
-        }}
+        }
 
-        .score-item {{
+        .score-item {
             display: flex;
             justify-content: space-between;
             margin-bottom: 3px;
             padding-left: 15px;
-        }}
+        }
 
-        .score-name {{
+        .score-name {
             font-weight: 500;
-        }}
+        }
 
-        .score-value {{
+        .score-value {
             font-family: monospace;
-        }}
+        }
 
         /* 移动端适配 */
-        @media (min-width: 768px) {{
-            .app-container {{
+        @media (min-width: 768px) {
+            .app-container {
                 flex-direction: row;
                 height: calc(100vh - 100px);
-            }}
+            }
 
-            .samples-panel {{
+            .samples-panel {
                 width: 300px;
                 height: 100%;
                 display: flex;
                 flex-direction: column;
-            }}
+            }
 
-            .samples-list {{
+            .samples-list {
                 flex: 1;
                 max-height: none;
-            }}
+            }
 
-            .detail-panel {{
+            .detail-panel {
                 flex: 1;
                 height: 100%;
                 overflow-y: auto;
-            }}
+            }
 
-            .model-outputs {{
+            .model-outputs {
                 grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
+            }
+        }
 
-        @media (min-width: 1200px) {{
-            .model-outputs {{
+        @media (min-width: 1200px) {
+            .model-outputs {
                 grid-template-columns: repeat(3, 1fr);
-            }}
-        }}
+            }
+        }
 
         /* 滚动条样式 */
-        ::-webkit-scrollbar {{
+        ::-webkit-scrollbar {
             width: 8px;
-        }}
+        }
 
-        ::-webkit-scrollbar-track {{
+        ::-webkit-scrollbar-track {
             background: #f1f1f1;
-        }}
+        }
 
-        ::-webkit-scrollbar-thumb {{
+        ::-webkit-scrollbar-thumb {
             background: #c1c1c1;
             border-radius: 4px;
-        }}
+        }
 
-        ::-webkit-scrollbar-thumb:hover {{
+        ::-webkit-scrollbar-thumb:hover {
             background: #a8a8a8;
-        }}
+        }
 
         /* 工具提示 */
-        .tooltip {{
+        .tooltip {
             position: relative;
             display: inline-block;
-        }}
+        }
 
-        .tooltip .tooltiptext {{
+        .tooltip .tooltiptext {
             visibility: hidden;
             width: 200px;
             background-color: #555;
@@ -363,28 +407,33 @@ def generate_html(data):
             opacity: 0;
             transition: opacity 0.3s;
             font-size: 0.8rem;
-        }}
+        }
 
-        .tooltip:hover .tooltiptext {{
+        .tooltip:hover .tooltiptext {
             visibility: visible;
             opacity: 1;
-        }}
+        }
 
         /* 空状态 */
-        .empty-state {{
+        .empty-state {
             text-align: center;
             padding: 40px 20px;
             color: #7f8c8d;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="app-header">
         <h1>Multi-IF 评测结果对比</h1>
         <div class="stats">
-            <span id="stats-categories">{total_categories}</span> 个类别 •
+            '''
+
+# 统计数字单独format，避免对含大量CSS/JS花括号的大模板做format
+_STATS_TMPL = '''<span id="stats-categories">{total_categories}</span> 个类别 •
             <span id="stats-samples">{total_samples}</span> 个样本 •
-            <span id="stats-models">{model_count}</span> 个模型
+            <span id="stats-models">{model_count}</span> 个模型'''
+
+_HTML_MID = '''
         </div>
     </div>
 
@@ -414,21 +463,56 @@ def generate_html(data):
         </div>
     </div>
 
-    <!-- 嵌入式JSON数据（安全方式） -->
-    <script type="application/json" id="evaluation-data">
-{json_str_escaped}
+    <!-- 嵌入式数据（gzip+base64，格式见data-format） -->
+    '''
+
+_HTML_SUFFIX = '''
     </script>
 
     <script>
-        // 从<script type="application/json">标签加载数据
-        const jsonElement = document.getElementById('evaluation-data');
-        let evaluationData = {{}};
-        try {{
-            evaluationData = JSON.parse(jsonElement.textContent);
-        }} catch (e) {{
-            console.error('解析JSON数据失败:', e);
-            alert('数据加载失败，请检查控制台。');
-        }}
+        let evaluationData = {};
+
+        // 解码嵌入数据：base64 -> bytes -> gzip解压 -> msgpack/JSON
+        async function loadPayload() {
+            const el = document.getElementById('evaluation-data-gz');
+            const bytes = Uint8Array.from(atob(el.textContent.trim()), c => c.charCodeAt(0));
+            if (typeof DecompressionStream === 'undefined') {
+                throw new Error('当前浏览器不支持DecompressionStream，请使用较新版本的浏览器');
+            }
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            if (el.dataset.format === 'msgpack') {
+                const buf = await new Response(stream).arrayBuffer();
+                return MessagePack.decode(new Uint8Array(buf));
+            }
+            return await new Response(stream).json();
+        }
+
+        // 还原字符串表：模型名键和language值在载荷里是_strings的索引
+        function hydratePayload(payload) {
+            const S = payload._strings;
+            const data = payload.data;
+            for (const indices of Object.values(data)) {
+                for (const sample of Object.values(indices)) {
+                    if (typeof sample.language === 'number') sample.language = S[sample.language];
+                    const named = {};
+                    for (const [key, model] of Object.entries(sample.models || {})) {
+                        if (typeof model.language === 'number') model.language = S[model.language];
+                        named[S[parseInt(key)]] = model;
+                    }
+                    sample.models = named;
+                }
+            }
+            return data;
+        }
+
+        async function loadEvaluationData() {
+            try {
+                evaluationData = hydratePayload(await loadPayload());
+            } catch (e) {
+                console.error('解析JSON数据失败:', e);
+                alert('数据加载失败，请检查控制台。');
+            }
+        }
 
         // 应用状态
         let currentSample = null;
@@ -441,165 +525,238 @@ def generate_html(data):
         const detailTitleEl = document.getElementById('detail-title');
         const sampleCountEl = document.getElementById('sample-count');
 
-        // 文本转义函数，防止XSS
-        function escapeHtml(text) {{
+        // 文本转义函数，防止XSS：查表replace走纯字符串快路径，不借DOM
+        const _ESC = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        const _ESC_RE = /[&<>"']/g;
+        const _ESC_TEST = /[&<>"']/;
+
+        function _escNoCache(text) {
+            // 乐观检查：不含元字符的字符串（模型名、索引等）原样返回
+            return _ESC_TEST.test(text) ? text.replace(_ESC_RE, c => _ESC[c]) : text;
+        }
+
+        // 短字符串转义结果缓存：同一批模型名/类别/语言在列表里重复上百次
+        const _escCache = new Map();
+
+        function escapeHtml(text) {
             if (text === null || text === undefined) return '';
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }}
+            text = '' + text;
+            // 长文本（input/prediction）绕过缓存，避免内存无限增长
+            if (text.length > 64) return _escNoCache(text);
+            const hit = _escCache.get(text);
+            if (hit !== undefined) return hit;
+            const out = _escNoCache(text);
+            if (_escCache.size > 4096) _escCache.clear();
+            _escCache.set(text, out);
+            return out;
+        }
+
+        // 同一个all_scores对象的格式化结果缓存起来，重复选样本不再重算
+        const _scoreCache = new WeakMap();
 
         // 格式化评分显示（按turn分组）
-        function formatScores(allScores) {{
+        function formatScores(allScores) {
             if (!allScores) return '';
-
-            // 按turn分组
-            const turnGroups = {{}};
-            for (const [scoreName, scoreValue] of Object.entries(allScores)) {{
-                const match = scoreName.match(/^turn_(\\d+)_/);
-                const turn = match ? match[1] : 'other';
-
-                if (!turnGroups[turn]) {{
+            const hit = _scoreCache.get(allScores);
+            if (hit !== undefined) return hit;
+
+            // 按turn分组；turn_N_前缀用indexOf切分，常见路径零正则
+            const turnGroups = {};
+            for (const scoreName in allScores) {
+                let turn = 'other';
+                if (scoreName.startsWith('turn_')) {
+                    const us = scoreName.indexOf('_', 5);
+                    if (us > 5) {
+                        const n = scoreName.slice(5, us);
+                        if (n && !isNaN(n)) turn = n;
+                    }
+                }
+
+                if (!turnGroups[turn]) {
                     turnGroups[turn] = [];
-                }}
-                turnGroups[turn].push({{name: scoreName, value: scoreValue}});
-            }}
+                }
+                turnGroups[turn].push({name: scoreName, value: allScores[scoreName]});
+            }
 
             let html = '<div class="model-scores">';
             html += '<div style="font-weight: bold; margin-bottom: 5px;">详细评分:</div>';
 
             // 按turn顺序显示
-            const sortedTurns = Object.keys(turnGroups).sort((a, b) => {{
+            const sortedTurns = Object.keys(turnGroups).sort((a, b) => {
                 if (a === 'other') return 1;
                 if (b === 'other') return -1;
                 return parseInt(a) - parseInt(b);
-            }});
+            });
 
-            for (const turn of sortedTurns) {{
-                const turnName = turn === 'other' ? '其他' : `第 ${{turn}} 轮`;
+            for (const turn of sortedTurns) {
+                const turnName = turn === 'other' ? '其他' : `第 ${turn} 轮`;
                 html += `
                     <div class="score-group">
-                        <div class="score-group-title">${{turnName}}</div>
+                        <div class="score-group-title">${turnName}</div>
                 `;
 
-                turnGroups[turn].forEach(score => {{
+                turnGroups[turn].forEach(score => {
                     html += `
                         <div class="score-item">
-                            <span class="score-name">${{score.name}}:</span>
-                            <span class="score-value">${{score.value.toFixed(4)}}</span>
+                            <span class="score-name">${score.name}:</span>
+                            <span class="score-value">${score.value}</span>
                         </div>
                     `;
-                }});
+                });
 
                 html += '</div>';
-            }}
+            }
 
             html += '</div>';
+            _scoreCache.set(allScores, html);
             return html;
-        }}
+        }
 
         // 初始化
-        function init() {{
+        function init() {
             renderSamplesList();
             // 默认选择第一个样本
-            if (Object.keys(evaluationData).length > 0) {{
+            if (Object.keys(evaluationData).length > 0) {
                 const firstCategory = Object.keys(evaluationData)[0];
                 const firstIndex = Object.keys(evaluationData[firstCategory])[0];
                 selectSample(firstCategory, parseInt(firstIndex));
-            }}
-        }}
+            }
+        }
 
-        // 渲染样本列表
-        function renderSamplesList() {{
-            samplesListEl.innerHTML = '';
+        // 虚拟滚动状态：DOM数量只跟可视窗口大小有关，与样本总数无关
+        const ROW_HEIGHT = 72;
+        const OVERSCAN = 5;
+        let currentRows = [];
+        let listWindowEl = null;
+        let lastWindowStart = -1;
 
-            let sampleCount = 0;
+        // 渲染样本列表：构建有序行数组，只把可视窗口内的行放进DOM
+        function renderSamplesList() {
+            currentRows = [];
 
             // 按类别和索引排序
             const categories = Object.keys(evaluationData).sort();
-
-            for (const category of categories) {{
+            for (const category of categories) {
                 const indices = Object.keys(evaluationData[category]).sort((a, b) => parseInt(a) - parseInt(b));
-
-                for (const index of indices) {{
-                    const sample = evaluationData[category][index];
-                    const inputText = sample.input || '';
-
-                    // 获取语言信息（从第一个模型）
-                    let language = 'unknown';
-                    const models = sample.models || {{}};
-                    if (Object.keys(models).length > 0) {{
-                        const firstModel = Object.keys(models)[0];
-                        language = models[firstModel].language || 'unknown';
-                    }}
-
-                    // 移除**User**: 前缀
-                    const previewText = inputText.replace(/^\\*\\*User\\*\\*:\\s*\\n/, '').substring(0, 80);
-
-                    const itemEl = document.createElement('div');
-                    itemEl.className = 'sample-item';
-                    itemEl.dataset.category = category;
-                    itemEl.dataset.index = index;
-                    itemEl.innerHTML = `
-                        <div class="sample-category">
-                            ${{escapeHtml(category)}} #${{escapeHtml(index)}}
-                            <span class="sample-language">${{escapeHtml(language)}}</span>
-                        </div>
-                        <div class="sample-preview" title="${{escapeHtml(inputText)}}">${{escapeHtml(previewText)}}...</div>
-                    `;
-
-                    itemEl.addEventListener('click', () => {{
-                        selectSample(category, parseInt(index));
-                    }});
-
-                    samplesListEl.appendChild(itemEl);
-                    sampleCount++;
-                }}
-            }}
-
-            sampleCountEl.textContent = `${{sampleCount}} 个样本`;
-
-            if (sampleCount === 0) {{
+                const catHtml = escapeHtml(category);
+                for (const index of indices) {
+                    currentRows.push({category, index, catHtml, sample: evaluationData[category][index]});
+                }
+            }
+
+            sampleCountEl.textContent = `${currentRows.length} 个样本`;
+            if (currentRows.length === 0) {
                 samplesListEl.innerHTML = '<div class="empty-state">没有找到样本数据</div>';
-            }}
-        }}
+                listWindowEl = null;
+                return;
+            }
+
+            // 占位元素撑出完整滚动高度，窗口容器用translateY定位
+            const spacerEl = document.createElement('div');
+            spacerEl.style.height = (currentRows.length * ROW_HEIGHT) + 'px';
+            listWindowEl = document.createElement('div');
+            listWindowEl.style.position = 'absolute';
+            listWindowEl.style.top = '0';
+            listWindowEl.style.left = '0';
+            listWindowEl.style.right = '0';
+            samplesListEl.replaceChildren(spacerEl, listWindowEl);
+            lastWindowStart = -1;
+            renderVisibleRows(true);
+        }
+
+        function rowHtml(row) {
+            const active = (row.category === currentCategory && parseInt(row.index) === currentIndex)
+                ? ' active' : '';
+            return `
+                <div class="sample-item${active}" data-category="${row.catHtml}" data-index="${row.index}">
+                    <div class="sample-category">
+                        ${row.catHtml} #${row.index}
+                        <span class="sample-language">${escapeHtml(row.sample.language)}</span>
+                    </div>
+                    <div class="sample-preview">${escapeHtml(row.sample.preview)}...</div>
+                </div>`;
+        }
+
+        // 只重建与可视区域相交的行
+        function renderVisibleRows(force) {
+            if (!listWindowEl) return;
+
+            const start = Math.max(0, Math.floor(samplesListEl.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            if (!force && start === lastWindowStart) return;
+            lastWindowStart = start;
+
+            const visible = Math.ceil(samplesListEl.clientHeight / ROW_HEIGHT);
+            const end = Math.min(currentRows.length, start + visible + OVERSCAN * 2);
+
+            const parts = [];
+            for (let i = start; i < end; i++) {
+                parts.push(rowHtml(currentRows[i]));
+            }
+            listWindowEl.style.transform = `translateY(${start * ROW_HEIGHT}px)`;
+            listWindowEl.innerHTML = parts.join('');
+        }
+
+        // 滚动回调合并到动画帧，一帧最多重建一次窗口
+        let scrollScheduled = false;
+        samplesListEl.addEventListener('scroll', () => {
+            if (scrollScheduled) return;
+            scrollScheduled = true;
+            requestAnimationFrame(() => {
+                scrollScheduled = false;
+                renderVisibleRows(false);
+            });
+        });
+
+        // 事件委托：整个列表一个监听器，不再为每项保留闭包
+        samplesListEl.addEventListener('click', e => {
+            const item = e.target.closest('.sample-item');
+            if (item) selectSample(item.dataset.category, parseInt(item.dataset.index));
+        });
 
         // 选择样本
-        function selectSample(category, index) {{
+        function selectSample(category, index) {
             // 更新当前选中状态
             currentCategory = category;
             currentIndex = index;
             currentSample = evaluationData[category][index];
 
-            // 更新列表项选中状态
-            document.querySelectorAll('.sample-item').forEach(item => {{
-                item.classList.remove('active');
-                if (item.dataset.category === category && item.dataset.index === index.toString()) {{
-                    item.classList.add('active');
-                }}
-            }});
+            // 更新列表项选中状态（可见行直接重建）
+            renderVisibleRows(true);
 
             // 渲染详情
             renderSampleDetail();
-        }}
+        }
 
         // 渲染样本详情
-        function renderSampleDetail() {{
+        // 详情HTML按(类别#索引)缓存，重复查看同一样本变成一次innerHTML赋值
+        const _detailCache = new Map();
+        const _DETAIL_CACHE_MAX = 200;
+
+        function renderSampleDetail() {
             if (!currentSample) return;
 
+            detailTitleEl.textContent = `${currentCategory} #${currentIndex}`;
+
+            const cacheKey = currentCategory + '#' + currentIndex;
+            const hit = _detailCache.get(cacheKey);
+            if (hit !== undefined) {
+                detailContentEl.innerHTML = hit;
+                return;
+            }
+
             const inputText = currentSample.input || '';
             const targetText = currentSample.target || '';
-            const models = currentSample.models || {{}};
+            const models = currentSample.models || {};
 
             // 构建模型输出HTML
             let modelsHTML = '';
             const modelEntries = Object.entries(models);
 
-            for (const [modelName, modelData] of modelEntries) {{
+            for (const [modelName, modelData] of modelEntries) {
                 const prediction = modelData.prediction || '';
                 const acc = modelData.acc || 0.0;
                 const explanation = modelData.explanation || '';
-                const allScores = modelData.all_scores || {{}};
+                const allScores = modelData.all_scores || {};
                 const language = modelData.language || 'unknown';
 
                 // 根据评分设置CSS类
@@ -609,40 +766,135 @@ def generate_html(data):
                     <div class="model-card">
                         <div class="model-header">
                             <div style="display: flex; align-items: center;">
-                                <div class="model-name">${{escapeHtml(modelName)}}</div>
-                                <span class="model-language">${{escapeHtml(language)}}</span>
+                                <div class="model-name">${escapeHtml(modelName)}</div>
+                                <span class="model-language">${escapeHtml(language)}</span>
                             </div>
-                            <div class="${{accClass}}">评分: ${{acc.toFixed(4)}}</div>
+                            <div class="${accClass}">评分: ${acc.toFixed(4)}</div>
                         </div>
-                        <div class="model-prediction">${{escapeHtml(prediction)}}</div>
-                        ${{formatScores(allScores)}}
+                        <div class="model-prediction">${escapeHtml(prediction)}</div>
+                        ${formatScores(allScores)}
                     </div>
                 `;
-            }}
+            }
 
-            detailTitleEl.textContent = `${{escapeHtml(currentCategory)}} #${{escapeHtml(currentIndex.toString())}}`;
-
-            detailContentEl.innerHTML = `
+            const html = `
                 <div class="section">
                     <div class="section-title">用户输入</div>
-                    <div class="content-box">${{escapeHtml(inputText)}}</div>
+                    <div class="content-box">${escapeHtml(inputText)}</div>
                 </div>
 
                 <div class="section">
-                    <div class="section-title">模型输出 (${{modelEntries.length}} 个模型)</div>
+                    <div class="section-title">模型输出 (${modelEntries.length} 个模型)</div>
                     <div class="model-outputs">
-                        ${{modelsHTML}}
+                        ${modelsHTML}
                     </div>
                 </div>
             `;
-        }}
 
-        // 页面加载完成后初始化
-        document.addEventListener('DOMContentLoaded', init);
+            // FIFO淘汰：Map迭代序即插入序
+            _detailCache.set(cacheKey, html);
+            if (_detailCache.size > _DETAIL_CACHE_MAX) {
+                _detailCache.delete(_detailCache.keys().next().value);
+            }
+
+            detailContentEl.innerHTML = html;
+        }
+
+        // 页面加载完成后初始化：解码/解析推迟到浏览器空闲期，
+        // 首帧先画出静态骨架（列表里的"正在加载样本..."占位）
+        document.addEventListener('DOMContentLoaded', () => {
+            const boot = async () => {
+                await loadEvaluationData();
+                init();
+            };
+            if (typeof requestIdleCallback === 'function') {
+                requestIdleCallback(() => { boot(); }, {timeout: 1000});
+            } else {
+                setTimeout(boot, 0);
+            }
+        });
     </script>
 </body>
 </html>'''
-    return html_content
+
+# 静态段在导入时编码一次，写盘全程走bytes，JSON不再decode成str
+_PREFIX_B = _HTML_PREFIX.encode('utf-8')
+_MID_B = _HTML_MID.encode('utf-8')
+_SUFFIX_B = _HTML_SUFFIX.encode('utf-8')
+
+# 大对象分块写，避免切片外再产生整块拷贝
+_WRITE_CHUNK = 1 << 20
+
+def intern_payload(data):
+    """模型名、语言这类低基数字符串收进_strings表，载荷里只存整数索引。
+
+    每个模型名/语言码在上千个样本里各重复一次，去重后嵌入体积和
+    浏览器JSON.parse耗时都成比例下降；input/prediction等自由文本不进表。
+    返回 {"_strings": 表, "data": 重写后的数据}，浏览器端还原。
+    """
+    table = []
+    index = {}
+
+    def intern(s):
+        idx = index.get(s)
+        if idx is None:
+            idx = index[s] = len(table)
+            table.append(s)
+        return idx
+
+    out = {}
+    for category, indices in data.items():
+        new_indices = {}
+        for i, sample in indices.items():
+            new_sample = dict(sample)
+            if isinstance(new_sample.get('language'), str):
+                new_sample['language'] = intern(new_sample['language'])
+            new_models = {}
+            for name, model in sample.get('models', {}).items():
+                new_model = dict(model)
+                if isinstance(new_model.get('language'), str):
+                    new_model['language'] = intern(new_model['language'])
+                # 模型名全部进表，键用索引的字符串形式
+                new_models[str(intern(name))] = new_model
+            new_sample['models'] = new_models
+            new_indices[i] = new_sample
+        out[category] = new_indices
+    return {'_strings': table, 'data': out}
+
+def generate_html_to(f, data):
+    """把HTML流式写入二进制文件对象，序列化结果不经过UTF-8解码"""
+    precompute_sample_fields(data)
+
+    # 序列化（msgpack或JSON）后gzip压缩、base64嵌入：file://场景没有
+    # HTTP压缩，磁盘上的HTML能小数倍；base64文本不含<，无需ETAGO转义
+    payload_b64 = base64.b64encode(
+        gzip.compress(_pack_payload(intern_payload(data)), compresslevel=6))
+
+    # 统计信息
+    total_categories = len(data)
+    total_samples = sum(len(indices) for indices in data.values())
+    model_count = 0
+    if total_categories > 0:
+        first_cat = list(data.keys())[0]
+        if data[first_cat]:
+            first_idx = list(data[first_cat].keys())[0]
+            model_count = len(data[first_cat][first_idx].get('models', {}))
+
+    f.write(_PREFIX_B)
+    f.write(_STATS_TMPL.format(total_categories=total_categories,
+                               total_samples=total_samples,
+                               model_count=model_count).encode('utf-8'))
+    f.write(_MID_B)
+    # 数据标签动态生成：msgpack模式先引入解码器，并标注载荷格式
+    if _PAYLOAD_FORMAT == 'msgpack':
+        f.write(('<script src="%s"></script>\n    ' % _MSGPACK_JS_CDN).encode('utf-8'))
+    f.write(('<script type="application/octet-stream" id="evaluation-data-gz" '
+             'data-format="%s">\n' % _PAYLOAD_FORMAT).encode('utf-8'))
+    # 载荷按1MiB的memoryview切片写，切片本身零拷贝
+    view = memoryview(payload_b64)
+    for i in range(0, len(view), _WRITE_CHUNK):
+        f.write(view[i:i + _WRITE_CHUNK])
+    f.write(_SUFFIX_B)
 
 def main():
     json_path = "integrated_multi_if.json"
@@ -657,10 +909,8 @@ def main():
     data = load_json_data(json_path)
 
     print("正在生成HTML文件...")
-    html_content = generate_html(data)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with open(output_path, 'wb') as f:
+        generate_html_to(f, data)
 
     print(f"HTML文件已生成: {output_path}")
     print(f"文件大小: {os.path.getsize(output_path) // 1024} KB")
@@ -5,38 +5,34 @@
 使用安全的JSON嵌入方式：将JSON放在<script type="application/json">标签中。
 """
 
+import gzip
+import html
 import json
 import os
+import shutil
+import string
 import sys
-import html
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 def load_json_data(json_path):
-    """加载JSON数据"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def generate_html(data):
-    """生成HTML内容"""
-    # 将数据转换为JSON字符串，用于嵌入
-    json_str = json.dumps(data, ensure_ascii=False)
-    # HTML转义，然后还原双引号（因为JSON需要原始双引号）
-    json_str_escaped = html.escape(json_str)
-    json_str_escaped = json_str_escaped.replace('&quot;', '"')
-    # 额外安全措施：转义 </script> 序列
-    json_str_escaped = json_str_escaped.replace('</script>', '<\\/script>')
+    """加载JSON数据：二进制读入直接解析，orjson（Rust实现）比stdlib快数倍"""
+    with open(json_path, 'rb') as f:
+        return _loads(f.read())
 
-    # 统计信息
-    total_categories = len(data)
-    total_samples = sum(len(indices) for indices in data.values())
-    model_count = 0
-    if total_categories > 0:
-        first_cat = list(data.keys())[0]
-        if data[first_cat]:
-            first_idx = list(data[first_cat].keys())[0]
-            model_count = len(data[first_cat][first_idx].get('models', {}))
-
-    # HTML模板
-    html_content = f'''<!DOCTYPE html>
+# 静态模板段拆成模块常量，生成时流式写盘，不再拼接整页字符串
+_PROLOGUE = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -44,92 +40,107 @@ def generate_html(data):
     <title>Multi-IF 评测结果对比 (完整对话历史)</title>
     <style>
         /* 基础重置 */
-        * {{
+        * {
             box-sizing: border-box;
             margin: 0;
             padding: 0;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
             line-height: 1.6;
             color: #333;
             background-color: #f8f9fa;
             padding: 10px;
             min-height: 100vh;
-        }}
+        }
 
-        .app-header {{
+        .app-header {
             text-align: center;
             margin-bottom: 20px;
             padding-bottom: 15px;
             border-bottom: 1px solid #dee2e6;
-        }}
+        }
 
-        .app-header h1 {{
+        .app-header h1 {
             font-size: 1.8rem;
             color: #2c3e50;
             margin-bottom: 5px;
-        }}
+        }
 
-        .app-header .stats {{
+        .app-header .stats {
             font-size: 0.9rem;
             color: #7f8c8d;
-        }}
+        }
 
         /* 主容器 */
-        .app-container {{
+        .app-container {
             display: flex;
             flex-direction: column;
             gap: 20px;
             max-width: 1600px;
             margin: 0 auto;
-        }}
+        }
 
         /* 样本列表 */
-        .samples-panel {{
+        .samples-panel {
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.05);
             overflow: hidden;
-        }}
+        }
 
-        .samples-header {{
+        .samples-header {
             padding: 15px;
             background: #f8f9fa;
             border-bottom: 1px solid #dee2e6;
             font-weight: bold;
             color: #2c3e50;
-        }}
+        }
 
-        .samples-list {{
+        .samples-list {
             max-height: 400px;
             overflow-y: auto;
-        }}
+        }
 
-        .sample-item {{
+        /* 固定行高让长列表的滚动布局可预测；contain让浏览器跳过
+           屏幕外行的布局/绘制计算 */
+        .sample-item {
             padding: 12px 15px;
             border-bottom: 1px solid #f1f1f1;
             cursor: pointer;
-            transition: background-color 0.2s;
-        }}
+            height: 72px;
+            box-sizing: border-box;
+            overflow: hidden;
+            contain: content;
+            content-visibility: auto;
+            contain-intrinsic-size: 0 72px;
+        }
 
-        .sample-item:hover {{
+        .sample-item:hover {
             background-color: #f8f9fa;
-        }}
+        }
 
-        .sample-item.active {{
+        /* 过渡动画只给真正有悬停能力的设备，免得几千行在滚动中
+           逐行触发样式重算 */
+        @media (hover: hover) and (pointer: fine) {
+            .sample-item:hover {
+                transition: background-color 0.15s;
+            }
+        }
+
+        .sample-item.active {
             background-color: #e3f2fd;
             border-left: 4px solid #2196f3;
-        }}
+        }
 
-        .sample-category {{
+        .sample-category {
             font-weight: bold;
             color: #2c3e50;
             font-size: 0.9rem;
-        }}
+        }
 
-        .sample-language {{
+        .sample-language {
             font-size: 0.8rem;
             color: #666;
             background: #f0f0f0;
@@ -137,51 +148,51 @@ def generate_html(data):
             border-radius: 10px;
             display: inline-block;
             margin-left: 8px;
-        }}
+        }
 
-        .sample-preview {{
+        .sample-preview {
             font-size: 0.85rem;
             color: #666;
             margin-top: 4px;
             white-space: nowrap;
             overflow: hidden;
             text-overflow: ellipsis;
-        }}
+        }
 
         /* 详情面板 */
-        .detail-panel {{
+        .detail-panel {
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.05);
             overflow: hidden;
-        }}
+        }
 
-        .detail-header {{
+        .detail-header {
             padding: 15px;
             background: #f8f9fa;
             border-bottom: 1px solid #dee2e6;
             font-weight: bold;
             color: #2c3e50;
-        }}
+        }
 
-        .detail-content {{
+        .detail-content {
             padding: 20px;
-        }}
+        }
 
-        .section {{
+        .section {
             margin-bottom: 30px;
-        }}
+        }
 
-        .section-title {{
+        .section-title {
             font-size: 1.1rem;
             font-weight: bold;
             color: #2c3e50;
             margin-bottom: 10px;
             padding-bottom: 5px;
             border-bottom: 2px solid #e9ecef;
-        }}
+        }
 
-        .content-box {{
+        .content-box {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 6px;
@@ -190,109 +201,113 @@ def generate_html(data):
             word-wrap: break-word;
             font-size: 0.95rem;
             line-height: 1.6;
-        }}
+        }
 
-        .message-container {{
+        .message-container {
             margin-bottom: 15px;
-        }}
+        }
 
-        .message-header {{
+        .message-header {
             font-weight: bold;
             margin-bottom: 5px;
             color: #2c3e50;
-        }}
+        }
 
-        .message-user {{
+        .message-user {
             border-left: 4px solid #4caf50;
             padding-left: 10px;
-        }}
+        }
 
-        .message-assistant {{
+        .message-assistant {
             border-left: 4px solid #2196f3;
             padding-left: 10px;
-        }}
+        }
 
-        .turn-section {{
+        .turn-section {
             background: #f8f9fa;
             border: 1px solid #e9ecef;
             border-radius: 6px;
             padding: 15px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .turn-title {{
+        .turn-title {
             font-weight: bold;
             color: #2c3e50;
             margin-bottom: 10px;
             font-size: 1rem;
-        }}
+        }
 
-        .instruction-list {{
+        .instruction-list {
             font-size: 0.85rem;
             color: #666;
             margin-top: 5px;
-        }}
+        }
 
-        .model-outputs {{
+        .model-outputs {
             display: grid;
             grid-template-columns: 1fr;
             gap: 20px;
-        }}
+        }
 
-        .model-card {{
+        /* content-visibility让浏览器跳过屏幕外元素的布局+绘制，
+           intrinsic-size给出占位高度避免滚动条跳动 */
+        .model-card {
             background: white;
             border: 1px solid #e9ecef;
             border-radius: 6px;
             padding: 15px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-        }}
+            content-visibility: auto;
+            contain-intrinsic-size: 0 240px;
+        }
 
-        .model-header {{
+        .model-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 10px;
             padding-bottom: 8px;
             border-bottom: 1px solid #e9ecef;
-        }}
+        }
 
-        .model-name {{
+        .model-name {
             font-weight: bold;
             color: #2c3e50;
             font-size: 1rem;
-        }}
+        }
 
-        .model-language {{
+        .model-language {
             font-size: 0.8rem;
             color: #666;
             background: #e8f4fd;
             padding: 2px 8px;
             border-radius: 12px;
             margin-left: 8px;
-        }}
+        }
 
-        .model-acc {{
+        .model-acc {
             background: #e8f5e9;
             color: #2e7d32;
             padding: 3px 8px;
             border-radius: 12px;
             font-size: 0.85rem;
             font-weight: bold;
-        }}
+        }
 
-        .model-acc.low {{
+        .model-acc.low {
             background: #ffebee;
             color: #c62828;
-        }}
+        }
 
-        .model-prediction {{
+        .model-prediction {
             margin-bottom: 10px;
             font-size: 0.95rem;
             line-height: 1.6;
             white-space: pre-wrap;
-        }}
+        }
 
-        .model-scores {{
+        .model-scores {
             font-size: 0.85rem;
             color: #666;
             background: #f8f9fa;
@@ -300,35 +315,35 @@ def generate_html(data):
             border-radius: 4px;
             border-left: 3px solid #ff9800;
             margin-top: 10px;
-        }}
+        }
 
-        .score-group {{
+        .score-group {
             margin-bottom: 10px;
-        }}
+        }
 
-        .score-group-title {{
+        .score-group-title {
             font-weight: bold;
             margin-bottom: 5px;
             color: #555;
-        }}
+        }
 
-        .score-item {{
+        .score-item {
             display: flex;
             justify-content: space-between;
             margin-bottom: 3px;
             padding-left: 15px;
-        }}
+        }
 
-        .score-name {{
+        .score-name {
             font-weight: 500;
-        }}
+        }
 
-        .score-value {{
+        .score-value {
             font-family: monospace;
-        }}
+        }
 
         /* 元数据信息 */
-        .metadata-info {{
+        .metadata-info {
             font-size: 0.85rem;
             color: #666;
             background: #f0f7ff;
@@ -336,77 +351,81 @@ def generate_html(data):
             border-radius: 4px;
             border-left: 3px solid #9c27b0;
             margin-top: 10px;
-        }}
+        }
 
         /* 移动端适配 */
-        @media (min-width: 768px) {{
-            .app-container {{
+        @media (min-width: 768px) {
+            .app-container {
                 flex-direction: row;
                 height: calc(100vh - 100px);
-            }}
+            }
 
-            .samples-panel {{
+            .samples-panel {
                 width: 350px;
                 height: 100%;
                 display: flex;
                 flex-direction: column;
-            }}
+            }
 
-            .samples-list {{
+            .samples-list {
                 flex: 1;
                 max-height: none;
-            }}
+            }
 
-            .detail-panel {{
+            .detail-panel {
                 flex: 1;
                 height: 100%;
                 overflow-y: auto;
-            }}
+            }
 
-            .model-outputs {{
+            .model-outputs {
                 grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
+            }
+        }
 
-        @media (min-width: 1200px) {{
-            .model-outputs {{
+        @media (min-width: 1200px) {
+            .model-outputs {
                 grid-template-columns: repeat(3, 1fr);
-            }}
-        }}
+            }
+        }
 
         /* 滚动条样式 */
-        ::-webkit-scrollbar {{
+        ::-webkit-scrollbar {
             width: 8px;
-        }}
+        }
 
-        ::-webkit-scrollbar-track {{
+        ::-webkit-scrollbar-track {
             background: #f1f1f1;
-        }}
+        }
 
-        ::-webkit-scrollbar-thumb {{
+        ::-webkit-scrollbar-thumb {
             background: #c1c1c1;
             border-radius: 4px;
-        }}
+        }
 
-        ::-webkit-scrollbar-thumb:hover {{
+        ::-webkit-scrollbar-thumb:hover {
             background: #a8a8a8;
-        }}
+        }
 
         /* 空状态 */
-        .empty-state {{
+        .empty-state {
             text-align: center;
             padding: 40px 20px;
             color: #7f8c8d;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="app-header">
         <h1>Multi-IF 评测结果对比 (完整对话历史)</h1>
         <div class="stats">
-            <span id="stats-categories">{total_categories}</span> 个类别 •
-            <span id="stats-samples">{total_samples}</span> 个样本 •
-            <span id="stats-models">{model_count}</span> 个模型
+            '''
+
+_STATS_SRC = '''<span id="stats-categories">$total_categories</span> 个类别 •
+            <span id="stats-samples">$total_samples</span> 个样本 •
+            <span id="stats-models">$model_count</span> 个模型'''
+
+_BODY_OPEN = '''
         </div>
     </div>
 
@@ -415,11 +434,9 @@ def generate_html(data):
         <div class="samples-panel">
             <div class="samples-header">
                 样本列表
-                <span id="sample-count" style="float: right; font-weight: normal; font-size: 0.9rem;"></span>
-            </div>
-            <div class="samples-list" id="samples-list">
-                <div class="empty-state">正在加载样本...</div>
+                <span id="sample-count" style="float: right; font-weight: normal; font-size: 0.9rem;">$total_samples 个样本</span>
             </div>
+            <div class="samples-list" id="samples-list">$sample_rows</div>
         </div>
 
         <!-- 右侧：详情面板 -->
@@ -436,21 +453,53 @@ def generate_html(data):
         </div>
     </div>
 
-    <!-- 嵌入式JSON数据（安全方式） -->
-    <script type="application/json" id="evaluation-data">
-{json_str_escaped}
-    </script>
+    <!-- 嵌入式JSON数据（安全方式），每个类别一个标签，打开时才解析 -->
+'''
 
+_EPILOGUE = '''
     <script>
-        // 从<script type="application/json">标签加载数据
-        const jsonElement = document.getElementById('evaluation-data');
-        let evaluationData = {{}};
-        try {{
-            evaluationData = JSON.parse(jsonElement.textContent);
-        }} catch (e) {{
-            console.error('解析JSON数据失败:', e);
-            alert('数据加载失败，请检查控制台。');
-        }}
+        // 类别目录和预览索引很小，页面加载时就绪；完整类别数据留在各自的
+        // <script type="application/json">标签里，首次访问该类别才JSON.parse
+        const catIndex = window.__CAT_INDEX__ || [];
+        const keyTable = window.__KEYS__ || null;
+        const _catIdByName = new Map(catIndex.map(c => [c.name, c.id]));
+        const _catCache = new Map();
+
+        // 数据块里的dict被生成器重写成{$k: [键下标], $v: [值]}，键名查
+        // keyTable还原；还原在首次打开类别时做，保持惰性
+        function decodeInterned(node) {
+            if (Array.isArray(node)) {
+                return node.map(decodeInterned);
+            }
+            if (node && typeof node === 'object') {
+                const keys = node.$k;
+                const vals = node.$v;
+                const out = {};
+                for (let i = 0; i < keys.length; i++) {
+                    out[keyTable[keys[i]]] = decodeInterned(vals[i]);
+                }
+                return out;
+            }
+            return node;
+        }
+
+        function loadCategory(name) {
+            let samples = _catCache.get(name);
+            if (samples !== undefined) return samples;
+            const id = _catIdByName.get(name);
+            const el = id ? document.getElementById(id) : null;
+            try {
+                samples = el ? JSON.parse(el.textContent) : {};
+                if (keyTable) {
+                    samples = decodeInterned(samples);
+                }
+            } catch (e) {
+                console.error('解析JSON数据失败:', name, e);
+                samples = {};
+            }
+            _catCache.set(name, samples);
+            return samples;
+        }
 
         // 应用状态
         let currentSample = null;
@@ -461,94 +510,103 @@ def generate_html(data):
         const samplesListEl = document.getElementById('samples-list');
         const detailContentEl = document.getElementById('detail-content');
         const detailTitleEl = document.getElementById('detail-title');
-        const sampleCountEl = document.getElementById('sample-count');
 
-        // 文本转义函数，防止XSS
-        function escapeHtml(text) {{
+        // 文本转义函数，防止XSS。正则+查表替代临时<div>（省掉每次调用的DOM
+        // 分配和序列化往返）；类别名/模型名/语言码等短串高度重复，用Map记忆
+        const _ESC = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        const _ESC_RE = /[&<>"']/g;
+        const _ESC_CACHE = new Map();
+        function escapeHtml(text) {
             if (text === null || text === undefined) return '';
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }}
+            if (typeof text !== 'string') text = String(text);
+            const cached = _ESC_CACHE.get(text);
+            if (cached !== undefined) return cached;
+            const result = text.replace(_ESC_RE, ch => _ESC[ch]);
+            if (text.length < 64) {
+                if (_ESC_CACHE.size > 4096) _ESC_CACHE.clear();
+                _ESC_CACHE.set(text, result);
+            }
+            return result;
+        }
 
         // 格式化对话历史
-        function formatMessages(messages) {{
-            if (!messages || messages.length === 0) {{
+        function formatMessages(messages) {
+            if (!messages || messages.length === 0) {
                 return '<div class="empty-state">无对话历史</div>';
-            }}
+            }
 
-            let html = '<div class="section">';
-            html += '<div class="section-title">完整对话历史</div>';
+            const parts = ['<div class="section">',
+                           '<div class="section-title">完整对话历史</div>'];
 
-            messages.forEach((msg, idx) => {{
+            messages.forEach((msg, idx) => {
                 const role = msg.role || 'unknown';
                 const content = msg.content || '';
                 const roleClass = role === 'user' ? 'message-user' : 'message-assistant';
                 const roleText = role === 'user' ? '用户' : '助手';
 
-                html += `
-                    <div class="message-container ${{roleClass}}">
-                        <div class="message-header">${{roleText}} (消息 #${{idx + 1}})</div>
-                        <div class="content-box">${{escapeHtml(content)}}</div>
+                parts.push(`
+                    <div class="message-container ${roleClass}">
+                        <div class="message-header">${roleText} (消息 #${idx + 1})</div>
+                        <div class="content-box">${escapeHtml(content)}</div>
                     </div>
-                `;
-            }});
+                `);
+            });
 
-            html += '</div>';
-            return html;
-        }}
+            parts.push('</div>');
+            return parts.join('');
+        }
 
         // 格式化轮次信息（从step_record）
-        function formatTurnInfo(metadata) {{
+        function formatTurnInfo(metadata) {
             if (!metadata) return '';
 
             const stepRecord = metadata.step_record;
-            if (!stepRecord || Object.keys(stepRecord).length === 0) {{
+            if (!stepRecord || Object.keys(stepRecord).length === 0) {
                 return '';
-            }}
+            }
 
-            let html = '<div class="section">';
-            html += '<div class="section-title">对话轮次详情</div>';
+            const parts = ['<div class="section">',
+                           '<div class="section-title">对话轮次详情</div>'];
 
             // 按步骤顺序显示
             const steps = Object.keys(stepRecord).sort((a, b) => parseInt(a) - parseInt(b));
 
-            steps.forEach(stepNum => {{
+            steps.forEach(stepNum => {
                 const stepData = stepRecord[stepNum];
                 const prompt = stepData.prompt || '';
                 const response = stepData.response || '';
                 const instructions = stepData.instruction_id_list || [];
                 const kwargs = stepData.kwargs || [];
 
-                html += `
+                parts.push(`
                     <div class="turn-section">
-                        <div class="turn-title">第 ${{stepNum}} 轮</div>
+                        <div class="turn-title">第 ${stepNum} 轮</div>
                         <div class="content-box" style="margin-bottom: 10px;">
                             <strong>提示词:</strong><br>
-                            ${{escapeHtml(prompt)}}
+                            ${escapeHtml(prompt)}
                         </div>
                         <div class="content-box" style="margin-bottom: 10px;">
                             <strong>模型回复:</strong><br>
-                            ${{escapeHtml(response)}}
+                            ${escapeHtml(response)}
                         </div>
                         <div class="instruction-list">
-                            <strong>指令列表:</strong> ${{escapeHtml(JSON.stringify(instructions))}}<br>
-                            <strong>参数:</strong> ${{escapeHtml(JSON.stringify(kwargs))}}
+                            <strong>指令列表:</strong> ${escapeHtml(JSON.stringify(instructions))}<br>
+                            <strong>参数:</strong> ${escapeHtml(JSON.stringify(kwargs))}
                         </div>
                     </div>
-                `;
-            }});
+                `);
+            });
 
-            html += '</div>';
-            return html;
-        }}
+            parts.push('</div>');
+            return parts.join('');
+        }
 
         // 格式化元数据信息
-        function formatMetadata(metadata) {{
+        function formatMetadata(metadata) {
             if (!metadata) return '';
 
-            let html = '<div class="section">';
-            html += '<div class="section-title">元数据信息</div>';
+            const parts = ['<div class="section">',
+                           '<div class="section-title">元数据信息</div>'];
 
             const infoItems = [
                 ['语言', metadata.language],
@@ -557,229 +615,411 @@ def generate_html(data):
             ];
 
             // 显示turn prompts
-            for (let i = 1; i <= 3; i++) {{
-                const turnKey = `turn_${{i}}_prompt`;
-                if (metadata[turnKey]) {{
-                    infoItems.push([`Turn ${{i}} Prompt`, metadata[turnKey]]);
-                }}
-            }}
-
-            html += '<div class="metadata-info">';
-            infoItems.forEach(([label, value]) => {{
-                if (value !== undefined && value !== null) {{
-                    html += `<div><strong>${{label}}:</strong> ${{escapeHtml(String(value))}}</div>`;
-                }}
-            }});
-            html += '</div></div>';
-
-            return html;
-        }}
+            for (let i = 1; i <= 3; i++) {
+                const turnKey = `turn_${i}_prompt`;
+                if (metadata[turnKey]) {
+                    infoItems.push([`Turn ${i} Prompt`, metadata[turnKey]]);
+                }
+            }
+
+            parts.push('<div class="metadata-info">');
+            infoItems.forEach(([label, value]) => {
+                if (value !== undefined && value !== null) {
+                    parts.push(`<div><strong>${label}:</strong> ${escapeHtml(String(value))}</div>`);
+                }
+            });
+            parts.push('</div></div>');
+
+            return parts.join('');
+        }
 
         // 格式化评分显示（按turn分组）
-        function formatScores(allScores) {{
+        function formatScores(allScores) {
             if (!allScores) return '';
 
             // 按turn分组
-            const turnGroups = {{}};
-            for (const [scoreName, scoreValue] of Object.entries(allScores)) {{
+            const turnGroups = {};
+            for (const [scoreName, scoreValue] of Object.entries(allScores)) {
                 const match = scoreName.match(/^turn_(\\d+)_/);
                 const turn = match ? match[1] : 'other';
 
-                if (!turnGroups[turn]) {{
+                if (!turnGroups[turn]) {
                     turnGroups[turn] = [];
-                }}
-                turnGroups[turn].push({{name: scoreName, value: scoreValue}});
-            }}
+                }
+                turnGroups[turn].push({name: scoreName, value: scoreValue});
+            }
 
-            let html = '<div class="model-scores">';
-            html += '<div style="font-weight: bold; margin-bottom: 5px;">详细评分:</div>';
+            const parts = ['<div class="model-scores">',
+                           '<div style="font-weight: bold; margin-bottom: 5px;">详细评分:</div>'];
 
             // 按turn顺序显示
-            const sortedTurns = Object.keys(turnGroups).sort((a, b) => {{
+            const sortedTurns = Object.keys(turnGroups).sort((a, b) => {
                 if (a === 'other') return 1;
                 if (b === 'other') return -1;
                 return parseInt(a) - parseInt(b);
-            }});
+            });
 
-            for (const turn of sortedTurns) {{
-                const turnName = turn === 'other' ? '其他' : `第 ${{turn}} 轮`;
-                html += `
+            for (const turn of sortedTurns) {
+                const turnName = turn === 'other' ? '其他' : `第 ${turn} 轮`;
+                parts.push(`
                     <div class="score-group">
-                        <div class="score-group-title">${{turnName}}</div>
-                `;
+                        <div class="score-group-title">${turnName}</div>
+                `);
 
-                turnGroups[turn].forEach(score => {{
-                    html += `
+                turnGroups[turn].forEach(score => {
+                    parts.push(`
                         <div class="score-item">
-                            <span class="score-name">${{score.name}}:</span>
-                            <span class="score-value">${{score.value.toFixed(4)}}</span>
+                            <span class="score-name">${score.name}:</span>
+                            <span class="score-value">${score.value.toFixed(4)}</span>
                         </div>
-                    `;
-                }});
-
-                html += '</div>';
-            }}
-
-            html += '</div>';
-            return html;
-        }}
-
-        // 初始化
-        function init() {{
-            renderSamplesList();
-            // 默认选择第一个样本
-            if (Object.keys(evaluationData).length > 0) {{
-                const firstCategory = Object.keys(evaluationData)[0];
-                const firstIndex = Object.keys(evaluationData[firstCategory])[0];
-                selectSample(firstCategory, parseInt(firstIndex));
-            }}
-        }}
-
-        // 渲染样本列表
-        function renderSamplesList() {{
-            samplesListEl.innerHTML = '';
-
-            let sampleCount = 0;
-
-            // 按类别和索引排序
-            const categories = Object.keys(evaluationData).sort();
-
-            for (const category of categories) {{
-                const indices = Object.keys(evaluationData[category]).sort((a, b) => parseInt(a) - parseInt(b));
-
-                for (const index of indices) {{
-                    const sample = evaluationData[category][index];
-                    const messages = sample.messages || [];
-                    const language = sample.language || 'unknown';
-
-                    // 生成预览文本（从第一个用户消息）
-                    let previewText = '';
-                    if (messages.length > 0) {{
-                        const firstUserMsg = messages.find(msg => msg.role === 'user');
-                        if (firstUserMsg) {{
-                            previewText = firstUserMsg.content.substring(0, 80);
-                        }}
-                    }}
-
-                    const itemEl = document.createElement('div');
-                    itemEl.className = 'sample-item';
-                    itemEl.dataset.category = category;
-                    itemEl.dataset.index = index;
-                    itemEl.innerHTML = `
-                        <div class="sample-category">
-                            ${{escapeHtml(category)}} #${{escapeHtml(index)}}
-                            <span class="sample-language">${{escapeHtml(language)}}</span>
-                        </div>
-                        <div class="sample-preview" title="${{escapeHtml(previewText)}}">${{escapeHtml(previewText)}}...</div>
-                    `;
-
-                    itemEl.addEventListener('click', () => {{
-                        selectSample(category, parseInt(index));
-                    }});
-
-                    samplesListEl.appendChild(itemEl);
-                    sampleCount++;
-                }}
-            }}
-
-            sampleCountEl.textContent = `${{sampleCount}} 个样本`;
-
-            if (sampleCount === 0) {{
+                    `);
+                });
+
+                parts.push('</div>');
+            }
+
+            parts.push('</div>');
+            return parts.join('');
+        }
+
+        // 初始化：列表行已由生成器直接写进HTML，这里只选中第一行
+        function init() {
+            const first = samplesListEl.querySelector('.sample-item');
+            if (first) {
+                selectSample(first.dataset.category, parseInt(first.dataset.index));
+            } else {
                 samplesListEl.innerHTML = '<div class="empty-state">没有找到样本数据</div>';
-            }}
-        }}
+            }
+        }
+
+        // 整个列表只挂一个委托监听器
+        samplesListEl.addEventListener('click', (e) => {
+            const item = e.target.closest('.sample-item');
+            if (item) {
+                selectSample(item.dataset.category, parseInt(item.dataset.index));
+            }
+        });
 
         // 选择样本
-        function selectSample(category, index) {{
+        function selectSample(category, index) {
             // 更新当前选中状态
             currentCategory = category;
             currentIndex = index;
-            currentSample = evaluationData[category][index];
+            currentSample = loadCategory(category)[index];
 
-            // 更新列表项选中状态
-            document.querySelectorAll('.sample-item').forEach(item => {{
-                item.classList.remove('active');
-                if (item.dataset.category === category && item.dataset.index === index.toString()) {{
-                    item.classList.add('active');
-                }}
-            }});
+            // 更新列表选中态：只碰旧行和新行两个节点
+            const prev = samplesListEl.querySelector('.sample-item.active');
+            if (prev) prev.classList.remove('active');
+            const next = samplesListEl.querySelector(
+                `.sample-item[data-category="${CSS.escape(category)}"][data-index="${index}"]`);
+            if (next) next.classList.add('active');
 
             // 渲染详情
             renderSampleDetail();
-        }}
+        }
+
+        // 详情HTML按样本缓存，重复点击同一样本不再重建模型卡片；
+        // 超出上限时按插入顺序淘汰最早的条目
+        const _detailCache = new Map();
+        const _DETAIL_CACHE_MAX = 200;
 
         // 渲染样本详情
-        function renderSampleDetail() {{
+        function renderSampleDetail() {
             if (!currentSample) return;
 
+            const cacheKey = `${currentCategory}\\x00${currentIndex}`;
+
             const messages = currentSample.messages || [];
-            const metadata = currentSample.metadata || {{}};
-            const models = currentSample.models || {{}};
+            const metadata = currentSample.metadata || {};
+            const models = currentSample.models || {};
             const language = currentSample.language || 'unknown';
             const key = currentSample.key || 'unknown';
 
-            detailTitleEl.textContent = `${{escapeHtml(currentCategory)}} #${{escapeHtml(currentIndex.toString())}} (${{escapeHtml(language)}})`;
+            detailTitleEl.textContent = `${escapeHtml(currentCategory)} #${escapeHtml(currentIndex.toString())} (${escapeHtml(language)})`;
+
+            const cached = _detailCache.get(cacheKey);
+            if (cached !== undefined) {
+                detailContentEl.innerHTML = cached;
+                return;
+            }
 
             // 构建模型输出HTML
-            let modelsHTML = '';
+            const modelParts = [];
             const modelEntries = Object.entries(models);
 
-            for (const [modelName, modelData] of modelEntries) {{
+            for (const [modelName, modelData] of modelEntries) {
                 const prediction = modelData.prediction || '';
                 const acc = modelData.acc || 0.0;
                 const explanation = modelData.explanation || '';
-                const allScores = modelData.all_scores || {{}};
+                const allScores = modelData.all_scores || {};
                 const modelLanguage = modelData.language || 'unknown';
 
                 // 根据评分设置CSS类
                 const accClass = acc >= 0.5 ? 'model-acc' : 'model-acc low';
 
-                modelsHTML += `
+                modelParts.push(`
                     <div class="model-card">
                         <div class="model-header">
                             <div style="display: flex; align-items: center;">
-                                <div class="model-name">${{escapeHtml(modelName)}}</div>
-                                <span class="model-language">${{escapeHtml(modelLanguage)}}</span>
+                                <div class="model-name">${escapeHtml(modelName)}</div>
+                                <span class="model-language">${escapeHtml(modelLanguage)}</span>
                             </div>
-                            <div class="${{accClass}}">评分: ${{acc.toFixed(4)}}</div>
+                            <div class="${accClass}">评分: ${acc.toFixed(4)}</div>
                         </div>
-                        <div class="model-prediction">${{escapeHtml(prediction)}}</div>
-                        ${{formatScores(allScores)}}
+                        <div class="model-prediction">${escapeHtml(prediction)}</div>
+                        ${formatScores(allScores)}
                     </div>
-                `;
-            }}
-
-            // 构建完整详情HTML
-            let detailHTML = '';
-
-            // 1. 元数据信息
-            detailHTML += formatMetadata(metadata);
-
-            // 2. 对话历史
-            detailHTML += formatMessages(messages);
-
-            // 3. 轮次信息
-            detailHTML += formatTurnInfo(metadata);
-
-            // 4. 模型输出
-            detailHTML += `
+                `);
+            }
+
+            // 构建完整详情HTML：元数据、对话历史、轮次信息、模型输出
+            const detailHTML = [
+                formatMetadata(metadata),
+                formatMessages(messages),
+                formatTurnInfo(metadata),
+                `
                 <div class="section">
-                    <div class="section-title">模型输出 (${{modelEntries.length}} 个模型)</div>
+                    <div class="section-title">模型输出 (${modelEntries.length} 个模型)</div>
                     <div class="model-outputs">
-                        ${{modelsHTML}}
+                        ${modelParts.join('')}
                     </div>
                 </div>
-            `;
+            `,
+            ].join('');
+
+            if (_detailCache.size >= _DETAIL_CACHE_MAX) {
+                _detailCache.delete(_detailCache.keys().next().value);
+            }
+            _detailCache.set(cacheKey, detailHTML);
 
             detailContentEl.innerHTML = detailHTML;
-        }}
+        }
 
         // 页面加载完成后初始化
         document.addEventListener('DOMContentLoaded', init);
     </script>
 </body>
 </html>'''
-    return html_content
+
+# 脚本安全转义表：<防止</script>/<!--提前终结标签，&防御保守起见一并转义，
+# U+2028/U+2029在JS源码语境是行终结符；替换目标都是合法的JSON转义序列，
+# str.translate一趟C循环完成，替代原先html.escape+两次replace的多趟扫描
+_JSON_SCRIPT_TABLE = str.maketrans({
+    '<': '\\u003c',
+    '&': '\\u0026',
+    '\u2028': '\\u2028',
+    '\u2029': '\\u2029',
+})
+
+# 数据标签之前的整个页面外壳编译成一个string.Template：占位符在import时
+# 解析完，每次调用只剩一趟substitute正则替换，$语法也不用给CSS/JS里的
+# 花括号做{{转义。外壳之外的静态尾段在import时编码一次
+_SHELL_TMPL = string.Template(_PROLOGUE + _STATS_SRC + _BODY_OPEN)
+_EPILOGUE_B = _EPILOGUE.encode('utf-8')
+
+# U+2028/U+2029的UTF-8字节序列
+_LS_B = '\u2028'.encode('utf-8')
+_PS_B = '\u2029'.encode('utf-8')
+
+def _escape_blob(blob):
+    """对UTF-8编码的JSON字节串做脚本安全转义。
+
+    多字节替换目标放不进bytes.translate的单字节表，用bytes.replace的
+    C循环完成；不含特殊字节的串直接原样返回，接近memcpy的速度。
+    """
+    if (b'<' not in blob and b'&' not in blob
+            and _LS_B not in blob and _PS_B not in blob):
+        return blob
+    return (blob.replace(b'&', b'\\u0026')
+                .replace(b'<', b'\\u003c')
+                .replace(_LS_B, b'\\u2028')
+                .replace(_PS_B, b'\\u2029'))
+
+class ScriptSafeWriter:
+    """包装二进制文件对象，json.dump的输出转义+编码后直接流进<script>标签"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, s):
+        self.f.write(s.translate(_JSON_SCRIPT_TABLE).encode('utf-8'))
+
+def _category_previews(samples):
+    """单个类别的排序索引、预览文本（首条用户消息前80字符）和语言标签"""
+    return sorted(
+        ((int(i),
+          next((m['content'] for m in s.get('messages', [])
+                if m.get('role') == 'user'), '')[:80],
+          s.get('language', 'unknown'))
+         for i, s in samples.items()),
+        key=lambda t: t[0])
+
+def render_sample_rows(previews, names):
+    """在生成期直接产出样本列表的HTML行。
+
+    列表内容由输入数据唯一决定，没有理由留给浏览器跑O(N)的渲染循环；
+    JS侧只剩事件委托和详情渲染。names给出与数据块一致的类别顺序。
+    """
+    esc = html.escape
+    parts = []
+    for cat in names:
+        cat_esc = esc(cat)
+        for idx, preview, lang in previews[cat]:
+            preview_esc = esc(preview)
+            parts.append(
+                '<div class="sample-item" data-category="%s" data-index="%d">'
+                '<div class="sample-category">%s #%d'
+                '<span class="sample-language">%s</span></div>'
+                '<div class="sample-preview" title="%s">%s...</div></div>'
+                % (cat_esc, idx, cat_esc, idx, esc(lang),
+                   preview_esc, preview_esc))
+    return ''.join(parts)
+
+def build_previews(data):
+    """预计算全部类别的预览索引。
+
+    这些原来在浏览器里每次渲染列表都做一遍：逐样本find用户消息、逐类别
+    sort索引。放到生成期只算一次，列表渲染不需要碰完整的类别数据。
+    """
+    return {cat: _category_previews(idxs) for cat, idxs in data.items()}
+
+def generate_html_to(f, data):
+    """把HTML流式写入二进制文件对象，JSON转义在字节层完成"""
+    # 统计信息
+    total_categories = len(data)
+    # map(len)免去生成器逐项的帧切换；探测model_count只看第一个样本，
+    # 用迭代器取首元素即可，不必list()物化整个键视图
+    total_samples = sum(map(len, data.values()))
+    model_count = 0
+    for indices in data.values():
+        for sample in indices.values():
+            model_count = len(sample.get('models', {}))
+            break
+        break
+
+    previews = build_previews(data)
+    names = sorted(data)
+    f.write(_SHELL_TMPL.substitute(
+        total_categories=total_categories,
+        total_samples=total_samples,
+        model_count=model_count,
+        sample_rows=render_sample_rows(previews, names)).encode('utf-8'))
+
+    # 每个类别单独一个JSON标签：浏览器首屏不解析任何类别数据，
+    # 等到首次打开其中的样本时才JSON.parse
+    cat_index = []
+    key_table = _KeyInterner()
+    for i, cat in enumerate(names):
+        blob_id = 'cat-%d' % i
+        cat_index.append({'id': blob_id, 'name': cat, 'count': len(data[cat])})
+        _write_category_blob(f, blob_id, data[cat], key_table)
+
+    _write_tail(f, cat_index, key_table)
+
+# 前端只读这些字段，其余键不值得让浏览器解析和驻留内存
+_META_KEEP = {'language', 'key', 'turn_index', 'step_record',
+              'turn_1_prompt', 'turn_2_prompt', 'turn_3_prompt'}
+_MODEL_KEEP = {'prediction', 'acc', 'all_scores', 'language', 'explanation'}
+
+def _project_samples(samples):
+    """序列化前裁掉JS不会读取的字段，HTML体积随之等比缩小"""
+    return {
+        i: {
+            'messages': s.get('messages', []),
+            'language': s.get('language'),
+            'key': s.get('key'),
+            'metadata': {k: v for k, v in s.get('metadata', {}).items()
+                         if k in _META_KEEP},
+            'models': {mn: {k: v for k, v in m.items() if k in _MODEL_KEEP}
+                       for mn, m in s.get('models', {}).items()},
+        }
+        for i, s in samples.items()
+    }
+
+class _KeyInterner(dict):
+    """字符串→下标的驻留表，首次见到的键自动分配下一个下标"""
+
+    def __missing__(self, key):
+        idx = len(self)
+        self[key] = idx
+        return idx
+
+def _intern_keys(o, table):
+    """把dict重写成{'$k': [键下标], '$v': [值]}的紧凑形式。
+
+    评分键名、模型名这类字符串在payload里重复成千上万次，换成驻留表
+    下标后每次出现只占一两个字符；浏览器端首次打开类别时还原。
+    """
+    if isinstance(o, dict):
+        return {'$k': [table[k] for k in o],
+                '$v': [_intern_keys(v, table) for v in o.values()]}
+    if isinstance(o, list):
+        return [_intern_keys(x, table) for x in o]
+    return o
+
+def _write_category_blob(f, blob_id, samples, key_table):
+    """写出一个类别的<script type="application/json">数据块"""
+    samples = _intern_keys(_project_samples(samples), key_table)
+    f.write(('    <script type="application/json" id="%s">\n' % blob_id)
+            .encode('ascii'))
+    if orjson is not None:
+        # orjson直接产出UTF-8字节串，转义留在字节层做
+        f.write(_escape_blob(orjson.dumps(samples)))
+    else:
+        # 紧凑分隔符省掉每个键/元素后的空格；数据是刚加载的JSON树不
+        # 可能有环，关掉循环检查省去编码器逐容器的id()记录
+        json.dump(samples, ScriptSafeWriter(f), ensure_ascii=False,
+                  separators=(',', ':'), check_circular=False)
+    f.write(b'\n    </script>\n')
+
+def _write_tail(f, cat_index, key_table):
+    """写出目录/键驻留表（都很小，直接作为JS全局内联）和静态尾段"""
+    index_json = _escape_blob(json.dumps(
+        cat_index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    # dict保持插入序，list(key_table)就是按下标排列的键表
+    keys_json = _escape_blob(json.dumps(
+        list(key_table), ensure_ascii=False,
+        separators=(',', ':')).encode('utf-8'))
+    f.writelines((b'    <script>window.__CAT_INDEX__ = ', index_json,
+                  b'; window.__KEYS__ = ', keys_json,
+                  b';</script>\n', _EPILOGUE_B))
+
+def generate_html_streaming(f, json_path):
+    """两遍流式生成：第一遍只算统计和预览索引，第二遍逐类别转储。
+
+    峰值内存是单个类别的大小而不是整份数据集；代价是输入文件顺序读两遍，
+    远比把几百MB的JSON建成完整的Python对象树便宜。类别按文件内顺序写出。
+    """
+    total_samples = 0
+    model_count = 0
+    previews = {}
+    # use_float=True让ijson产出float而不是Decimal，否则acc这类
+    # 浮点评分在后面dump时直接TypeError
+    with open(json_path, 'rb') as jf:
+        for cat, samples in ijson.kvitems(jf, '', use_float=True):
+            total_samples += len(samples)
+            if not model_count:
+                for sample in samples.values():
+                    model_count = len(sample.get('models', {}))
+                    break
+            previews[cat] = _category_previews(samples)
+
+    f.write(_SHELL_TMPL.substitute(
+        total_categories=len(previews),
+        total_samples=total_samples,
+        model_count=model_count,
+        sample_rows=render_sample_rows(previews, list(previews))).encode('utf-8'))
+
+    cat_index = []
+    key_table = _KeyInterner()
+    with open(json_path, 'rb') as jf:
+        for i, (cat, samples) in enumerate(
+                ijson.kvitems(jf, '', use_float=True)):
+            blob_id = 'cat-%d' % i
+            cat_index.append({'id': blob_id, 'name': cat, 'count': len(samples)})
+            _write_category_blob(f, blob_id, samples, key_table)
+
+    _write_tail(f, cat_index, key_table)
 
 def main():
     json_path = "integrated_multi_if_v2.json"
@@ -790,17 +1030,29 @@ def main():
         print("请先运行 integrate_multi_if_v2.py 生成整合数据", file=sys.stderr)
         sys.exit(1)
 
-    print("正在加载JSON数据...")
-    data = load_json_data(json_path)
-
     print("正在生成HTML文件...")
-    html_content = generate_html(data)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # 先写临时文件，完整生成后再原子替换：中途崩溃不会把上一份
+    # 可用的HTML换成截断的半成品
+    tmp_path = output_path + '.tmp'
+    # 1MiB写缓冲把几千次小片段write聚成少量大syscall
+    with open(tmp_path, 'wb', buffering=1 << 20) as f:
+        if ijson is not None:
+            # 流式路径不把整份JSON建成dict
+            generate_html_streaming(f, json_path)
+        else:
+            print("正在加载JSON数据...")
+            generate_html_to(f, load_json_data(json_path))
+    os.replace(tmp_path, output_path)
+
+    # 顺手产出gzip副本：JSON里重复的评分键名压得极好，HTTP服务器可以
+    # 直接把.gz当预压缩静态资源下发；本地file://浏览仍用未压缩的原件
+    with open(output_path, 'rb') as fi, \
+            gzip.open(output_path + '.gz', 'wb', compresslevel=6) as fo:
+        shutil.copyfileobj(fi, fo, 1 << 20)
 
     print(f"HTML文件已生成: {output_path}")
-    print(f"文件大小: {os.path.getsize(output_path) // 1024} KB")
+    print(f"文件大小: {os.path.getsize(output_path) // 1024} KB "
+          f"(gzip副本 {os.path.getsize(output_path + '.gz') // 1024} KB)")
     print("请在浏览器中打开此文件查看完整的对话历史和评测指标。")
 
 if __name__ == "__main__":
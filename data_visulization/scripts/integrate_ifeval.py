@@ -4,12 +4,84 @@
 """
 
 import json
+import mmap
 import glob
 import os
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import simdjson
+
+    # 单个Parser实例复用到所有文件；parse返回的惰性代理在下一次
+    # parse前必须全部消亡，否则直接抛RuntimeError，所以这里每行
+    # 立即整体物化成普通dict，不把代理漏给调用方
+    _parser = simdjson.Parser()
+
+    def _loads(buf, _parse=_parser.parse):
+        return _parse(buf).as_dict()
+except ImportError:
+    simdjson = None
+
+def _materialize(value):
+    """把simdjson惰性对象转成普通dict/list；普通对象原样返回"""
+    return value.as_dict() if hasattr(value, 'as_dict') else value
+
+_MISS = object()  # 评分查找的哨兵，区分"键不存在"和合法的None/0值
+
+# 缺省字段共享同一个空dict，避免每行一次的空容器分配；下游只读不改
+_EMPTY_DICT = {}
+
+def _iter_lines(buf):
+    """沿b'\\n'游走切分mmap/bytes的行；切片只在取行时做单行拷贝"""
+    start = 0
+    size = len(buf)
+    find = buf.find
+    while start < size:
+        nl = find(b'\n', start)
+        end = size if nl < 0 else nl
+        yield buf[start:end]
+        start = end + 1
+
+try:
+    import msgspec
+    from typing import Optional
+
+    # 行结构固定且浅，msgspec按Struct模式编译C级解码器：跳过未知
+    # 字段、顺带校验类型，已知模式下通常比通用JSON解析器更快
+    class _Score(msgspec.Struct, kw_only=True):
+        extracted_prediction: Optional[str] = None
+        prediction: str = ""
+        value: dict = {}
+        # 真实数据里judge解释可能整个为null，必须容忍
+        explanation: Optional[str] = ""
+        metadata: Optional[dict] = {}
+        main_score_name: str = "prompt_level_strict"
+
+    class _SampleScore(msgspec.Struct, kw_only=True):
+        score: _Score = msgspec.field(default_factory=_Score)
+
+    class _Row(msgspec.Struct, kw_only=True):
+        index: Optional[int] = None
+        input: str = ""
+        target: str = ""
+        sample_score: _SampleScore = msgspec.field(default_factory=_SampleScore)
+
+    _decode_row = msgspec.json.Decoder(_Row).decode
+except ImportError:
+    msgspec = None
+    _decode_row = None
+
 # 模型目录列表（六个模型）
 MODEL_DIRS = [
     "deepseek-reasoner-v3.2",
@@ -20,6 +92,151 @@ MODEL_DIRS = [
     "qwen-plus"
 ]
 
+def parse_one(task):
+    """解析单个(model, filepath)文件，返回可序列化的行记录列表。
+
+    作为进程池的工作函数必须是模块级函数才能被pickle；返回原始元组
+    而不是共享的defaultdict，合并留在主进程做O(行数)的dict插入。
+    """
+    model, filepath, want_sample_fields = task
+    category = "ifeval"  # 固定类别名称
+    rows = []
+    rows_append = rows.append  # 绑定成局部变量，省每行一次的属性查找
+
+    with open(filepath, 'rb') as f:
+        try:
+            # mmap借操作系统页缓存直接取字节，省掉read()的整文件拷贝
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b""  # 空文件无法映射
+
+    if _decode_row is not None:
+        # 类型化解码路径：字段直接按属性访问，没有dict查找开销，
+        # 解析出的就是普通Python对象，无需再物化
+        for line_num, line in enumerate(_iter_lines(buf), 1):
+            if not line or line == b'\r':
+                continue
+            try:
+                row = _decode_row(line)
+            except ValueError as e:
+                print(f"错误：文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
+                continue
+
+            index = row.index
+            if index is None:
+                print(f"警告：文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
+                continue
+
+            if want_sample_fields:
+                input_text = row.input
+                target_text = row.target
+            else:
+                input_text = target_text = ""
+
+            score = row.sample_score.score
+            prediction = score.extracted_prediction
+            if prediction is None:
+                prediction = score.prediction
+
+            value_dict = score.value
+            acc = value_dict.get(score.main_score_name, _MISS)
+            if acc is _MISS:
+                acc = value_dict.get("prompt_level_strict", _MISS)
+            if acc is _MISS:
+                acc = next(iter(value_dict.values()), 0.0)
+
+            rows_append((category, index, model, input_text, target_text, {
+                "prediction": prediction,
+                "acc": acc,
+                "explanation": score.explanation,
+                "metadata": score.metadata,
+                "all_scores": value_dict
+            }))
+
+        return rows
+
+    # 沿换行符游走切行；JSON解析器本身容忍残留的行尾ASCII空白
+    for line_num, line in enumerate(_iter_lines(buf), 1):
+        if not line or line == b'\r':
+            continue
+        try:
+            data = _loads(line)
+        except ValueError as e:
+            print(f"错误：文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
+            continue
+
+        index = data.get("index")
+        if index is None:
+            print(f"警告：文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
+            continue
+
+        if want_sample_fields:
+            input_text = data.get("input", "")
+            target_text = data.get("target", "")
+        else:
+            # 合并时input/target只取首个模型，后续模型的副本本来就会被
+            # 丢弃；不提取就省掉每行一次的大字符串物化和进程间传输
+            input_text = target_text = ""
+
+        # 获取模型输出
+        sample_score = data.get("sample_score", _EMPTY_DICT)
+        score = sample_score.get("score", _EMPTY_DICT)
+        # 优先使用extracted_prediction，其次使用prediction
+        prediction = score.get("extracted_prediction")
+        if prediction is None:
+            prediction = score.get("prediction", "")
+
+        # 获取评分
+        value_dict = score.get("value", _EMPTY_DICT)
+        main_score_name = score.get("main_score_name", "prompt_level_strict")
+
+        # 先按main_score_name取，再退到prompt_level_strict；
+        # 哨兵让每级只做一次哈希查找，两参next免掉建迭代器前的真值判断
+        acc = value_dict.get(main_score_name, _MISS)
+        if acc is _MISS:
+            acc = value_dict.get("prompt_level_strict", _MISS)
+        if acc is _MISS:
+            # 取第一个可用的评分
+            acc = next(iter(value_dict.values()), 0.0)
+
+        explanation = score.get("explanation", "")
+        metadata = score.get("metadata", _EMPTY_DICT)
+
+        rows_append((category, index, model, input_text, target_text, {
+            "prediction": prediction,
+            "acc": acc,
+            "explanation": explanation,
+            "metadata": _materialize(metadata),
+            "all_scores": _materialize(value_dict)  # 存储所有评分供参考
+        }))
+
+    return rows
+
+def _merge_rows(integrated, models_maps, rows):
+    """把一个文件的解析结果合并进整合结构；input/target以首个模型为准"""
+    if not rows:
+        return
+    # 一个文件只对应一个(类别, 模型)。经进程池传回的字符串失去了
+    # intern，重新驻留后同键的字典操作先命中指针比较；类别字典和
+    # 它的get照旧提到循环外。index由解析器产出，本来就是int
+    category = sys.intern(rows[0][0])
+    model = sys.intern(rows[0][2])
+    cat_dict = integrated[category]
+    # models_maps与integrated平行，直接记各index的models子dict，
+    # 省掉每行对"models"键的重复哈希
+    cat_models = models_maps.setdefault(category, {})
+    models_get = cat_models.get
+    for _, index, _, input_text, target_text, entry in rows:
+        models = models_get(index)
+        if models is None:
+            models = cat_models[index] = {}
+            cat_dict[index] = {
+                "input": input_text,
+                "target": target_text,
+                "models": models
+            }
+        models[model] = entry
+
 def integrate_data(base_path="data_process/eval_result/reviews"):
     """
     整合所有模型的数据。
@@ -41,11 +258,8 @@ def integrate_data(base_path="data_process/eval_result/reviews"):
         }
     }
     """
-    integrated = defaultdict(lambda: defaultdict(dict))
-    # 存储每个index的input和target（从第一个模型读取）
-    input_target_cache = {}
-    category = "ifeval"  # 固定类别名称
-
+    tasks = []
+    log_lines = []
     for model in MODEL_DIRS:
         model_path = os.path.join(base_path, model)
         if not os.path.exists(model_path):
@@ -58,75 +272,64 @@ def integrate_data(base_path="data_process/eval_result/reviews"):
             print(f"警告：模型 {model} 中没有找到ifeval_default.jsonl文件", file=sys.stderr)
             continue
 
-        print(f"处理 {model} - ifeval")
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError as e:
-                    print(f"错误：文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
-                    continue
-
-                index = data.get("index")
-                if index is None:
-                    print(f"警告：文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
-                    continue
-
-                # 获取input和target（如果尚未缓存）
-                key = (category, index)
-                if key not in input_target_cache:
-                    input_text = data.get("input", "")
-                    target_text = data.get("target", "")
-                    input_target_cache[key] = (input_text, target_text)
-
-                # 获取模型输出
-                sample_score = data.get("sample_score", {})
-                score = sample_score.get("score", {})
-                # 优先使用extracted_prediction，其次使用prediction
-                prediction = score.get("extracted_prediction")
-                if prediction is None:
-                    prediction = score.get("prediction", "")
-
-                # 获取评分
-                value_dict = score.get("value", {})
-                main_score_name = score.get("main_score_name", "prompt_level_strict")
-
-                # 使用main_score_name对应的评分，如果没有则使用prompt_level_strict
-                if main_score_name in value_dict:
-                    acc = value_dict[main_score_name]
-                elif "prompt_level_strict" in value_dict:
-                    acc = value_dict["prompt_level_strict"]
-                else:
-                    # 取第一个可用的评分
-                    acc = next(iter(value_dict.values())) if value_dict else 0.0
-
-                explanation = score.get("explanation", "")
-                metadata = score.get("metadata", {})
-
-                # 确保该category和index的条目存在
-                if index not in integrated[category]:
-                    integrated[category][index] = {
-                        "input": input_target_cache[key][0],
-                        "target": input_target_cache[key][1],
-                        "models": {}
-                    }
+        log_lines.append(f"处理 {model} - ifeval")
+        # 只有首个模型需要提取样本级的input/target
+        tasks.append((model, filepath, not tasks))
 
-                # 存储模型输出
-                integrated[category][index]["models"][model] = {
-                    "prediction": prediction,
-                    "acc": acc,
-                    "explanation": explanation,
-                    "metadata": metadata,
-                    "all_scores": value_dict  # 存储所有评分供参考
-                }
+    if log_lines:
+        # 一次性刷出进度日志，免去每个文件一次的stdout锁和写系统调用；
+        # 罕见的警告/错误仍然就地打到stderr
+        sys.stdout.write("\n".join(log_lines) + "\n")
+
+    integrated = defaultdict(dict)
+    models_maps = {}
+
+    # 各(模型, 文件)在合并前完全独立，解析阶段交给进程池按任务并行；
+    # ex.map按任务顺序返回结果，合并后的键序与串行版一致
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for rows in ex.map(parse_one, tasks):
+                _merge_rows(integrated, models_maps, rows)
+    else:
+        for task in tasks:
+            _merge_rows(integrated, models_maps, parse_one(task))
 
     # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in integrated.items()}
-    return result
+    return dict(integrated)
+
+def _write_output(data, output_file):
+    """把整合结果写盘，边写边释放。
+
+    按顶层类别逐块编码并手工拼接，写完一个类别就把它从data里弹掉，
+    让分配器在写盘过程中逐步回收——峰值内存从"整棵树+完整序列化缓冲"
+    降到"剩余类别+最大单类别的缓冲"。拼出的文本与一次性indent=2的
+    整树dump逐字节一致。注意：data在返回后被清空。
+    """
+    if not data:
+        with open(output_file, 'wb') as f:
+            f.write(b'{}')
+        return
+
+    if orjson is not None:
+        # index键是int，需要NON_STR_KEYS
+        opt = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        with open(output_file, 'wb') as f:
+            for i, category in enumerate(list(data)):
+                f.write(b'{\n' if i == 0 else b',\n')
+                f.write(b'  ' + orjson.dumps(category) + b': ')
+                f.write(orjson.dumps(
+                    data.pop(category), option=opt).replace(b'\n', b'\n  '))
+            f.write(b'\n}')
+        return
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for i, category in enumerate(list(data)):
+            f.write('{\n' if i == 0 else ',\n')
+            f.write('  ' + json.dumps(category, ensure_ascii=False) + ': ')
+            f.write(json.dumps(data.pop(category), ensure_ascii=False,
+                               indent=2).replace('\n', '\n  '))
+        f.write('\n}')
 
 def main():
     base_path = "data_process/eval_result/reviews"
@@ -137,17 +340,9 @@ def main():
     print("开始整合ifeval数据...")
     integrated_data = integrate_data(base_path)
 
-    output_file = "integrated_ifeval.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(integrated_data, f, ensure_ascii=False, indent=2)
-
-    print(f"数据整合完成，保存到 {output_file}")
-
-    # 打印统计信息
+    # _write_output边写边释放integrated_data，统计信息先算好
     total_categories = len(integrated_data)
     total_samples = sum(len(indices) for indices in integrated_data.values())
-    print(f"类别数: {total_categories}")
-    print(f"总样本数: {total_samples}")
 
     # 检查每个样本的模型数量
     model_counts = defaultdict(int)
@@ -156,11 +351,8 @@ def main():
             num_models = len(data["models"])
             model_counts[num_models] += 1
 
-    print("\n模型覆盖统计:")
-    for num_models, count in sorted(model_counts.items()):
-        print(f"  有{num_models}个模型的样本: {count}个")
-
-    # 打印评分信息示例
+    # 示例要打印的首个样本引用同样要在释放前拿到
+    first_model_data = None
     if total_samples > 0:
         first_category = list(integrated_data.keys())[0]
         first_index = list(integrated_data[first_category].keys())[0]
@@ -168,9 +360,25 @@ def main():
         if first_sample["models"]:
             first_model = list(first_sample["models"].keys())[0]
             first_model_data = first_sample["models"][first_model]
-            print(f"\n第一个样本评分示例:")
-            print(f"  主要评分 (acc): {first_model_data['acc']}")
-            print(f"  所有评分: {first_model_data.get('all_scores', {})}")
+
+    output_file = "integrated_ifeval.json"
+    _write_output(integrated_data, output_file)
+
+    print(f"数据整合完成，保存到 {output_file}")
+
+    # 打印统计信息
+    print(f"类别数: {total_categories}")
+    print(f"总样本数: {total_samples}")
+
+    print("\n模型覆盖统计:")
+    for num_models, count in sorted(model_counts.items()):
+        print(f"  有{num_models}个模型的样本: {count}个")
+
+    # 打印评分信息示例
+    if first_model_data is not None:
+        print(f"\n第一个样本评分示例:")
+        print(f"  主要评分 (acc): {first_model_data['acc']}")
+        print(f"  所有评分: {first_model_data.get('all_scores', _EMPTY_DICT)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
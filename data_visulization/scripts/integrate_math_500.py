@@ -6,10 +6,82 @@
 """
 
 import json
+import mmap
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import simdjson
+
+    # 单个Parser实例复用到所有文件；parse返回的惰性代理在下一次
+    # parse前必须全部消亡，否则直接抛RuntimeError，所以这里每行
+    # 立即整体物化成普通dict，不把代理漏给调用方
+    _parser = simdjson.Parser()
+
+    def _loads(buf, _parse=_parser.parse):
+        return _parse(buf).as_dict()
+except ImportError:
+    simdjson = None
+
+def _materialize(value):
+    """把simdjson惰性对象转成普通dict/list；普通对象原样返回"""
+    return value.as_dict() if hasattr(value, 'as_dict') else value
+
+_MISS = object()  # 评分查找的哨兵，区分"键不存在"和合法的None/0值
+
+# 缺省字段共享同一个空dict，避免每行一次的空容器分配；下游只读不改
+_EMPTY_DICT = {}
+
+def _iter_lines(buf):
+    """沿b'\\n'游走切分mmap/bytes的行；切片只在取行时做单行拷贝"""
+    start = 0
+    size = len(buf)
+    find = buf.find
+    while start < size:
+        nl = find(b'\n', start)
+        end = size if nl < 0 else nl
+        yield buf[start:end]
+        start = end + 1
+
+try:
+    import msgspec
+    from typing import Optional
+
+    # 行结构固定且浅，msgspec按Struct模式编译C级解码器：跳过未知
+    # 字段、顺带校验类型，已知模式下通常比通用JSON解析器更快
+    class _Score(msgspec.Struct, kw_only=True):
+        extracted_prediction: str = ""
+        prediction: str = ""
+        value: dict = {}
+        # 真实数据里judge解释可能整个为null，必须容忍
+        explanation: Optional[str] = ""
+        metadata: Optional[dict] = {}
+
+    class _SampleScore(msgspec.Struct, kw_only=True):
+        score: _Score = msgspec.field(default_factory=_Score)
+        sample_metadata: Optional[dict] = {}
+
+    class _Row(msgspec.Struct, kw_only=True):
+        index: Optional[int] = None
+        input: str = ""
+        target: str = ""
+        sample_score: _SampleScore = msgspec.field(default_factory=_SampleScore)
+
+    _decode_row = msgspec.json.Decoder(_Row).decode
+except ImportError:
+    msgspec = None
+    _decode_row = None
+
 # 模型目录列表（六个模型）
 MODEL_DIRS = [
     "deepseek-reasoner-v3.2",
@@ -20,121 +92,161 @@ MODEL_DIRS = [
     "qwen-plus"
 ]
 
-def extract_category(filename):
-    """
-    从文件名中提取类别名称。
-    例如：math_500_Level 1.jsonl -> math_500_Level 1
-    """
-    basename = os.path.basename(filename)
-    if basename.endswith(".jsonl"):
-        basename = basename[:-len(".jsonl")]
-    return basename
+def parse_one(task):
+    """解析单个(model, filepath)文件，返回可序列化的行记录列表。
 
-def load_reviews_data(base_path="data_process/eval_result/reviews"):
-    """
-    从reviews目录加载所有模型的评分信息。
-    返回数据结构：{
-        category: {
-            index: {
-                model_name: {
-                    "prediction": str,      # 模型完整回答
-                    "extracted_prediction": str,  # 提取的答案
-                    "acc": float,           # 准确率 (1.0或0.0)
-                    "explanation": str,     # 解释
-                    "metadata": dict,       # 元数据
-                    "sample_metadata": dict # 样本元数据
-                }
-            }
-        }
-    }
+    作为进程池的工作函数必须是模块级函数才能被pickle；返回原始元组
+    而不是共享的defaultdict，合并留在主进程做O(行数)的dict插入。
     """
-    reviews_data = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    model, filepath, category = task
+    rows = []
+    rows_append = rows.append  # 绑定成局部变量，省每行一次的属性查找
+
+    with open(filepath, 'rb') as f:
+        try:
+            # mmap借操作系统页缓存直接取字节，省掉read()的整文件拷贝
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b""  # 空文件无法映射
+
+    if _decode_row is not None:
+        # 类型化解码路径：字段直接按属性访问，没有dict查找开销，
+        # 解析出的就是普通Python对象，无需再物化
+        for line_num, line in enumerate(_iter_lines(buf), 1):
+            if not line or line == b'\r':
+                continue
+            try:
+                row = _decode_row(line)
+            except ValueError as e:
+                print(f"错误：reviews文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
+                continue
 
-    # math-500的5个级别文件
-    file_patterns = [
-        "math_500_Level 1.jsonl",
-        "math_500_Level 2.jsonl",
-        "math_500_Level 3.jsonl",
-        "math_500_Level 4.jsonl",
-        "math_500_Level 5.jsonl"
-    ]
+            index = row.index
+            if index is None:
+                print(f"警告：reviews文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
+                continue
 
-    for model in MODEL_DIRS:
-        model_path = os.path.join(base_path, model)
-        if not os.path.exists(model_path):
-            print(f"警告：reviews模型目录不存在 {model_path}", file=sys.stderr)
+            score = row.sample_score.score
+            extracted_prediction = score.extracted_prediction
+            prediction = score.prediction
+            if not extracted_prediction and prediction:
+                extracted_prediction = prediction[:200] + "..." if len(prediction) > 200 else prediction
+
+            value_dict = score.value
+            acc = value_dict.get("acc", _MISS)
+            if acc is _MISS:
+                acc = next(iter(value_dict.values()), 0.0)
+
+            rows_append((category, index, model, {
+                "prediction": prediction,
+                "extracted_prediction": extracted_prediction,
+                "acc": acc,
+                "explanation": score.explanation,
+                "metadata": score.metadata,
+                "sample_metadata": row.sample_score.sample_metadata,
+                "input": row.input,   # 题目
+                "target": row.target  # 正确答案
+            }))
+
+        return rows
+
+    # 沿换行符游走切行；JSON解析器本身容忍残留的行尾ASCII空白
+    for line_num, line in enumerate(_iter_lines(buf), 1):
+        if not line or line == b'\r':
+            continue
+        try:
+            data = _loads(line)
+        except ValueError as e:
+            print(f"错误：reviews文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
             continue
 
-        for filename in file_patterns:
-            filepath = os.path.join(model_path, filename)
-            if not os.path.exists(filepath):
-                print(f"警告：模型 {model} 中没有找到reviews文件 {filename}", file=sys.stderr)
-                continue
-
-            category = extract_category(filepath)
-            print(f"加载reviews数据 {model} - {category}")
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"错误：reviews文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
-                        continue
-
-                    index = data.get("index")
-                    if index is None:
-                        print(f"警告：reviews文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
-                        continue
-
-                    # 获取模型输出和评分
-                    sample_score = data.get("sample_score", {})
-                    score = sample_score.get("score", {})
-
-                    # 提取预测信息
-                    extracted_prediction = score.get("extracted_prediction", "")
-                    prediction = score.get("prediction", "")
-                    if not extracted_prediction and prediction:
-                        # 如果没有提取的预测，使用完整预测的前200个字符
-                        extracted_prediction = prediction[:200] + "..." if len(prediction) > 200 else prediction
-
-                    value_dict = score.get("value", {})
-                    # math-500使用acc字段
-                    if "acc" in value_dict:
-                        acc = value_dict["acc"]
-                    else:
-                        # 如果没有acc，尝试获取其他评分
-                        acc = next(iter(value_dict.values())) if value_dict else 0.0
-
-                    explanation = score.get("explanation", "")
-                    metadata = score.get("metadata", {})
-                    sample_metadata = sample_score.get("sample_metadata", {})
-
-                    # 输入和目标（题目和答案）
-                    input_text = data.get("input", "")
-                    target = data.get("target", "")
-
-                    reviews_data[category][index][model] = {
-                        "prediction": prediction,
-                        "extracted_prediction": extracted_prediction,
-                        "acc": acc,
-                        "explanation": explanation,
-                        "metadata": metadata,
-                        "sample_metadata": sample_metadata,
-                        "input": input_text,  # 题目
-                        "target": target      # 正确答案
-                    }
+        index = data.get("index")
+        if index is None:
+            print(f"警告：reviews文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
+            continue
 
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in reviews_data.items()}
-    return result
+        # 获取模型输出和评分
+        sample_score = data.get("sample_score", _EMPTY_DICT)
+        score = sample_score.get("score", _EMPTY_DICT)
+
+        # 提取预测信息
+        extracted_prediction = score.get("extracted_prediction", "")
+        prediction = score.get("prediction", "")
+        if not extracted_prediction and prediction:
+            # 如果没有提取的预测，使用完整预测的前200个字符
+            extracted_prediction = prediction[:200] + "..." if len(prediction) > 200 else prediction
+
+        value_dict = score.get("value", _EMPTY_DICT)
+        # math-500使用acc字段；哨兵让查找只做一次哈希，
+        # 两参next免掉建迭代器前的真值判断
+        acc = value_dict.get("acc", _MISS)
+        if acc is _MISS:
+            # 如果没有acc，尝试获取其他评分
+            acc = next(iter(value_dict.values()), 0.0)
+
+        explanation = score.get("explanation", "")
+        metadata = score.get("metadata", _EMPTY_DICT)
+        sample_metadata = sample_score.get("sample_metadata", _EMPTY_DICT)
+
+        # 输入和目标（题目和答案）
+        input_text = data.get("input", "")
+        target = data.get("target", "")
+
+        rows_append((category, index, model, {
+            "prediction": prediction,
+            "extracted_prediction": extracted_prediction,
+            "acc": acc,
+            "explanation": explanation,
+            "metadata": _materialize(metadata),
+            "sample_metadata": _materialize(sample_metadata),
+            "input": input_text,  # 题目
+            "target": target      # 正确答案
+        }))
+
+    return rows
+
+def _merge_rows(integrated, models_maps, rows, pool):
+    """把一个文件的解析结果直接合并进最终结构。
+
+    样本级信息（题目、答案、question_id、solution）取自第一个插入该
+    index的模型，与旧的两遍扫描版本的"第一个模型"语义一致。
+    """
+    if not rows:
+        return
+    # 同一题目的input/target在六个模型里各有一份拷贝；经pool归一后
+    # 所有条目共享同一个str对象，峰值内存随之降到1/6。pool在
+    # integrate_data返回后即被丢弃，不像sys.intern那样永久驻留长文本
+    pool_setdefault = pool.setdefault
+    # 一个文件只对应一个(类别, 模型)。经进程池传回的字符串失去了
+    # intern，重新驻留后同键的字典操作先命中指针比较；类别字典和
+    # 它的get照旧提到循环外。index由解析器产出，本来就是int
+    category = sys.intern(rows[0][0])
+    model = sys.intern(rows[0][2])
+    cat_dict = integrated[category]
+    # models_maps与integrated平行，直接记各index的models子dict，
+    # 省掉每行对"models"键的重复哈希
+    cat_models = models_maps.setdefault(category, {})
+    models_get = cat_models.get
+    for _, index, _, entry in rows:
+        entry["input"] = pool_setdefault(entry["input"], entry["input"])
+        entry["target"] = pool_setdefault(entry["target"], entry["target"])
+        models = models_get(index)
+        if models is None:
+            models = cat_models[index] = {}
+            sample_metadata = entry.get("sample_metadata", _EMPTY_DICT)
+            cat_dict[index] = {
+                "input": entry.get("input", ""),
+                "target": entry.get("target", ""),
+                "category": category,
+                "question_id": sample_metadata.get("question_id", ""),
+                "solution": sample_metadata.get("solution", ""),
+                "models": models
+            }
+        models[model] = entry
 
-def integrate_data():
+def integrate_data(base_path="data_process/eval_result/reviews"):
     """
-    整合数据。
+    单遍扫描reviews目录并整合数据。
     返回最终数据结构：{
         "math_500_Level 1": {
             index: {
@@ -159,36 +271,89 @@ def integrate_data():
         ...
     }
     """
-    print("开始加载reviews数据...")
-    reviews_data = load_reviews_data()
-
-    print("开始整合数据...")
-    integrated = defaultdict(lambda: defaultdict(dict))
-
-    for category, indices in reviews_data.items():
-        for index, model_scores in indices.items():
-            # 从第一个模型中获取样本信息
-            first_model = next(iter(model_scores.values()))
-            sample_metadata = first_model.get("sample_metadata", {})
-            question_id = sample_metadata.get("question_id", "")
-            solution = sample_metadata.get("solution", "")
-
-            # 获取输入和目标
-            input_text = first_model.get("input", "")
-            target = first_model.get("target", "")
-
-            integrated[category][index] = {
-                "input": input_text,
-                "target": target,
-                "category": category,
-                "question_id": question_id,
-                "solution": solution,
-                "models": dict(model_scores)
-            }
+    # math-500的5个级别文件
+    file_patterns = [
+        "math_500_Level 1.jsonl",
+        "math_500_Level 2.jsonl",
+        "math_500_Level 3.jsonl",
+        "math_500_Level 4.jsonl",
+        "math_500_Level 5.jsonl"
+    ]
+
+    tasks = []
+    log_lines = []
+    for model in MODEL_DIRS:
+        model_path = os.path.join(base_path, model)
+        if not os.path.exists(model_path):
+            print(f"警告：reviews模型目录不存在 {model_path}", file=sys.stderr)
+            continue
+
+        for filename in file_patterns:
+            filepath = os.path.join(model_path, filename)
+            if not os.path.exists(filepath):
+                print(f"警告：模型 {model} 中没有找到reviews文件 {filename}", file=sys.stderr)
+                continue
+
+            # 类别名就是去掉.jsonl后缀的文件名，直接切片
+            category = filename[:-len(".jsonl")]
+            log_lines.append(f"加载reviews数据 {model} - {category}")
+            tasks.append((model, filepath, category))
+
+    if log_lines:
+        # 一次性刷出进度日志，免去每个文件一次的stdout锁和写系统调用；
+        # 罕见的警告/错误仍然就地打到stderr
+        sys.stdout.write("\n".join(log_lines) + "\n")
+
+    integrated = defaultdict(dict)
+    models_maps = {}
+    pool = {}
+
+    # 各(模型, 文件)在合并前完全独立，解析阶段交给进程池按任务并行；
+    # ex.map按任务顺序返回结果，合并后的键序与串行版一致
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for rows in ex.map(parse_one, tasks):
+                _merge_rows(integrated, models_maps, rows, pool)
+    else:
+        for task in tasks:
+            _merge_rows(integrated, models_maps, parse_one(task), pool)
 
     # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in integrated.items()}
-    return result
+    return dict(integrated)
+
+def _write_output(data, output_file):
+    """把整合结果写盘，边写边释放。
+
+    按顶层类别逐块编码并手工拼接，写完一个类别就把它从data里弹掉，
+    让分配器在写盘过程中逐步回收——峰值内存从"整棵树+完整序列化缓冲"
+    降到"剩余类别+最大单类别的缓冲"。拼出的文本与一次性indent=2的
+    整树dump逐字节一致。注意：data在返回后被清空。
+    """
+    if not data:
+        with open(output_file, 'wb') as f:
+            f.write(b'{}')
+        return
+
+    if orjson is not None:
+        # index键是int，需要NON_STR_KEYS
+        opt = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        with open(output_file, 'wb') as f:
+            for i, category in enumerate(list(data)):
+                f.write(b'{\n' if i == 0 else b',\n')
+                f.write(b'  ' + orjson.dumps(category) + b': ')
+                f.write(orjson.dumps(
+                    data.pop(category), option=opt).replace(b'\n', b'\n  '))
+            f.write(b'\n}')
+        return
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for i, category in enumerate(list(data)):
+            f.write('{\n' if i == 0 else ',\n')
+            f.write('  ' + json.dumps(category, ensure_ascii=False) + ': ')
+            f.write(json.dumps(data.pop(category), ensure_ascii=False,
+                               indent=2).replace('\n', '\n  '))
+        f.write('\n}')
 
 def main():
     # 检查目录是否存在
@@ -201,42 +366,46 @@ def main():
     print("开始整合math-500数据...")
     integrated_data = integrate_data()
 
-    output_file = "integrated_math_500.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(integrated_data, f, ensure_ascii=False, indent=2)
-
-    print(f"数据整合完成，保存到 {output_file}")
-
-    # 打印统计信息
+    # _write_output边写边释放integrated_data，统计信息先算好
     total_categories = len(integrated_data)
     total_samples = sum(len(indices) for indices in integrated_data.values())
-    print(f"类别数: {total_categories}")
-    print(f"总样本数: {total_samples}")
 
     # 检查每个样本的模型数量
     model_counts = defaultdict(int)
     for category, indices in integrated_data.items():
         for index, data in indices.items():
-            num_models = len(data.get("models", {}))
+            num_models = len(data.get("models", _EMPTY_DICT))
             model_counts[num_models] += 1
 
-    print("\n模型覆盖统计:")
-    for num_models, count in sorted(model_counts.items()):
-        print(f"  有{num_models}个模型的样本: {count}个")
-
-    # 打印详细信息示例
+    # 示例要打印的首个样本引用同样要在释放前拿到
+    first_sample = None
     if total_samples > 0:
         first_category = list(integrated_data.keys())[0]
         first_index = list(integrated_data[first_category].keys())[0]
         first_sample = integrated_data[first_category][first_index]
 
+    output_file = "integrated_math_500.json"
+    _write_output(integrated_data, output_file)
+
+    print(f"数据整合完成，保存到 {output_file}")
+
+    # 打印统计信息
+    print(f"类别数: {total_categories}")
+    print(f"总样本数: {total_samples}")
+
+    print("\n模型覆盖统计:")
+    for num_models, count in sorted(model_counts.items()):
+        print(f"  有{num_models}个模型的样本: {count}个")
+
+    # 打印详细信息示例
+    if first_sample is not None:
         print(f"\n第一个样本详细信息:")
         print(f"  类别: {first_category}")
         print(f"  索引: {first_index}")
         print(f"  题目ID: {first_sample.get('question_id', '')}")
         print(f"  题目长度: {len(first_sample.get('input', ''))} 字符")
         print(f"  正确答案: {first_sample.get('target', '')}")
-        print(f"  模型数量: {len(first_sample.get('models', {}))}")
+        print(f"  模型数量: {len(first_sample.get('models', _EMPTY_DICT))}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
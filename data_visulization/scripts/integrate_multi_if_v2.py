@@ -6,10 +6,70 @@
 """
 
 import json
+import logging
+import mmap
 import os
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import simdjson
+
+    # 单个Parser实例复用到所有文件；parse返回的惰性代理在下一次
+    # parse前必须全部消亡，否则直接抛RuntimeError，所以这里每行
+    # 立即整体物化成普通dict，不把代理漏给调用方
+    _parser = simdjson.Parser()
+
+    def _loads(buf, _parse=_parser.parse):
+        return _parse(buf).as_dict()
+except ImportError:
+    simdjson = None
+
+def _materialize(value):
+    """把simdjson惰性对象转成普通dict/list；普通对象原样返回"""
+    if hasattr(value, 'as_dict'):
+        return value.as_dict()
+    if hasattr(value, 'as_list'):
+        return value.as_list()
+    return value
+
+
+# 缺省字段共享同一个空dict，避免每行一次的空容器分配；下游只读不改
+_EMPTY_DICT = {}
+
+def _iter_docs(buf, filepath, label):
+    """逐行解析JSONL缓冲区，产出(行号, 文档)。"""
+    # 沿b'\n'游走切行：相比split一次性物化所有行，切片只在取行时
+    # 做单行拷贝，mmap的其余部分留在页缓存里
+    start = 0
+    size = len(buf)
+    find = buf.find
+    line_num = 0
+    while start < size:
+        nl = find(b'\n', start)
+        end = size if nl < 0 else nl
+        line = buf[start:end].strip()
+        start = end + 1
+        line_num += 1
+        if not line:
+            continue
+        try:
+            yield line_num, _loads(line)
+        except ValueError as e:
+            log.error("%s文件 %s 第 %d 行JSON解析失败: %s", label, filepath, line_num, e)
+
+# 进程池子进程经fork继承父进程的logging配置；热循环里的日志都走
+# 惰性%s参数，级别不够时连格式化的钱都不用付
+log = logging.getLogger("integrate")
+
 # 模型目录列表（六个模型）
 MODEL_DIRS = [
     "deepseek-reasoner-v3.2",
@@ -31,160 +91,101 @@ def extract_category(filename):
         basename = basename[:-len(".jsonl")]
     return basename
 
-def load_predictions_data(base_path="data_process/eval_result/predictions"):
-    """
-    从predictions目录加载所有模型的完整对话历史。
-    返回数据结构：{
-        category: {
-            index: {
-                "messages": list,  # 完整的对话历史
-                "metadata": dict,   # 元数据（包含step_record等）
-                "language": str,    # 语言
-                "key": str          # 唯一标识
-            }
-        }
-    }
-    """
-    predictions_data = defaultdict(lambda: defaultdict(dict))
-    file_patterns = ["multi_if_Chinese.jsonl", "multi_if_English.jsonl"]
-
-    for model in MODEL_DIRS:
-        model_path = os.path.join(base_path, model)
-        if not os.path.exists(model_path):
-            print(f"警告：predictions模型目录不存在 {model_path}", file=sys.stderr)
-            continue
-
-        for filename in file_patterns:
-            filepath = os.path.join(model_path, filename)
-            if not os.path.exists(filepath):
-                print(f"警告：模型 {model} 中没有找到predictions文件 {filename}", file=sys.stderr)
-                continue
+def _parse_predictions_file(task):
+    """解析单个predictions文件，返回(index, 基础信息)的列表。
 
-            category = extract_category(filepath)
-            print(f"加载predictions数据 {model} - {category}")
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"错误：predictions文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
-                        continue
-
-                    index = data.get("index")
-                    if index is None:
-                        print(f"警告：predictions文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
-                        continue
-
-                    # 获取messages和metadata
-                    messages = data.get("messages", [])
-                    metadata = data.get("metadata", {})
-                    language = metadata.get("language", "unknown")
-                    key = metadata.get("key", f"unknown_{index}")
-
-                    # 如果是第一个模型的数据，存储基础信息
-                    if index not in predictions_data[category]:
-                        predictions_data[category][index] = {
-                            "messages": messages,
-                            "metadata": metadata,
-                            "language": language,
-                            "key": key
-                        }
-
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in predictions_data.items()}
-    return result
-
-def load_reviews_data(base_path="data_process/eval_result/reviews"):
+    作为进程池的工作函数必须是模块级函数才能被pickle；返回原始
+    列表而不是共享的defaultdict，合并留在主进程做。
     """
-    从reviews目录加载所有模型的评分信息。
-    返回数据结构：{
-        category: {
-            index: {
-                model_name: {
-                    "prediction": str,
-                    "acc": float,
-                    "explanation": str,
-                    "metadata": dict,
-                    "all_scores": dict,
-                    "language": str
-                }
-            }
-        }
-    }
-    """
-    reviews_data = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
-    file_patterns = ["multi_if_Chinese.jsonl", "multi_if_English.jsonl"]
-
-    for model in MODEL_DIRS:
-        model_path = os.path.join(base_path, model)
-        if not os.path.exists(model_path):
-            print(f"警告：reviews模型目录不存在 {model_path}", file=sys.stderr)
+    model, filepath, category = task
+    rows = []
+    rows_append = rows.append  # 绑定成局部变量，省每行一次的属性查找
+    materialize = _materialize  # 全局查找也挪到循环外
+    seen = set()
+    seen_add = seen.add
+
+    with open(filepath, 'rb') as f:
+        try:
+            # mmap借操作系统页缓存直接取字节，省掉read()的整文件拷贝
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b""  # 空文件无法映射
+    for line_num, data in _iter_docs(buf, filepath, "predictions"):
+        index = data.get("index")
+        if index is None:
+            log.warning("predictions文件 %s 第 %d 行缺少index字段", filepath, line_num)
+            continue
+        if index in seen:
+            continue
+        seen_add(index)
+
+        messages = data.get("messages", [])
+        metadata = data.get("metadata", _EMPTY_DICT)
+        rows_append((index, {
+            "messages": materialize(messages),
+            "metadata": materialize(metadata),
+            "language": metadata.get("language", "unknown"),
+            "key": metadata.get("key", f"unknown_{index}")
+        }))
+    return category, rows
+
+def _parse_reviews_file(task):
+    """解析单个reviews文件，返回(index, 评分信息)的列表"""
+    model, filepath, category = task
+    rows = []
+    rows_append = rows.append
+    materialize = _materialize
+
+    with open(filepath, 'rb') as f:
+        try:
+            # mmap借操作系统页缓存直接取字节，省掉read()的整文件拷贝
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b""  # 空文件无法映射
+    for line_num, data in _iter_docs(buf, filepath, "reviews"):
+        index = data.get("index")
+        if index is None:
+            log.warning("reviews文件 %s 第 %d 行缺少index字段", filepath, line_num)
             continue
 
-        for filename in file_patterns:
-            filepath = os.path.join(model_path, filename)
-            if not os.path.exists(filepath):
-                print(f"警告：模型 {model} 中没有找到reviews文件 {filename}", file=sys.stderr)
-                continue
-
-            category = extract_category(filepath)
-            print(f"加载reviews数据 {model} - {category}")
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"错误：reviews文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
-                        continue
-
-                    index = data.get("index")
-                    if index is None:
-                        print(f"警告：reviews文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
-                        continue
-
-                    # 获取模型输出和评分
-                    sample_score = data.get("sample_score", {})
-                    score = sample_score.get("score", {})
-                    prediction = score.get("extracted_prediction")
-                    if prediction is None:
-                        prediction = score.get("prediction", "")
-
-                    value_dict = score.get("value", {})
-                    main_score_name = score.get("main_score_name", "turn_3_prompt_level_strict")
-
-                    # 使用main_score_name对应的评分
-                    if main_score_name in value_dict:
-                        acc = value_dict[main_score_name]
-                    elif "turn_3_prompt_level_strict" in value_dict:
-                        acc = value_dict["turn_3_prompt_level_strict"]
-                    else:
-                        acc = next(iter(value_dict.values())) if value_dict else 0.0
-
-                    explanation = score.get("explanation", "")
-                    metadata = score.get("metadata", {})
-                    sample_metadata = sample_score.get("sample_metadata", {})
-                    language = sample_metadata.get("language", "unknown")
-
-                    reviews_data[category][index][model] = {
-                        "prediction": prediction,
-                        "acc": acc,
-                        "explanation": explanation,
-                        "metadata": metadata,
-                        "all_scores": value_dict,
-                        "language": language
-                    }
-
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in reviews_data.items()}
-    return result
+        # 获取模型输出和评分
+        sample_score = data.get("sample_score", _EMPTY_DICT)
+        score = sample_score.get("score", _EMPTY_DICT)
+        prediction = score.get("extracted_prediction")
+        if prediction is None:
+            prediction = score.get("prediction", "")
+
+        value_dict = score.get("value", _EMPTY_DICT)
+        main_score_name = score.get("main_score_name", "turn_3_prompt_level_strict")
+
+        # 使用main_score_name对应的评分
+        if main_score_name in value_dict:
+            acc = value_dict[main_score_name]
+        elif "turn_3_prompt_level_strict" in value_dict:
+            acc = value_dict["turn_3_prompt_level_strict"]
+        else:
+            acc = next(iter(value_dict.values())) if value_dict else 0.0
+
+        explanation = score.get("explanation", "")
+        metadata = score.get("metadata", _EMPTY_DICT)
+        sample_metadata = sample_score.get("sample_metadata", _EMPTY_DICT)
+        language = sample_metadata.get("language", "unknown")
+
+        rows_append((index, {
+            "prediction": prediction,
+            "acc": acc,
+            "explanation": explanation,
+            "metadata": materialize(metadata),
+            "all_scores": materialize(value_dict),
+            "language": language
+        }))
+    return category, model, rows
+
+def _parse_one(task):
+    """进程池统一入口：按任务类型分派到predictions或reviews解析"""
+    if task[0] == "predictions":
+        return _parse_predictions_file(task[1:])
+    return _parse_reviews_file(task[1:])
 
 def integrate_data():
     """
@@ -211,42 +212,137 @@ def integrate_data():
         "multi_if_English": {...}
     }
     """
-    print("开始加载predictions数据...")
-    predictions_data = load_predictions_data()
-
-    print("开始加载reviews数据...")
-    reviews_data = load_reviews_data()
-
-    print("开始整合数据...")
-    integrated = defaultdict(lambda: defaultdict(dict))
-
-    # 合并数据
-    for category in set(list(predictions_data.keys()) + list(reviews_data.keys())):
-        # 获取该类别在predictions和reviews中的所有索引
-        pred_indices = set(predictions_data.get(category, {}).keys())
-        rev_indices = set(reviews_data.get(category, {}).keys())
-        all_indices = pred_indices.union(rev_indices)
-
-        for index in all_indices:
-            # 获取predictions数据
-            pred_info = predictions_data.get(category, {}).get(index, {})
-            # 获取reviews数据（模型评分）
-            model_scores = reviews_data.get(category, {}).get(index, {})
-
-            # 构建整合后的条目
-            integrated[category][index] = {
-                "messages": pred_info.get("messages", []),
-                "metadata": pred_info.get("metadata", {}),
-                "language": pred_info.get("language", "unknown"),
-                "key": pred_info.get("key", f"unknown_{index}"),
-                "models": dict(model_scores)
-            }
+    predictions_path = "data_process/eval_result/predictions"
+    reviews_path = "data_process/eval_result/reviews"
+    file_patterns = ["multi_if_Chinese.jsonl", "multi_if_English.jsonl"]
+
+    # 单次遍历模型目录同时登记predictions和reviews任务：同一模型的
+    # 两类文件背靠背打开，目录项和页缓存保持热态；解析结果直接合并
+    # 进最终结构，不再构造predictions_data/reviews_data中间层
+    try:
+        pred_models = {e.name for e in os.scandir(predictions_path) if e.is_dir()}
+    except FileNotFoundError:
+        pred_models = set()
+    try:
+        rev_models = {e.name for e in os.scandir(reviews_path) if e.is_dir()}
+    except FileNotFoundError:
+        rev_models = set()
+
+    tasks = []
+    scheduled = set()  # 基础信息只取每个类别的首个模型
+    for model in MODEL_DIRS:
+        pred_dir = os.path.join(predictions_path, model)
+        if model in pred_models:
+            pred_files = {e.name for e in os.scandir(pred_dir) if e.is_file()}
+        else:
+            log.warning("predictions模型目录不存在 %s", pred_dir)
+            pred_files = set()
+
+        rev_dir = os.path.join(reviews_path, model)
+        if model in rev_models:
+            rev_files = {e.name for e in os.scandir(rev_dir) if e.is_file()}
+        else:
+            log.warning("reviews模型目录不存在 %s", rev_dir)
+            rev_files = set()
+
+        for filename in file_patterns:
+            category = extract_category(filename)
+            if filename not in pred_files:
+                log.warning("模型 %s 中没有找到predictions文件 %s", model, filename)
+            elif category not in scheduled:
+                scheduled.add(category)
+                log.info("加载predictions数据 %s - %s", model, category)
+                tasks.append(("predictions", model,
+                              os.path.join(pred_dir, filename), category))
+
+            if filename not in rev_files:
+                log.warning("模型 %s 中没有找到reviews文件 %s", model, filename)
+            else:
+                log.info("加载reviews数据 %s - %s", model, category)
+                tasks.append(("reviews", model,
+                              os.path.join(rev_dir, filename), category))
+
+    # 约等于io_uring批量提交的标准库版本：解析开始前对所有文件发
+    # POSIX_FADV_WILLNEED，内核对各文件并行预读、填满盘带宽；工作
+    # 进程随后mmap到的页大多已经在页缓存里。非Linux平台直接跳过
+    if hasattr(os, 'posix_fadvise'):
+        for task in tasks:
+            try:
+                fd = os.open(task[2], os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+    # 各文件的解析互相独立，交给进程池按任务并行；ex.map按任务顺序
+    # 返回，合并顺序与串行版一致
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_parse_one, tasks))
+    else:
+        results = [_parse_one(task) for task in tasks]
+
+    log.info("开始整合数据...")
+    # 直接按任务顺序合并：类别与index的输出顺序来自文件顺序，
+    # 不再经过set的哈希序。外层类别dict先一次建好，合并循环里
+    # 只剩一次索引查找
+    integrated = {}
+    for task in tasks:
+        integrated.setdefault(task[3], {})
+    for task, result in zip(tasks, results):
+        if task[0] == "predictions":
+            category, rows = result
+            cat_data = integrated[category]
+            for index, info in rows:
+                info["models"] = {}
+                cat_data[index] = info
+        else:
+            category, model, rows = result
+            cat_data = integrated[category]
+            cat_get = cat_data.get
+            for index, entry in rows:
+                # 语言名只有少数几个取值，驻留后各条目共享同一对象
+                entry["language"] = sys.intern(entry["language"])
+                sample = cat_get(index)
+                if sample is None:
+                    # 该index没有predictions基础信息，补默认值
+                    sample = cat_data[index] = {
+                        "messages": [],
+                        "metadata": {},
+                        "language": "unknown",
+                        "key": f"unknown_{index}",
+                        "models": {}
+                    }
+                sample["models"][model] = entry
+
+    return integrated
 
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in integrated.items()}
-    return result
+def _write_ndjson(data, output_file):
+    """按NDJSON逐行写盘：每行一条样本记录。
+
+    序列化以单条记录为单位，既省掉整棵树的一次性缩进编码，
+    内存峰值也从整个输出串降到最大单条记录。
+    """
+    if orjson is not None:
+        dumps = orjson.dumps
+    else:
+        def dumps(obj):
+            return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    with open(output_file, 'wb') as f:
+        write = f.write
+        for category, indices in data.items():
+            for index, record in indices.items():
+                write(dumps({"category": category, "index": index, **record}))
+                write(b'\n')
 
 def main():
+    # 生产默认WARNING：干净数据一行日志都不格式化；需要进度时
+    # LOG_LEVEL=INFO打开
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"),
+                        format="%(message)s")
     # 检查目录是否存在
     predictions_path = "data_process/eval_result/predictions"
     reviews_path = "data_process/eval_result/reviews"
@@ -262,9 +358,21 @@ def main():
     print("开始整合multi-if数据...")
     integrated_data = integrate_data()
 
-    output_file = "integrated_multi_if_v2.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(integrated_data, f, ensure_ascii=False, indent=2)
+    # --ndjson走逐行输出；可视化页面吃的是单个JSON，默认路径不变
+    if "--ndjson" in sys.argv:
+        output_file = "integrated_multi_if_v2.jsonl"
+        _write_ndjson(integrated_data, output_file)
+    elif orjson is not None:
+        output_file = "integrated_multi_if_v2.json"
+        # orjson序列化比stdlib快近一个量级；index键是int，需要NON_STR_KEYS
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                integrated_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        output_file = "integrated_multi_if_v2.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(integrated_data, f, ensure_ascii=False, indent=2)
 
     print(f"数据整合完成，保存到 {output_file}")
 
@@ -275,11 +383,11 @@ def main():
     print(f"总样本数: {total_samples}")
 
     # 检查每个样本的模型数量
-    model_counts = defaultdict(int)
+    model_counts = {}
     for category, indices in integrated_data.items():
         for index, data in indices.items():
             num_models = len(data.get("models", {}))
-            model_counts[num_models] += 1
+            model_counts[num_models] = model_counts.get(num_models, 0) + 1
 
     print("\n模型覆盖统计:")
     for num_models, count in sorted(model_counts.items()):
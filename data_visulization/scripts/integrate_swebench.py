@@ -6,10 +6,70 @@
 """
 
 import json
+import logging
+import mmap
 import os
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import simdjson
+
+    # 单个Parser实例复用到所有文件；parse返回的惰性代理在下一次
+    # parse前必须全部消亡，否则直接抛RuntimeError，所以这里每行
+    # 立即整体物化成普通dict，不把代理漏给调用方
+    _parser = simdjson.Parser()
+
+    def _loads(buf, _parse=_parser.parse):
+        return _parse(buf).as_dict()
+except ImportError:
+    simdjson = None
+
+def _materialize(value):
+    """把simdjson惰性对象转成普通dict/list；普通对象原样返回"""
+    if hasattr(value, 'as_dict'):
+        return value.as_dict()
+    if hasattr(value, 'as_list'):
+        return value.as_list()
+    return value
+
+
+# 缺省字段共享同一个空dict，避免每行一次的空容器分配；下游只读不改
+_EMPTY_DICT = {}
+
+def _iter_docs(buf, filepath, label):
+    """逐行解析JSONL缓冲区，产出(行号, 文档)。"""
+    # 沿b'\n'游走切行：相比split一次性物化所有行，切片只在取行时
+    # 做单行拷贝，mmap的其余部分留在页缓存里
+    start = 0
+    size = len(buf)
+    find = buf.find
+    line_num = 0
+    while start < size:
+        nl = find(b'\n', start)
+        end = size if nl < 0 else nl
+        line = buf[start:end].strip()
+        start = end + 1
+        line_num += 1
+        if not line:
+            continue
+        try:
+            yield line_num, _loads(line)
+        except ValueError as e:
+            log.error("%s文件 %s 第 %d 行JSON解析失败: %s", label, filepath, line_num, e)
+
+# 进程池子进程经fork继承父进程的logging配置；热循环里的日志都走
+# 惰性%s参数，级别不够时连格式化的钱都不用付
+log = logging.getLogger("integrate")
+
 # 模型目录列表（六个模型）
 MODEL_DIRS = [
     "deepseek-reasoner-v3.2",
@@ -30,103 +90,67 @@ def extract_category(filename):
         basename = basename[:-len(".jsonl")]
     return basename
 
-def load_reviews_data(base_path="data_process/eval_result/reviews"):
-    """
-    从reviews目录加载所有模型的评分信息。
-    返回数据结构：{
-        category: {
-            index: {
-                model_name: {
-                    "prediction": str,      # 模型完整回答
-                    "extracted_prediction": str,  # 提取的patch
-                    "acc": float,           # 准确率 (1.0或0.0)
-                    "explanation": str,     # 解释
-                    "metadata": dict,       # 元数据
-                    "sample_metadata": dict # 样本元数据
-                }
-            }
-        }
-    }
-    """
-    reviews_data = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
-
-    # swe_bench只有一个文件
-    file_patterns = [
-        "swe_bench_verified_mini_default.jsonl"
-    ]
+def _parse_reviews_file(task):
+    """解析单个reviews文件，返回(index, 评分信息)的列表。
 
-    for model in MODEL_DIRS:
-        model_path = os.path.join(base_path, model)
-        if not os.path.exists(model_path):
-            print(f"警告：reviews模型目录不存在 {model_path}", file=sys.stderr)
+    作为进程池的工作函数必须是模块级函数才能被pickle；返回原始
+    列表而不是共享的defaultdict，合并留在主进程做。
+    """
+    model, filepath, category = task
+    rows = []
+    rows_append = rows.append  # 绑定成局部变量，省每行一次的属性查找
+    materialize = _materialize  # 全局查找也挪到循环外
+
+    with open(filepath, 'rb') as f:
+        try:
+            # mmap借操作系统页缓存直接取字节，省掉read()的整文件拷贝
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b""  # 空文件无法映射
+    for line_num, data in _iter_docs(buf, filepath, "reviews"):
+        index = data.get("index")
+        if index is None:
+            log.warning("reviews文件 %s 第 %d 行缺少index字段", filepath, line_num)
             continue
 
-        for filename in file_patterns:
-            filepath = os.path.join(model_path, filename)
-            if not os.path.exists(filepath):
-                print(f"警告：模型 {model} 中没有找到reviews文件 {filename}", file=sys.stderr)
-                continue
-
-            category = extract_category(filepath)
-            print(f"加载reviews数据 {model} - {category}")
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"错误：reviews文件 {filepath} 第 {line_num} 行JSON解析失败: {e}", file=sys.stderr)
-                        continue
-
-                    index = data.get("index")
-                    if index is None:
-                        print(f"警告：reviews文件 {filepath} 第 {line_num} 行缺少index字段", file=sys.stderr)
-                        continue
-
-                    # 获取模型输出和评分
-                    sample_score = data.get("sample_score", {})
-                    score = sample_score.get("score", {})
-
-                    # 提取预测信息
-                    extracted_prediction = score.get("extracted_prediction", "")
-                    prediction = score.get("prediction", "")
-                    if not extracted_prediction and prediction:
-                        # 如果没有提取的预测，使用完整预测的前200个字符
-                        extracted_prediction = prediction[:200] + "..." if len(prediction) > 200 else prediction
-
-                    value_dict = score.get("value", {})
-                    # swe_bench使用acc字段
-                    if "acc" in value_dict:
-                        acc = value_dict["acc"]
-                    else:
-                        # 如果没有acc，尝试获取其他评分
-                        acc = next(iter(value_dict.values())) if value_dict else 0.0
-
-                    explanation = score.get("explanation", "")
-                    metadata = score.get("metadata", {})
-                    sample_metadata = sample_score.get("sample_metadata", {})
-
-                    # 输入和目标
-                    input_text = data.get("input", "")
-                    target = data.get("target", "")  # 可能为空
-
-                    reviews_data[category][index][model] = {
-                        "prediction": prediction,
-                        "extracted_prediction": extracted_prediction,
-                        "acc": acc,
-                        "explanation": explanation,
-                        "metadata": metadata,
-                        "sample_metadata": sample_metadata,
-                        "input": input_text,
-                        "target": target
-                    }
-
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in reviews_data.items()}
-    return result
+        # 获取模型输出和评分
+        sample_score = data.get("sample_score", _EMPTY_DICT)
+        score = sample_score.get("score", _EMPTY_DICT)
+
+        # 提取预测信息
+        extracted_prediction = score.get("extracted_prediction", "")
+        prediction = score.get("prediction", "")
+        if not extracted_prediction and prediction:
+            # 如果没有提取的预测，使用完整预测的前200个字符
+            extracted_prediction = prediction[:200] + "..." if len(prediction) > 200 else prediction
+
+        value_dict = score.get("value", _EMPTY_DICT)
+        # swe_bench使用acc字段
+        if "acc" in value_dict:
+            acc = value_dict["acc"]
+        else:
+            # 如果没有acc，尝试获取其他评分
+            acc = next(iter(value_dict.values())) if value_dict else 0.0
+
+        explanation = score.get("explanation", "")
+        metadata = score.get("metadata", _EMPTY_DICT)
+        sample_metadata = sample_score.get("sample_metadata", _EMPTY_DICT)
+
+        # 输入和目标
+        input_text = data.get("input", "")
+        target = data.get("target", "")  # 可能为空
+
+        rows_append((index, {
+            "prediction": prediction,
+            "extracted_prediction": extracted_prediction,
+            "acc": acc,
+            "explanation": explanation,
+            "metadata": materialize(metadata),
+            "sample_metadata": materialize(sample_metadata),
+            "input": input_text,
+            "target": target
+        }))
+    return category, model, rows
 
 def integrate_data():
     """
@@ -151,34 +175,114 @@ def integrate_data():
         }
     }
     """
-    print("开始加载reviews数据...")
-    reviews_data = load_reviews_data()
-
-    print("开始整合数据...")
-    integrated = defaultdict(lambda: defaultdict(dict))
-
-    for category, indices in reviews_data.items():
-        for index, model_scores in indices.items():
-            # 从第一个模型中获取样本信息
-            first_model = next(iter(model_scores.values()))
-            sample_metadata = first_model.get("sample_metadata", {})
-
-            # 获取输入和目标
-            input_text = first_model.get("input", "")
-            target = first_model.get("target", "")
-
-            integrated[category][index] = {
-                "input": input_text,
-                "target": target,
-                "category": category,
-                "models": dict(model_scores)
-            }
+    log.info("开始加载reviews数据...")
+    base_path = "data_process/eval_result/reviews"
+
+    # swe_bench只有一个文件
+    file_patterns = [
+        "swe_bench_verified_mini_default.jsonl"
+    ]
+
+    # 一次scandir列出目录项代替逐路径os.path.exists：每个目录只付
+    # 一次系统调用，而不是每个候选路径一次stat
+    try:
+        existing_models = {e.name for e in os.scandir(base_path) if e.is_dir()}
+    except FileNotFoundError:
+        existing_models = set()
+
+    tasks = []
+    for model in MODEL_DIRS:
+        model_path = os.path.join(base_path, model)
+        if model not in existing_models:
+            log.warning("reviews模型目录不存在 %s", model_path)
+            continue
 
-    # 将defaultdict转换为普通dict
-    result = {cat: dict(indices) for cat, indices in integrated.items()}
-    return result
+        model_files = {e.name for e in os.scandir(model_path) if e.is_file()}
+        for filename in file_patterns:
+            if filename not in model_files:
+                log.warning("模型 %s 中没有找到reviews文件 %s", model, filename)
+                continue
+            filepath = os.path.join(model_path, filename)
+
+            category = extract_category(filepath)
+            log.info("加载reviews数据 %s - %s", model, category)
+            tasks.append((model, filepath, category))
+
+    # 约等于io_uring批量提交的标准库版本：解析开始前对所有文件发
+    # POSIX_FADV_WILLNEED，内核对各文件并行预读、填满盘带宽；工作
+    # 进程随后mmap到的页大多已经在页缓存里。非Linux平台直接跳过
+    if hasattr(os, 'posix_fadvise'):
+        for task in tasks:
+            try:
+                fd = os.open(task[1], os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+    # 各文件的解析互相独立，交给进程池按任务并行；ex.map按任务顺序
+    # 返回，合并后的键序与串行版一致
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_parse_reviews_file, tasks))
+    else:
+        results = [_parse_reviews_file(task) for task in tasks]
+
+    log.info("开始整合数据...")
+    # 解析结果直接按任务顺序合并进最终结构，省掉reviews_data中间层
+    # 和随后的整形遍历；样本级input/target取首个模型的值
+    # 外层类别dict先按任务一次建好，合并循环里只剩一次索引查找
+    integrated = {}
+    for task in tasks:
+        integrated.setdefault(task[2], {})
+    # 六个模型的行重复携带同一份input/target，加上样本级的副本一个
+    # 样本在内存里有7份拷贝；经内容池去重后只留一份，输出内容不变
+    pool = {}
+    pool_setdefault = pool.setdefault
+    for category, model, rows in results:
+        cat_data = integrated[category]
+        cat_get = cat_data.get
+        for index, entry in rows:
+            entry["input"] = pool_setdefault(entry["input"], entry["input"])
+            entry["target"] = pool_setdefault(entry["target"], entry["target"])
+            sample = cat_get(index)
+            if sample is None:
+                sample = cat_data[index] = {
+                    "input": entry["input"],
+                    "target": entry["target"],
+                    "category": category,
+                    "models": {}
+                }
+            sample["models"][model] = entry
+
+    return integrated
+
+def _write_ndjson(data, output_file):
+    """按NDJSON逐行写盘：每行一条样本记录。
+
+    序列化以单条记录为单位，既省掉整棵树的一次性缩进编码，
+    内存峰值也从整个输出串降到最大单条记录。
+    """
+    if orjson is not None:
+        dumps = orjson.dumps
+    else:
+        def dumps(obj):
+            return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    with open(output_file, 'wb') as f:
+        write = f.write
+        for category, indices in data.items():
+            for index, record in indices.items():
+                write(dumps({"category": category, "index": index, **record}))
+                write(b'\n')
 
 def main():
+    # 生产默认WARNING：干净数据一行日志都不格式化；需要进度时
+    # LOG_LEVEL=INFO打开
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"),
+                        format="%(message)s")
     # 检查目录是否存在
     reviews_path = "data_process/eval_result/reviews"
 
@@ -189,9 +293,21 @@ def main():
     print("开始整合swe_bench数据...")
     integrated_data = integrate_data()
 
-    output_file = "integrated_swebench.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(integrated_data, f, ensure_ascii=False, indent=2)
+    # --ndjson走逐行输出；可视化页面吃的是单个JSON，默认路径不变
+    if "--ndjson" in sys.argv:
+        output_file = "integrated_swebench.jsonl"
+        _write_ndjson(integrated_data, output_file)
+    elif orjson is not None:
+        output_file = "integrated_swebench.json"
+        # orjson序列化比stdlib快近一个量级；index键是int，需要NON_STR_KEYS
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                integrated_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        output_file = "integrated_swebench.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(integrated_data, f, ensure_ascii=False, indent=2)
 
     print(f"数据整合完成，保存到 {output_file}")
 
@@ -202,11 +318,11 @@ def main():
     print(f"总样本数: {total_samples}")
 
     # 检查每个样本的模型数量
-    model_counts = defaultdict(int)
+    model_counts = {}
     for category, indices in integrated_data.items():
         for index, data in indices.items():
             num_models = len(data.get("models", {}))
-            model_counts[num_models] += 1
+            model_counts[num_models] = model_counts.get(num_models, 0) + 1
 
     print("\n模型覆盖统计:")
     for num_models, count in sorted(model_counts.items()):
@@ -1,9 +1,16 @@
 import json
+import sys
 
-with open("outputs/deepseek_v3_2_reasoner/reviews/deepseek-reasoner/general_qa_Unfairness_And_Discrimination.jsonl", 'r', encoding="utf-8") as f:
-    data = [json.loads(line) for line in f.readlines()]
+try:
+    import orjson
 
-index_num = [item['index'] for item in data]
-index_num.sort()
-print(index_num)
-            
\ No newline at end of file
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# 逐行取index再排序：不把整文件的dict列表留在内存里，峰值只有N个int
+with open("outputs/deepseek_v3_2_reasoner/reviews/deepseek-reasoner/general_qa_Unfairness_And_Discrimination.jsonl", 'rb') as f:
+    index_num = sorted(_loads(line)["index"] for line in f if line.strip())
+
+# 一次join一次write，免去逐个int的repr和多次stdout调用
+sys.stdout.write("[%s]\n" % ", ".join(map(str, index_num)))
@@ -4,10 +4,63 @@
 """
 
 import json
+import mmap
 import os
 import sys
 from html.parser import HTMLParser
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from selectolax.parser import HTMLParser as _SLXParser
+except ImportError:
+    _SLXParser = None
+
+# 结构检查的七个针串；装了pyahocorasick就编译成一个自动机，
+# 50KB窗口只扫一遍而不是每个针串各扫一遍
+_STRUCTURE_CHECKS = [
+    (b'DOCTYPE html', '包含DOCTYPE声明'),
+    (b'<html lang="zh-CN">', '包含HTML标签和中文语言'),
+    (b'<meta name="viewport"', '包含移动端viewport'),
+    (b'<div class="app-container">', '包含应用容器'),
+    (b'<div class="samples-panel">', '包含样本列表面板'),
+    (b'<div class="detail-panel">', '包含详情面板'),
+]
+
+# 数据嵌入有三种形态：安全版把数据放在<script type="application/json">
+# 标签里；generate_html_viewer.py的性能版内联JS字面量，JSON模式是
+# const rawEvalData = {...}，msgpack模式是const evalDataB64 = "..."
+# （rawEvalData跟在几MB的base64串后面，窗口里只看得到前者）。
+# 命中任意一种即算通过
+_EMBED_NEEDLES = (b'<script type="application/json"', b'const rawEvalData',
+                  b'const evalDataB64')
+
+if ahocorasick is not None:
+    # 自动机按latin-1字符串建：latin-1与字节一一对应，解码只是
+    # O(n)拷贝，不丢信息也不需要合法UTF-8
+    _CHECK_AC = ahocorasick.Automaton()
+    for _pattern, _desc in _STRUCTURE_CHECKS:
+        _CHECK_AC.add_word(_pattern.decode('latin-1'), _desc)
+    _CHECK_AC.make_automaton()
+else:
+    _CHECK_AC = None
+
+# 读入循环的止读针串：结构检查之外再加上解析器要找的几个id，
+# 这些全部出现后继续读也不会改变结论
+_STOP_NEEDLES = tuple(p for p, _ in _STRUCTURE_CHECKS) + (
+    b'id="samples-list"', b'id="detail-content"', b'id="detail-title"',
+    b'id="sample-count"',
+)
+
+def _scan_structure(window: bytes) -> set:
+    """返回窗口中命中的结构检查描述集合"""
+    if _CHECK_AC is not None:
+        return {desc for _, desc in _CHECK_AC.iter(window.decode('latin-1'))}
+    return {desc for pattern, desc in _STRUCTURE_CHECKS if pattern in window}
+
 class SimpleHTMLChecker(HTMLParser):
     def __init__(self):
         super().__init__()
@@ -19,8 +72,6 @@ class SimpleHTMLChecker(HTMLParser):
         for attr, value in attrs:
             if attr == 'id':
                 self.ids.add(value)
-            if attr == 'type' and value == 'application/json':
-                self.ids.add('has_json_script')
 
 def test_html_file(filepath):
     """测试HTML文件"""
@@ -28,47 +79,71 @@ def test_html_file(filepath):
         print(f"错误：文件不存在 {filepath}")
         return False
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read(50000)  # 只读取前50KB进行快速检查
+    # mmap按需映射，窗口按4KB分块推进：每块读完复查还没出现的
+    # 针串，全部出现就停，典型通过场景只碰前十几KB；子串判断直接
+    # 在bytes上走C层的memmem扫描，整个文件不做UTF-8解码。
+    # 上限仍是50KB，缺针串的文件照旧读满整个窗口再报FAIL
+    window = b""
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            pass  # 空文件无法映射
+        else:
+            with mm:
+                size = min(len(mm), 50000)
+                remaining = set(_STOP_NEEDLES)
+                end = 0
+                while end < size:
+                    end = min(end + 4096, size)
+                    window = mm[:end]
+                    remaining = {n for n in remaining if n not in window}
+                    if not remaining and \
+                            any(n in window for n in _EMBED_NEEDLES):
+                        break
 
-    # 检查基本结构
-    checks = [
-        ('DOCTYPE html' in content, '包含DOCTYPE声明'),
-        ('<html lang="zh-CN">' in content, '包含HTML标签和中文语言'),
-        ('<meta name="viewport"' in content, '包含移动端viewport'),
-        ('<div class="app-container">' in content, '包含应用容器'),
-        ('<div class="samples-panel">' in content, '包含样本列表面板'),
-        ('<div class="detail-panel">' in content, '包含详情面板'),
-        ('<script type="application/json"' in content, '包含JSON脚本标签'),
-    ]
+    # 检查基本结构：多针串一次扫描
+    found = _scan_structure(window)
 
     all_ok = True
-    for check, description in checks:
-        if check:
+    for _, description in _STRUCTURE_CHECKS:
+        if description in found:
             print(f"[OK] {description}")
         else:
             print(f"[FAIL] {description}")
             all_ok = False
 
-    # 使用HTML解析器检查
-    parser = SimpleHTMLChecker()
-    parser.feed(content)
+    # 检查数据嵌入（任一形态命中即可）
+    has_json_tag = _EMBED_NEEDLES[0] in window
+    if has_json_tag or any(n in window for n in _EMBED_NEEDLES[1:]):
+        print("[OK] 包含嵌入评测数据")
+    else:
+        print("[FAIL] 包含嵌入评测数据")
+        all_ok = False
+
+    # 枚举id：装了selectolax就用C实现的Modest引擎解析一次、
+    # 一条CSS查询取全部id；否则退回html.parser的纯Python状态机。
+    # 只有这一步需要str，窗口边界可能截断多字节字符，
+    # errors='ignore'丢掉残缺的尾巴
+    if _SLXParser is not None:
+        tree = _SLXParser(window)
+        present_ids = {node.attributes.get('id') for node in tree.css('[id]')}
+    else:
+        parser = SimpleHTMLChecker()
+        parser.feed(window.decode('utf-8', 'ignore'))
+        present_ids = parser.ids
 
-    required_ids = ['samples-list', 'detail-content', 'detail-title', 'sample-count', 'evaluation-data']
+    required_ids = ['samples-list', 'detail-content', 'detail-title', 'sample-count']
+    if has_json_tag:
+        # 只有JSON标签形态的嵌入才有evaluation-data这个id
+        required_ids.append('evaluation-data')
     for rid in required_ids:
-        if rid in parser.ids:
+        if rid in present_ids:
             print(f"[OK] 找到ID: #{rid}")
         else:
             print(f"[FAIL] 缺少ID: #{rid}")
             all_ok = False
 
-    # 检查JSON数据是否存在
-    if 'has_json_script' in parser.ids:
-        print("[OK] 找到JSON脚本标签")
-    else:
-        print("[FAIL] 未找到JSON脚本标签")
-        all_ok = False
-
     return all_ok
 
 def main():
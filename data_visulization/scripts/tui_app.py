@@ -3,17 +3,37 @@
 TUI程序，用于浏览和对比六个模型的general_qa评测结果。
 """
 
+import bisect
+import itertools
 import json
+import mmap
 import os
+import pickle
 import sys
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 try:
     from textual import on
     from textual.app import App, ComposeResult
     from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
-    from textual.widgets import Header, Footer, ListView, ListItem, Label, Static, Input, Select
+    from textual.widgets import Header, Footer, Label, OptionList, Static, Input, Select
+    from textual.widgets.option_list import Option
     from textual.binding import Binding
     from textual.reactive import reactive
     from textual.screen import Screen
@@ -26,130 +46,274 @@ except ImportError:
     print("pip install textual")
     sys.exit(1)
 
+_USER_PREFIX = "**User**: \n"
+
+def _display_text(category: str, index: int, input_text: str) -> str:
+    """列表项的显示文本：去掉**User**: 前缀并截断到50个字符"""
+    input_text = input_text.removeprefix(_USER_PREFIX)
+    if len(input_text) > 50:
+        return f"{category} #{index}: {input_text[:50]}..."
+    return f"{category} #{index}: {input_text}"
+
+@dataclass(frozen=True, slots=True)
+class ModelOutput:
+    """单个模型在一个样本上的输出记录"""
+    name: str
+    prediction: str
+    acc: float
+    explanation: str
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    """一个评测样本。
+
+    加载时把JSON的dict树固化成slots记录：渲染路径上全是C级
+    属性访问，不再反复.get()做dict哈希；缺省值也在构造时归一，
+    字段名打错直接AttributeError而不是悄悄拿到空串。
+    """
+    category: str
+    index: int
+    input: str
+    target: str
+    models: Tuple[ModelOutput, ...]
+    display: str
+
 class DataStore:
     """数据存储类，加载整合后的JSON数据"""
-    def __init__(self, json_path: str = "integrated_general_qa.json"):
+    def __init__(self, json_path: str = "integrated_general_qa.json",
+                 eager: bool = True):
         self.json_path = json_path
-        self.data: Dict[str, Dict] = {}
         self.categories: List[str] = []
-        self.samples: List[Tuple[str, int, Dict]] = []  # (category, index, sample_data)
-        self.load_data()
+        self.samples: List[Sample] = []
+        self._by_key: Dict[Tuple[str, int], Sample] = {}
+        # 上一次搜索的查询串和(样本, 小写文本)命中对，供前缀查询复用
+        self._last_query = ""
+        self._last_pairs: List[Tuple[Sample, str]] = []
+        # eager=False时先建空壳，由调用方在后台线程里再load_data
+        if eager:
+            self.load_data()
+
+    def _iter_categories(self):
+        """逐类别产出 (category, {index: sample})。
+
+        装了ijson就真正流式解析：任一时刻内存里只有当前类别的
+        子树，峰值不再是整棵dict树。没装则整读一次，但逐类别
+        pop出来交给调用方，转换完的子树随即可被回收。
+        """
+        if ijson is not None:
+            with open(self.json_path, 'rb') as f:
+                yield from ijson.kvitems(f, '')
+            return
+
+        # 二进制整读后直接交给解析器：orjson在一趟SIMD扫描里完成
+        # UTF-8校验和解析，省掉文本层的全文解码
+        with open(self.json_path, 'rb') as f:
+            data = _loads(f.read())
+        for category in list(data):
+            yield category, data.pop(category)
+
+    def _load_cache(self) -> Optional[Tuple[List[str], List[Sample]]]:
+        """尝试从旁路pickle缓存加载，过期或损坏则返回None。
+
+        缓存通过mmap只读映射后直接反序列化：多个TUI进程同时启动
+        时共享同一份页缓存，不必各自再把JSON解析一遍。
+        """
+        cache_path = self.json_path + ".cache.pkl"
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(self.json_path):
+                return None
+            with open(cache_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                categories, samples = pickle.loads(memoryview(mm))
+            return categories, samples
+        except (OSError, ValueError, EOFError,
+                pickle.UnpicklingError, AttributeError):
+            return None
+
+    def _save_cache(self):
+        """best-effort写缓存：先写临时文件再原子替换，失败不报错"""
+        cache_path = self.json_path + ".cache.pkl"
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((self.categories, self.samples), f, protocol=5)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
 
     def load_data(self):
         """加载JSON数据"""
         if not os.path.exists(self.json_path):
             raise FileNotFoundError(f"整合数据文件不存在：{self.json_path}")
 
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
-
-        # 构建样本列表
-        self.categories = sorted(self.data.keys())
-        self.samples = []
-        for category in self.categories:
-            indices = sorted(self.data[category].keys(), key=lambda x: int(x))
-            for index in indices:
-                sample = self.data[category][index]
-                self.samples.append((category, int(index), sample))
+        cached = self._load_cache()
+        if cached is not None:
+            self.categories, self.samples = cached
+            self._finish_load()
+            return
+
+        # 构建样本列表：dict子树逐类别到达，随即固化成Sample记录，
+        # 显示文本也在加载时算好
+        per_category: Dict[str, List[Sample]] = {}
+        for category, entries in self._iter_categories():
+            built = []
+            # 键一次性转成int再排序：比较走C层的itemgetter，
+            # 不用lambda里每次比较都int()一遍
+            pairs = sorted(((int(k), v) for k, v in entries.items()),
+                           key=itemgetter(0))
+            for index, raw in pairs:
+                input_text = raw.get("input", "") or ""
+                sample = Sample(
+                    category=category,
+                    index=index,
+                    input=input_text,
+                    target=raw.get("target", "") or "",
+                    models=tuple(
+                        ModelOutput(
+                            name=name,
+                            prediction=m.get("prediction", "") or "",
+                            acc=m.get("acc", 0.0) or 0.0,
+                            explanation=m.get("explanation", "") or "")
+                        for name, m in raw.get("models", {}).items()),
+                    display=_display_text(category, index, input_text))
+                built.append(sample)
+            per_category[category] = built
+
+        # 类别按名字排序后拼成总列表，与原先的展示顺序一致
+        self.categories = sorted(per_category.keys())
+        self.samples = [s for c in self.categories for s in per_category[c]]
+        self._save_cache()
+        self._finish_load()
+
+    def _finish_load(self):
+        """样本列表就绪后构建查找表和搜索索引"""
+        self._by_key = {(s.category, s.index): s for s in self.samples}
+
+        # 一次性构建搜索索引：小写后的输入文本用\x00拼成一条大串，
+        # 查询直接在C实现的str.find上跳段，不再每次按样本跑Python级
+        # 循环。\x00不出现在正常文本里，命中不会跨样本
+        # 平行数组（SoA）：case-fold每个样本只做一次，扫描只碰被搜索
+        # 的字段，不再逐样本取dict
+        texts = [s.input.lower() for s in self.samples]
+        self._search_texts = texts
+        # offsets[i] = 前i段长度与分隔符的前缀和，即第i段在大串里的起点
+        self._search_offsets = list(itertools.accumulate(
+            (len(t) + 1 for t in texts[:-1]), initial=0))
+        self._search_blob = "\x00".join(texts)
+        self._last_query = ""
+        self._last_pairs = []
 
         print(f"加载了 {len(self.categories)} 个类别，{len(self.samples)} 个样本")
 
-    def search_samples(self, query: str) -> List[Tuple[str, int, Dict]]:
+    def search_samples(self, query: str) -> List[Sample]:
         """搜索样本（按输入文本）"""
         query = query.lower()
-        results = []
-        for category, index, sample in self.samples:
-            input_text = sample.get("input", "").lower()
-            if query in input_text:
-                results.append((category, index, sample))
-        return results
-
-    def get_sample(self, category: str, index: int) -> Optional[Dict]:
+        if not query:
+            return list(self.samples)
+        if "\x00" in query:
+            return []  # 查询含分隔符不可能命中
+
+        if self._last_query and query.startswith(self._last_query):
+            # 连续击键多是前缀扩展，新结果必是旧结果的子集：
+            # 只在上一次的命中对里过滤，不再扫整个大串
+            pairs = [(s, t) for s, t in self._last_pairs if query in t]
+        else:
+            # 查询不含\x00，命中必然完整落在单个样本段内；命中后直接
+            # 跳到该段末尾，同一样本不会重复进结果
+            pairs = []
+            blob = self._search_blob
+            offsets = self._search_offsets
+            texts = self._search_texts
+            find = blob.find
+            pos = find(query)
+            while pos != -1:
+                i = bisect.bisect_right(offsets, pos) - 1
+                pairs.append((self.samples[i], texts[i]))
+                pos = find(query, offsets[i] + len(texts[i]))
+
+        self._last_query = query
+        self._last_pairs = pairs
+        return [s for s, _ in pairs]
+
+    def get_sample(self, category: str, index: int) -> Optional[Sample]:
         """获取指定类别和索引的样本"""
-        return self.data.get(category, {}).get(str(index))
-
-class SampleListItem(ListItem):
-    """样本列表项"""
-    def __init__(self, category: str, index: int, sample: Dict):
-        super().__init__()
-        self.category = category
-        self.index = index
-        self.sample = sample
-        # 显示简短的输入文本（前50个字符）
-        input_text = sample.get("input", "")
-        # 移除**User**: 前缀
-        if input_text.startswith("**User**: \n"):
-            input_text = input_text[len("**User**: \n"):]
-        display_text = f"{category} #{index}: {input_text[:50]}..." if len(input_text) > 50 else f"{category} #{index}: {input_text}"
-        self.label = Label(display_text)
-
-    def compose(self) -> ComposeResult:
-        yield self.label
+        return self._by_key.get((category, int(index)))
 
 class SampleList(Widget):
-    """样本列表组件"""
+    """样本列表组件。
+
+    用OptionList做虚拟化列表：每个样本只是一条轻量Option文本，
+    只有可见行才会被渲染，不再为全部样本各挂一棵widget子树。
+    """
     def __init__(self, datastore: DataStore):
         super().__init__()
         self.datastore = datastore
-        self.list_view = ListView()
+        self.option_list = OptionList()
         self.current_filter = ""
+        self._filtered_samples: List[Sample] = []
 
     def compose(self) -> ComposeResult:
-        yield self.list_view
+        yield self.option_list
 
     def on_mount(self) -> None:
         self.load_samples()
 
     def load_samples(self, query: str = ""):
         """加载样本到列表"""
-        self.list_view.clear()
+        self.option_list.clear_options()
         if query:
             samples = self.datastore.search_samples(query)
         else:
             samples = self.datastore.samples
 
-        for category, index, sample in samples:
-            item = SampleListItem(category, index, sample)
-            self.list_view.append(item)
+        self._filtered_samples = samples
+        self.option_list.add_options(
+            [Option(sample.display) for sample in samples])
 
         self.current_filter = query
 
-    def get_selected_sample(self) -> Optional[Tuple[str, int, Dict]]:
+    def result_count(self) -> int:
+        """当前过滤结果数，不触碰widget树"""
+        return len(self._filtered_samples)
+
+    def get_selected_sample(self) -> Optional[Sample]:
         """获取当前选中的样本"""
-        if self.list_view.index is not None:
-            item = self.list_view.children[self.list_view.index]
-            if isinstance(item, SampleListItem):
-                return item.category, item.index, item.sample
+        i = self.option_list.highlighted
+        if i is not None and 0 <= i < len(self._filtered_samples):
+            return self._filtered_samples[i]
         return None
 
 class ModelOutputWidget(Widget):
-    """单个模型输出组件"""
-    def __init__(self, model_name: str, prediction: str, acc: float, explanation: str):
+    """单个模型输出组件。
+
+    三个Label只构建一次，之后通过update_content原地改内容，
+    选中另一个样本时不需要拆掉重建整个子树。
+    """
+    def __init__(self, model_name: str = "", prediction: str = "",
+                 acc: float = 0.0, explanation: str = ""):
         super().__init__()
         self.model_name = model_name
-        self.prediction = prediction
-        self.acc = acc
-        self.explanation = explanation
 
-    def compose(self) -> ComposeResult:
-        # 模型名称和准确率
-        header = Label(f"[bold]{self.model_name}[/bold] (acc: {self.acc:.2f})")
-        header.styles.border = ("heavy", "white")
-        header.styles.padding = (0, 0)
+        # 样式全在App.CSS的类规则里，这里只挂类名：不再为每个实例
+        # 逐条改styles对象触发样式重算
+        self._header = Label("", classes="model-header")
+        self._prediction = Label("", classes="model-prediction")
+        self._explanation = Label("", classes="model-explanation")
 
-        # 预测文本
-        prediction_label = Label(self.prediction)
-        prediction_label.styles.height = "auto"
-        prediction_label.styles.margin = (0, 1)
+        self.update_content(model_name, prediction, acc, explanation)
 
-        # 解释
-        explanation_label = Label(f"Judge: {self.explanation}")
-        explanation_label.styles.color = "yellow"
-        explanation_label.styles.padding = (0, 1)
+    def update_content(self, model_name: str, prediction: str,
+                       acc: float, explanation: str):
+        """原地更新三个标签的内容"""
+        self.model_name = model_name
+        self._header.update(f"[bold]{model_name}[/bold] (acc: {acc:.2f})")
+        self._prediction.update(prediction)
+        self._explanation.update(f"Judge: {explanation}")
 
-        yield header
-        yield prediction_label
-        yield explanation_label
+    def compose(self) -> ComposeResult:
+        yield self._header
+        yield self._prediction
+        yield self._explanation
 
 class DetailView(Widget):
     """样本详情视图"""
@@ -161,6 +325,12 @@ class DetailView(Widget):
         self.target_label = Label("", id="target")
         self.models_container = Container(id="models-container")
         self.current_sample = None
+        # 预分配的固定widget池：切换样本只改Label内容和display开关，
+        # 彻底不走remove_children/mount的增删路径
+        self._pool: List[ModelOutputWidget] = []
+
+    # 略多于参评模型数（目前六个），超出时update_sample按需扩容
+    _POOL_SIZE = 8
 
     def compose(self) -> ComposeResult:
         yield self.category_label
@@ -171,46 +341,61 @@ class DetailView(Widget):
         yield Label("[bold]模型输出:[/bold]", classes="section-title")
         yield self.models_container
 
-    def update_sample(self, category: str, index: int, sample: Dict):
-        """更新显示的样本"""
-        self.current_sample = (category, index, sample)
-        self.category_label.update(f"类别: {category} | 索引: {index}")
-
-        input_text = sample.get("input", "")
-        target_text = sample.get("target", "")
-
-        self.input_label.update(input_text)
-        self.target_label.update(target_text.strip())
-
-        # 清除之前的模型输出
-        self.models_container.remove_children()
-
-        # 添加每个模型的输出
-        models = sample.get("models", {})
-        for model_name, model_data in models.items():
-            prediction = model_data.get("prediction", "")
-            acc = model_data.get("acc", 0.0)
-            explanation = model_data.get("explanation", "")
-
-            model_widget = ModelOutputWidget(model_name, prediction, acc, explanation)
-            self.models_container.mount(model_widget)
+    def on_mount(self) -> None:
+        self._pool = [ModelOutputWidget() for _ in range(self._POOL_SIZE)]
+        self.models_container.mount(*self._pool)
+        for widget in self._pool:
+            widget.display = False
 
-        # 重新布局
-        self.models_container.refresh(layout=True)
+    def update_sample(self, sample: Sample):
+        """更新显示的样本"""
+        # 样本记录不可变，同一条重复选中时内容不可能变化，直接跳过
+        # 整个标签更新和布局流程
+        if sample is self.current_sample:
+            return
+        self.current_sample = sample
+        self.category_label.update(f"类别: {sample.category} | 索引: {sample.index}")
+
+        self.input_label.update(sample.input)
+        self.target_label.update(sample.target.strip())
+
+        # 只有模型集合变化时才重建子树；通常六个模型固定不变，
+        # 选中切换只是六次Label内容更新
+        outputs = sample.models
+        # 罕见地超出池容量时一次性补足槽位
+        if len(outputs) > len(self._pool):
+            extra = [ModelOutputWidget()
+                     for _ in range(len(outputs) - len(self._pool))]
+            self.models_container.mount(*extra)
+            self._pool.extend(extra)
+
+        # Label.update和display开关自己会标脏，不需要再手动refresh
+        for widget, output in zip(self._pool, outputs):
+            widget.update_content(
+                output.name, output.prediction, output.acc, output.explanation)
+            widget.display = True
+        for widget in self._pool[len(outputs):]:
+            widget.display = False
 
 class SearchBar(Widget):
     """搜索栏"""
     def __init__(self):
         super().__init__()
         self.input = Input(placeholder="搜索用户输入...", id="search-input")
+        self._debounce_timer = None
 
     def compose(self) -> ComposeResult:
         yield Label("搜索:")
         yield self.input
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        """输入变化时触发搜索"""
-        self.post_message(self.SearchQueryChanged(event.value))
+        """输入变化时触发搜索（去抖：连续击键只重建一次列表）"""
+        if self._debounce_timer is not None:
+            self._debounce_timer.stop()
+        self._debounce_timer = self.set_timer(
+            0.12,
+            lambda value=event.value: self.post_message(
+                self.SearchQueryChanged(value)))
 
     class SearchQueryChanged(Message):
         """搜索查询变化消息"""
@@ -220,6 +405,10 @@ class SearchBar(Widget):
 
 class ComparisonTUI(App):
     """主TUI应用"""
+
+    class DataLoaded(Message):
+        """后台数据加载完成消息"""
+
     CSS = """
     Screen {
         layout: vertical;
@@ -288,6 +477,21 @@ class ComparisonTUI(App):
         height: auto;
         overflow-x: auto;
     }
+
+    .model-header {
+        border: heavy white;
+        padding: 0 0;
+    }
+
+    .model-prediction {
+        height: auto;
+        margin: 0 1;
+    }
+
+    .model-explanation {
+        color: yellow;
+        padding: 0 1;
+    }
     """
 
     BINDINGS = [
@@ -300,7 +504,8 @@ class ComparisonTUI(App):
 
     def __init__(self, json_path: str = "integrated_general_qa.json"):
         super().__init__()
-        self.datastore = DataStore(json_path)
+        # 先建空壳：JSON解析挪到后台线程，启动不再被大文件卡住
+        self.datastore = DataStore(json_path, eager=False)
         self.sample_list = SampleList(self.datastore)
         self.detail_view = DetailView()
         self.search_bar = SearchBar()
@@ -325,7 +530,20 @@ class ComparisonTUI(App):
         yield Footer()
 
     def on_mount(self) -> None:
-        self.set_focus(self.sample_list.list_view)
+        self.set_focus(self.sample_list.option_list)
+        # 解析和建索引在工作线程里跑，首帧立即渲染出空壳界面
+        self.update_status("正在加载数据...")
+        self.run_worker(self._load_data_worker, thread=True)
+
+    def _load_data_worker(self) -> None:
+        """后台线程：解析JSON并构建样本列表，完成后通知主线程"""
+        self.datastore.load_data()
+        self.post_message(self.DataLoaded())
+
+    @on(DataLoaded)
+    def on_data_loaded(self, event: DataLoaded) -> None:
+        """数据就绪后填充列表"""
+        self.sample_list.load_samples()
         self.update_status(f"加载了 {len(self.datastore.samples)} 个样本")
 
     def update_status(self, message: str):
@@ -335,17 +553,18 @@ class ComparisonTUI(App):
     @on(SearchBar.SearchQueryChanged)
     def on_search_query_changed(self, event: SearchBar.SearchQueryChanged):
         """处理搜索查询变化"""
+        if event.query != self.search_bar.input.value:
+            return  # 去抖窗口里又有新输入，过期查询直接丢弃
         self.sample_list.load_samples(event.query)
-        self.update_status(f"搜索: '{event.query}' - 找到 {len(self.sample_list.list_view.children)} 个样本")
+        self.update_status(f"搜索: '{event.query}' - 找到 {self.sample_list.result_count()} 个样本")
 
-    @on(ListView.Selected)
-    def on_list_view_selected(self, event: ListView.Selected):
+    @on(OptionList.OptionSelected)
+    def on_option_selected(self, event: OptionList.OptionSelected):
         """列表项被选中时更新详情视图"""
-        selected = self.sample_list.get_selected_sample()
-        if selected:
-            category, index, sample = selected
-            self.detail_view.update_sample(category, index, sample)
-            self.update_status(f"显示: {category} #{index}")
+        sample = self.sample_list.get_selected_sample()
+        if sample is not None:
+            self.detail_view.update_sample(sample)
+            self.update_status(f"显示: {sample.category} #{sample.index}")
 
     def action_focus_search(self):
         """聚焦搜索框"""
@@ -353,15 +572,15 @@ class ComparisonTUI(App):
 
     def action_cursor_down(self):
         """向下移动光标"""
-        self.sample_list.list_view.action_cursor_down()
+        self.sample_list.option_list.action_cursor_down()
 
     def action_cursor_up(self):
         """向上移动光标"""
-        self.sample_list.list_view.action_cursor_up()
+        self.sample_list.option_list.action_cursor_up()
 
     def action_select_sample(self):
         """选择当前样本（触发选中事件）"""
-        # ListView的选中事件已经处理
+        # OptionList的选中事件已经处理
         pass
 
 def main():
@@ -4,9 +4,57 @@
 """
 
 import json
-import re
+import mmap
 import os
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+def _slice_blob(content, blob_id):
+    """取出指定id的<script>数据块正文bytes，找不到返回None"""
+    anchor = content.find(('id="%s"' % blob_id).encode('ascii'))
+    if anchor < 0:
+        return None
+    start = content.find(b'>', anchor)
+    end = content.find(b'</script>', start + 1)
+    if start < 0 or end < 0:
+        return None
+    return content[start + 1:end].strip()
+
+def _load_tail_tables(content):
+    """解析尾段的window.__CAT_INDEX__目录和window.__KEYS__键驻留表。
+
+    两段都由生成器按固定形态内联：目录以'; window.__KEYS__'结束，
+    键表以';</script>'结束，用这两个终止串切片不会被值里的分号骗到。
+    """
+    ci = content.find(b'window.__CAT_INDEX__ = ')
+    k = content.find(b'window.__KEYS__ = ')
+    if ci < 0 or k < 0:
+        return None, None
+    ci_start = ci + len(b'window.__CAT_INDEX__ = ')
+    ci_end = content.find(b'; window.__KEYS__', ci_start)
+    k_start = k + len(b'window.__KEYS__ = ')
+    k_end = content.find(b';</script>', k_start)
+    if ci_end < 0 or k_end < 0:
+        return None, None
+    return _loads(content[ci_start:ci_end]), _loads(content[k_start:k_end])
+
+def _expand_interned(o, keys):
+    """把{'$k': [键下标], '$v': [值]}的驻留形式还原成普通dict"""
+    if isinstance(o, dict):
+        if '$k' in o and '$v' in o:
+            return {keys[i]: _expand_interned(v, keys)
+                    for i, v in zip(o['$k'], o['$v'])}
+        return {k: _expand_interned(v, keys) for k, v in o.items()}
+    if isinstance(o, list):
+        return [_expand_interned(x, keys) for x in o]
+    return o
+
 def verify_detailed_html():
     html_path = "multi_if_comparison_detailed.html"
 
@@ -14,23 +62,34 @@ def verify_detailed_html():
         print(f"错误：文件不存在 {html_path}")
         return False
 
-    # 读取文件前100KB来查找JSON
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read(100000)  # 读取前100KB
-
-    # 查找JSON脚本标签
-    pattern = r'<script[^>]*type="application/json"[^>]*>(.*?)</script>'
-    match = re.search(pattern, content, re.DOTALL)
-
-    if not match:
-        print("错误：未找到JSON脚本标签")
-        return False
-
-    json_text = match.group(1).strip()
-    print(f"JSON数据长度: {len(json_text)} 字符")
+    # mmap整读定位：生成器把每个类别写成独立的
+    # <script type="application/json" id="cat-N">块（$k/$v键驻留形式），
+    # 目录和键表内联在尾段，先取尾段再按目录逐块展开
+    with open(html_path, 'rb') as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            print("错误：未找到JSON脚本标签")
+            return False
 
     try:
-        data = json.loads(json_text)
+        with content:
+            cat_index, keys = _load_tail_tables(content)
+            if cat_index is None:
+                print("错误：未找到目录/键表脚本")
+                return False
+
+            data = {}
+            blob_bytes = 0
+            for entry in cat_index:
+                blob = _slice_blob(content, entry['id'])
+                if blob is None:
+                    print(f"错误：未找到类别数据块 {entry['id']}")
+                    return False
+                blob_bytes += len(blob)
+                data[entry['name']] = _expand_interned(_loads(blob), keys)
+
+        print(f"JSON数据长度: {blob_bytes} 字节")
         print("✓ JSON解析成功")
 
         # 检查数据结构
@@ -71,7 +130,7 @@ def verify_detailed_html():
 
         return True
 
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"✗ JSON解析失败: {e}")
         return False
     except Exception as e:
@@ -84,4 +143,4 @@ if __name__ == "__main__":
     if verify_detailed_html():
         print("\n✓ 所有验证通过！")
     else:
-        print("\n✗ 验证失败！")
\ No newline at end of file
+        print("\n✗ 验证失败！")
@@ -3,26 +3,75 @@
 验证HTML文件中的JSON数据是否能正常解析。
 """
 
+import base64
+import gzip
 import json
-import re
+import mmap
 import sys
 import os
 
-def extract_json_from_html(html_path):
-    """从HTML文件中提取JSON数据"""
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+try:
+    import orjson
 
-    # 查找<script type="application/json">标签
-    pattern = r'<script[^>]*type="application/json"[^>]*>(.*?)</script>'
-    match = re.search(pattern, content, re.DOTALL)
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
-    if not match:
-        print(f"错误：在 {html_path} 中未找到JSON脚本标签")
-        return None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
-    json_text = match.group(1).strip()
-    return json_text
+def _slice_script(content, anchor):
+    """取出anchor所在<script>标签的正文bytes，残缺标签返回None"""
+    start = content.find(b'>', anchor)
+    end = content.find(b'</script>', start + 1)
+    if start < 0 or end < 0:
+        return None
+    return content[start + 1:end].strip()
+
+def extract_payload_from_html(html_path):
+    """从HTML文件中提取数据载荷。
+
+    返回(kind, blob, fmt)：kind为'json'（明文JSON块）或'gz'
+    （generate_multi_if_html.py嵌入的gzip+base64块，fmt标注解压后
+    是msgpack还是json）。找不到任何数据块时返回None。
+    """
+    # mmap把文件按需映射进地址空间，find直接在页缓存上扫描，
+    # 整个文件不再拷贝成Python对象；只有数据区段被切成bytes
+    with open(html_path, 'rb') as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射，自然也不含数据标签
+            print(f"错误：在 {html_path} 中未找到数据脚本标签")
+            return None
+
+        with content:
+            # 用find定位标签：memchr式线性扫描，免去正则在整个大文件
+            # 上的回溯，也免去一次全文UTF-8解码——解析器直接吃原始字节
+            anchor = content.find(b'type="application/json"')
+            if anchor >= 0:
+                blob = _slice_script(content, anchor)
+                if blob is not None:
+                    return 'json', blob, None
+
+            anchor = content.find(b'id="evaluation-data-gz"')
+            if anchor >= 0:
+                tag_end = content.find(b'>', anchor)
+                fmt = 'json'
+                fmt_pos = content.find(b'data-format="', anchor)
+                if 0 <= fmt_pos < tag_end:
+                    fmt_start = fmt_pos + len(b'data-format="')
+                    fmt = content[fmt_start:content.find(b'"', fmt_start)] \
+                        .decode('ascii')
+                blob = _slice_script(content, anchor)
+                if blob is not None:
+                    return 'gz', blob, fmt
+
+            print(f"错误：在 {html_path} 中未找到数据脚本标签")
+            return None
 
 def verify_html_file(html_path):
     """验证HTML文件中的JSON数据"""
@@ -33,14 +82,31 @@ def verify_html_file(html_path):
         print(f"错误：文件不存在 {html_path}")
         return False
 
-    json_text = extract_json_from_html(html_path)
-    if json_text is None:
+    extracted = extract_payload_from_html(html_path)
+    if extracted is None:
         return False
+    kind, blob, fmt = extracted
 
-    # 尝试解析JSON
+    # 尝试解析载荷
     try:
-        data = json.loads(json_text)
-        print(f"[OK] JSON解析成功")
+        if kind == 'gz':
+            raw = gzip.decompress(base64.b64decode(blob))
+            if fmt == 'msgpack':
+                if msgpack is None:
+                    print("[FAIL] 载荷是msgpack格式但未安装msgpack库")
+                    return False
+                data = msgpack.unpackb(raw)
+            else:
+                data = _loads(raw)
+            print(f"[OK] 嵌入数据解压解析成功（{fmt}）")
+        else:
+            data = _loads(blob)
+            print(f"[OK] JSON解析成功")
+
+        # 字符串驻留载荷：统计只看data子树，模型名保持驻留表索引
+        # 也不影响计数和取acc
+        if isinstance(data, dict) and '_strings' in data and 'data' in data:
+            data = data['data']
 
         # 统计信息
         if isinstance(data, dict):
@@ -67,9 +133,9 @@ def verify_html_file(html_path):
 
         return True
 
-    except json.JSONDecodeError as e:
-        print(f"[FAIL] JSON解析失败: {e}")
-        print(f"[DEBUG] JSON文本前100个字符: {json_text[:100]}")
+    except ValueError as e:
+        print(f"[FAIL] 载荷解析失败: {e}")
+        print(f"[DEBUG] 载荷前100个字节: {blob[:100].decode('utf-8', 'replace')}")
         return False
     except Exception as e:
         print(f"[FAIL] 其他错误: {e}")
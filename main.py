@@ -1,15 +1,28 @@
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def read_json(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.loads(f.read())
-        return data
+    # 二进制整读直接交给解析器；orjson吃原始字节，省一次全文解码
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def save_jsonl(data, file_path):
-    with open(file_path, "w", encoding="utf-8") as f:
-        [f.write(json.dumps(item, ensure_ascii=False) + "\n") for item in data]
+    # 先批量序列化再一次writelines：write由内核合批，少付每条一次的
+    # 系统调用；orjson对小dict的序列化也比stdlib快得多
+    if orjson is not None:
+        lines = [orjson.dumps(item) + b"\n" for item in data]
+    else:
+        lines = [json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n"
+                 for item in data]
+    with open(file_path, "wb") as f:
+        f.writelines(lines)
 
 
 def main():
@@ -18,12 +31,10 @@ def main():
 
     for key in data.keys():
         print(f"Processing {key}")
-        sub_data = []
-        for item in data[key]:
-            sub_data.append({
-                "query": item["prompt"],
-                "response": item["response"]
-            })
+        sub_data = [{
+            "query": item["prompt"],
+            "response": item["response"]
+        } for item in data[key]]
         save_jsonl(sub_data, f"data/safety-prompts/{key}.jsonl")
 
 